@@ -4,16 +4,19 @@ from __future__ import annotations
 import logging
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import Platform, CONF_HOST, CONF_PORT, EVENT_HOMEASSISTANT_START
-from homeassistant.core import HomeAssistant
+from homeassistant.const import Platform, CONF_HOST, CONF_PORT, EVENT_HOMEASSISTANT_START, EVENT_HOMEASSISTANT_STARTED
+from homeassistant.core import HomeAssistant, callback
 import voluptuous as vol
 from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.event import async_call_later, async_track_time_interval
+from datetime import timedelta
 
 from aiohttp import web
 import aiohttp
 from homeassistant.components.http import HomeAssistantView
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.components.http.auth import async_sign_path
+from homeassistant.helpers.storage import Store
 from urllib.parse import quote
 
 # Imports for cache in thumb proxy
@@ -25,7 +28,6 @@ import json
 import time
 from pathlib import Path
 import shutil
-import base64
 import asyncio
 from homeassistant.components.frontend import (
     async_register_built_in_panel,
@@ -34,22 +36,126 @@ from homeassistant.components.frontend import (
 import re
 
 
-from .const import DOMAIN, CONF_SHOW_PANEL
+from .const import DOMAIN, CONF_SHOW_PANEL, CONF_ARTWORK_MEMORY_MB, CONF_ARTWORK_DISK_MB, CONF_ARTWORK_FRESH_MIN, CONF_ARTWORK_PACK
+from .utils import ExpiringCache, ProxyResponseCache, RequestCoalescer, UpstreamClient, _get_json, upstream_session
+from .artwork import (
+    ARTWORK_SIZE_LADDER,
+    BLANK_PNG,
+    BLANK_PNG_SHA1,
+    ArtworkCatalog,
+    ArtworkFreshness,
+    ArtworkMemoryCache,
+    ArtworkNegativeCache,
+    ArtworkPack,
+    SingleFlight,
+    CATALOG_FILENAME,
+    VARIANT_CONTENT_TYPES,
+    SHEET_MAX_FETCHES,
+    SHEET_MAX_FILES,
+    SHEET_MAX_TILES,
+    SHEET_PRUNE_EVERY,
+    compose_sheet,
+    DEFAULT_ARTWORK_DISK_MB,
+    DEFAULT_ARTWORK_FRESH_MIN,
+    DEFAULT_ARTWORK_MEMORY_MB,
+    artwork_pack,
+    blob_path,
+    derive_thumbnail,
+    encode_variant,
+    image_executor,
+    imaging_available,
+    has_blob,
+    is_content_hash,
+    negotiate_variant,
+    pack_dir,
+    pack_view,
+    read_blob,
+    register_pack,
+    unpack_thumbnails,
+    sniff_content_type,
+    snap_size,
+    join_cache_key,
+    split_cache_key,
+    store_artwork,
+    sheet_id,
+    summarize_artwork,
+    sweep_disk_cache,
+    variant_formats,
+    variant_path,
+    write_blob,
+)
 
 # Signal constant for AirPlay device discovery (used by switch/number platforms)
 SIGNAL_AIRPLAY_DEVICES = "apple_music_airplay_devices"
 
 _LOGGER = logging.getLogger(__name__)
 
-_BLANK_PNG = base64.b64decode(
-    b"iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAQAAAC1HAwCAAAAC0lEQVR42mP8/x8AAoMBgQ2QY1QAAAAASUVORK5CYII="
-)
+_BLANK_PNG = BLANK_PNG
 
 # Non-blank placeholder (SVG) to avoid white flashes when artwork is not ready
 _PLACEHOLDER_SVG = None  # no visual placeholder; return 204 instead
 
 PLATFORMS: list[str] = [Platform.MEDIA_PLAYER, Platform.SWITCH, Platform.NUMBER]
 
+# How often the artwork disk janitor runs (first pass shortly after setup)
+ARTWORK_JANITOR_INTERVAL = timedelta(minutes=30)
+ARTWORK_JANITOR_FIRST_DELAY = 120
+# How long browsers may keep using keyed artwork past its freshness window while revalidating
+ARTWORK_SWR_STALE_S = 7 * 86400
+# Seconds before the end of a track at which the next track's artwork is prefetched
+ARTWORK_PREFETCH_LEAD_S = 8
+# Album track lists fetched ahead of time for the media browser
+ALBUM_TRACKS_TTL_S = 900
+# Library warm-up: list endpoint -> cache key prefix, and progress reporting cadence
+ARTWORK_WARM_KINDS = {"albums": "album", "artists": "artist", "playlists": "plist"}
+ARTWORK_WARM_PROGRESS_EVERY = 25
+EVENT_ARTWORK_WARM_PROGRESS = f"{DOMAIN}_artwork_warm_progress"
+# Startup validation of cached album art: delay after HA has started, and HEAD concurrency for the /albums walk
+ARTWORK_VALIDATION_DELAY_S = 60
+ARTWORK_VALIDATION_CONCURRENCY = 2
+# Proxy: the only request headers forwarded to the Mac, upstream response headers relayed
+# verbatim, and the chunk size bodies are streamed in
+PROXY_PASS_REQUEST_HEADERS = (
+    "Accept", "Accept-Encoding", "Accept-Language", "Content-Type", "Content-Length",
+    "If-None-Match", "If-Modified-Since",
+)
+PROXY_PASS_RESPONSE_HEADERS = ("Content-Type", "Content-Length", "Content-Encoding", "ETag", "Last-Modified", "Cache-Control")
+PROXY_CHUNK_SIZE = 64 * 1024
+# Largest streamed GET body a leader buffers for coalesced followers, and request headers
+# that make a GET personal (never coalesced)
+PROXY_COALESCE_MAX_BYTES = 4 * 1024 * 1024
+PROXY_NO_COALESCE_HEADERS = ("If-None-Match", "If-Modified-Since", "If-Match", "If-Unmodified-Since", "Range", "If-Range")
+# Most the events proxy holds while waiting for the end of an upstream event
+SSE_MAX_PENDING_BYTES = 1024 * 1024
+# Batch endpoint: sub-requests per call, default and maximum per-item timeout (seconds)
+BATCH_MAX_ITEMS = 16
+BATCH_ITEM_TIMEOUT_S = 10
+BATCH_MAX_ITEM_TIMEOUT_S = 30
+# Proxy response cache: per-route TTLs (seconds) for idempotent GETs, and the routes each
+# SSE event (or a mutating proxied call) makes stale. Library lists only change by TTL.
+PROXY_CACHE_TTLS = {
+    "/playlists": 300,
+    "/albums": 300,
+    "/artists": 300,
+    "/devices": 30,
+    "/airplay_full": 10,
+    "/current_devices": 10,
+    "/device_volumes": 10,
+    "/status": 5,
+    "/shuffle": 5,
+    "/repeat": 5,
+}
+PROXY_CACHE_LIBRARY = ("/playlists", "/albums", "/artists")
+PROXY_CACHE_VOLATILE = tuple(r for r in PROXY_CACHE_TTLS if r not in PROXY_CACHE_LIBRARY)
+PROXY_CACHE_EVENT_ROUTES = {
+    "now": ("/status",),
+    "snapshot": PROXY_CACHE_VOLATILE,
+    "airplay_full": ("/airplay_full", "/current_devices", "/device_volumes", "/devices"),
+    "master_volume": ("/status",),
+    "shuffle": ("/status", "/shuffle"),
+    "repeat": ("/status", "/repeat"),
+}
+
 
 # Sidebar/panel constants
 SIDEBAR_PATH = "music-app-controller"   # must contain a hyphen
@@ -238,10 +344,21 @@ async def _apply_sidebar_panel(hass: HomeAssistant) -> None:
     )
 
 
+def _sse_event_boundary(buf: bytes | bytearray) -> int:
+    """Offset just past the last complete SSE event in buf (blank-line terminated), else 0."""
+    cut = 0
+    for sep in (b"\n\n", b"\r\n\r\n", b"\r\r"):
+        i = buf.rfind(sep)
+        if i >= 0:
+            cut = max(cut, i + len(sep))
+    return cut
+
+
 async def _broadcast_local_sse(hass: HomeAssistant, event: str, payload: dict) -> None:
     """Broadcast a small SSE frame to all locally-registered clients.
 
-    Frames are written best-effort; dead clients are pruned silently.
+    Each frame goes out in one write; the events proxy only relays whole upstream
+    events, so it never splits one. Dead clients are pruned silently.
     """
     clients = hass.data.get(DOMAIN, {}).get("sse_clients") or set()
     if not clients:
@@ -304,8 +421,40 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     host = entry.options.get(CONF_HOST, entry.data.get(CONF_HOST, "localhost"))
     port = entry.options.get(CONF_PORT, entry.data.get(CONF_PORT, 7766))
     base_url = f"http://{host}:{port}"
-    hass.data[DOMAIN][entry.entry_id] = {"host": host, "port": port, "base_url": base_url}
+    # Dedicated upstream pools for this entry (REST and long-lived streams kept apart)
+    upstream = UpstreamClient()
+    hass.data[DOMAIN][entry.entry_id] = {"host": host, "port": port, "base_url": base_url, "upstream": upstream}
     hass.data[DOMAIN]["config"] = {"host": host, "port": port, "base_url": base_url}
+    # Bounded in-memory LRU in front of the on-disk artwork store (shared by all views)
+    mem_budget = int(entry.options.get(CONF_ARTWORK_MEMORY_MB, DEFAULT_ARTWORK_MEMORY_MB)) * 1024 * 1024
+    if hass.data[DOMAIN].get("artwork_mem") is None:
+        hass.data[DOMAIN]["artwork_mem"] = ArtworkMemoryCache(mem_budget)
+    else:
+        hass.data[DOMAIN]["artwork_mem"].resize(mem_budget)
+    # Stale-while-revalidate: cached artwork is served at once and refreshed in the background
+    fresh_s = int(entry.options.get(CONF_ARTWORK_FRESH_MIN, DEFAULT_ARTWORK_FRESH_MIN)) * 60
+    if hass.data[DOMAIN].get("artwork_swr") is None:
+        hass.data[DOMAIN]["artwork_swr"] = ArtworkFreshness(fresh_s)
+    else:
+        hass.data[DOMAIN]["artwork_swr"].fresh_s = fresh_s
+    # Single-flight registry so concurrent artwork misses share one upstream fetch
+    hass.data[DOMAIN].setdefault("artwork_flights", SingleFlight())
+    # Short-lived memory of albums/artists/playlists the Mac has no artwork for
+    hass.data[DOMAIN].setdefault("artwork_negative", ArtworkNegativeCache())
+    # Album track lists pulled in by the next-track prefetcher, read by the media browser
+    hass.data[DOMAIN].setdefault("album_tracks", ExpiringCache(ALBUM_TRACKS_TTL_S))
+    # Buffered responses for the idempotent GETs the panel and cards poll
+    hass.data[DOMAIN].setdefault("proxy_cache", ProxyResponseCache())
+    # Identical concurrent proxy GETs share one upstream call
+    hass.data[DOMAIN].setdefault("proxy_coalescer", RequestCoalescer())
+    hass.data[DOMAIN].setdefault("artwork_prefetch", {"runs": 0, "warmed": 0, "hits": 0, "misses": 0, "no_prediction": 0, "same_album": 0, "already_cached": 0})
+    # WebP/AVIF variants: transcode/serve counters, and sources where re-encoding didn't pay off
+    hass.data[DOMAIN].setdefault("artwork_variants", {
+        "encoded": 0, "no_gain": 0, "bytes_saved_encoded": 0, "served": 0, "bytes_saved_served": 0,
+    })
+    hass.data[DOMAIN].setdefault("artwork_variant_no_gain", ExpiringCache(86400, 4096))
+    # Dominant colour / palette / placeholders per artwork hash, in front of the catalog
+    hass.data[DOMAIN].setdefault("artwork_summaries", ExpiringCache(86400, 512))
     # Serve static panel assets & optionally register the sidebar panel
     _register_static(hass)
     # Ensure brand images are exposed even if frontend build folder is absent
@@ -334,8 +483,13 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         ("repeat_view", AppleMusicRepeatProxyView),
         ("events_view", AppleMusicEventsProxyView),
         ("panel_info_view", AppleMusicPanelInfoView),
+        ("cache_stats_view", AppleMusicCacheStatsView),
         ("artwork_view", AppleMusicArtworkView),
+        ("artwork_sheet_view", AppleMusicArtworkSheetView),
+        ("artwork_sheet_image_view", AppleMusicArtworkSheetImageView),
+        ("artwork_hash_view", AppleMusicArtworkHashView),
         ("queue_artist_shuffled_view", AppleMusicQueueArtistShuffledProxyView),
+        ("batch_view", AppleMusicBatchView),
         ("generic_view", AppleMusicGenericProxyView),
     ):
         if hass.data[DOMAIN].get(key) is None:
@@ -393,7 +547,83 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     except Exception:
         pass
 
-    # Note: Artwork caching and related services were removed.
+    # Open the artwork catalog (SQLite, WAL) and import legacy per-key JSON metas once
+    if hass.data[DOMAIN].get("artwork_catalog") is None:
+        catalog = ArtworkCatalog(hass.config.path(".storage", "music_controller", CATALOG_FILENAME))
+
+        def _open_catalog() -> int:
+            catalog.open()
+            return catalog.migrate_from_json(
+                Path(hass.config.path(".storage", "music_controller", "thumbs")),
+                Path(hass.config.path(".storage", "music_controller", "artwork")),
+            )
+        try:
+            migrated = await hass.async_add_executor_job(_open_catalog)
+            hass.data[DOMAIN]["artwork_catalog"] = catalog
+            if migrated:
+                _LOGGER.info("apple_music: imported %d artwork metas into %s", migrated, CATALOG_FILENAME)
+        except Exception as e:
+            _LOGGER.warning("apple_music: artwork catalog unavailable: %s", e)
+
+    # Optional pack backend: small thumbnails appended to a few mmap-read files instead of one .bin each
+    thumbs_dir = Path(hass.config.path(".storage", "music_controller", "thumbs"))
+    pack = artwork_pack(thumbs_dir)
+    if entry.options.get(CONF_ARTWORK_PACK, False):
+        if pack is None:
+            pack = ArtworkPack(pack_dir(thumbs_dir))
+            try:
+                await hass.async_add_executor_job(pack.open)
+                register_pack(thumbs_dir, pack)
+            except Exception as e:
+                _LOGGER.warning("apple_music: artwork pack store unavailable: %s", e)
+    else:
+        # Turned off (now or before a restart): move packed thumbnails back to .bin files
+        try:
+            moved = await hass.async_add_executor_job(
+                unpack_thumbnails, thumbs_dir, Path(hass.config.path(".storage", "music_controller", "artwork"))
+            )
+            if moved:
+                _LOGGER.info("apple_music: moved %d packed thumbnails back to files", moved)
+        except Exception as e:
+            _LOGGER.warning("apple_music: unpacking artwork thumbnails failed: %s", e)
+
+    # Background janitor: keep the artwork store within the configured disk quota
+    disk_quota = int(entry.options.get(CONF_ARTWORK_DISK_MB, DEFAULT_ARTWORK_DISK_MB)) * 1024 * 1024
+    janitor_state = hass.data[DOMAIN].setdefault("artwork_janitor", {"runs": 0, "bytes_reclaimed_total": 0, "running": False})
+
+    async def _run_artwork_janitor(_now=None) -> None:
+        catalog = hass.data.get(DOMAIN, {}).get("artwork_catalog")
+        if catalog is None or janitor_state.get("running"):
+            return
+        janitor_state["running"] = True
+        try:
+            report = await hass.async_add_executor_job(
+                sweep_disk_cache,
+                catalog,
+                Path(hass.config.path(".storage", "music_controller", "thumbs")),
+                Path(hass.config.path(".storage", "music_controller", "artwork")),
+                disk_quota,
+            )
+            janitor_state["runs"] += 1
+            janitor_state["bytes_reclaimed_total"] += report.get("bytes_reclaimed", 0)
+            janitor_state["last"] = report
+            if report.get("bytes_reclaimed"):
+                _LOGGER.debug(
+                    "apple_music: artwork janitor reclaimed %d bytes (%d orphans, %d evicted); store now %d bytes",
+                    report["bytes_reclaimed"], report["orphans"], report["evicted"], report["total_bytes"],
+                )
+        except Exception as e:
+            _LOGGER.debug("apple_music: artwork janitor failed: %s", e)
+        finally:
+            janitor_state["running"] = False
+
+    async def _first_janitor_pass() -> None:
+        await asyncio.sleep(ARTWORK_JANITOR_FIRST_DELAY)
+        await _run_artwork_janitor()
+
+    entry.async_on_unload(async_track_time_interval(hass, _run_artwork_janitor, ARTWORK_JANITOR_INTERVAL))
+    janitor_task = hass.async_create_task(_first_janitor_pass())
+    entry.async_on_unload(janitor_task.cancel)
 
     # Force (re)discovery/creation of AirPlay switches & numbers
     SERVICE_SYNC_AIRPLAY_ENTITIES = "sync_airplay_entities"
@@ -610,7 +840,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
             base = None
         if not base:
             return
-        session = async_get_clientsession(hass)
+        session = upstream_session(hass)
         try:
             async with session.post(f"{base}{path}") as resp:
                 await resp.read()
@@ -628,12 +858,34 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
     async def _svc_purge_ha_album_cache(call):
         base_dir = Path(hass.config.path(".storage", "music_controller", "thumbs"))
-        try:
+        sheets = _sheet_dir(hass)
+        catalog = hass.data.get(DOMAIN, {}).get("artwork_catalog")
+
+        pack = artwork_pack(base_dir)
+
+        def _purge():
             if base_dir.is_dir():
                 shutil.rmtree(base_dir)
             base_dir.mkdir(parents=True, exist_ok=True)
+            if pack is not None:
+                pack.clear()
+            if sheets.is_dir():
+                shutil.rmtree(sheets)
+            if catalog is not None:
+                catalog.clear(thumbs_only=True)
+        try:
+            await hass.async_add_executor_job(_purge)
         except Exception:
             pass
+        mem = hass.data.get(DOMAIN, {}).get("artwork_mem")
+        if mem is not None:
+            mem.clear()
+        neg = hass.data.get(DOMAIN, {}).get("artwork_negative")
+        if neg is not None:
+            neg.clear()
+        swr = hass.data.get(DOMAIN, {}).get("artwork_swr")
+        if swr is not None:
+            swr.clear()
 
     hass.services.async_register(DOMAIN, SERVICE_PURGE_HA_ALBUM_CACHE, _svc_purge_ha_album_cache)
 
@@ -641,7 +893,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     SERVICE_REFRESH_CURRENT_ARTWORK = "refresh_current_artwork"
 
     async def _svc_refresh_current_artwork(call):
-        session = async_get_clientsession(hass)
+        session = upstream_session(hass)
         token: str | None = None
         base = None
         try:
@@ -649,6 +901,12 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
             token = getattr(player, "_last_artwork_token", None)
         except Exception:
             token = None
+        # An explicit refresh always re-asks the Mac, even for albums known to have no art
+        neg = hass.data.get(DOMAIN, {}).get("artwork_negative")
+        if neg is not None:
+            alb = getattr(hass.data.get(DOMAIN, {}).get("player_ref"), "_attr_media_album_name", None)
+            if alb:
+                neg.discard(f"album__{_sanitize_filename(str(alb))}")
         try:
             base = AppleMusicStatusProxyView(hass)._resolve_base_url()  # type: ignore[arg-type]
         except Exception:
@@ -668,43 +926,30 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
                         data = None
             except Exception:
                 data = None
-        # If we received bytes, write HA-side cache using canonical hash and album meta
-        if data:
+        # If we received bytes, write HA-side cache using canonical hash and the catalog
+        if data and data != _BLANK_PNG:
             try:
-                # Compute content hash
-                try:
-                    sha1 = hashlib.sha1(data).hexdigest()
-                except Exception:
-                    sha1 = None
-                # Write canonical full-size artwork under .storage/music_controller/artwork/<hash>.bin
-                fdir = Path(hass.config.path(".storage", "music_controller", "artwork"))
-                fdir.mkdir(parents=True, exist_ok=True)
-                if sha1:
-                    canon = fdir / f"{sha1}.bin"
-                    if not canon.is_file():
-                        tmp = canon.with_suffix(".tmp")
-                        with open(tmp, "wb") as f:
-                            f.write(data)
-                        os.replace(tmp, canon)
-                # Prefer album metadata mapping; fall back to 'current' if unavailable
+                sha1 = hashlib.sha1(data).hexdigest()
+                # Prefer album mapping; fall back to 'current' if unavailable
                 album_name = None
                 try:
                     player = hass.data.get(DOMAIN, {}).get("player_ref")
                     album_name = getattr(player, "_attr_media_album_name", None)
                 except Exception:
                     album_name = None
-                if album_name:
-                    meta_path = fdir / f"album__{_sanitize_filename(str(album_name))}.json"
+                art_key = f"album__{_sanitize_filename(str(album_name))}" if album_name else "current"
+                tdir = Path(hass.config.path(".storage", "music_controller", "thumbs"))
+                fdir = Path(hass.config.path(".storage", "music_controller", "artwork"))
+                catalog = hass.data.get(DOMAIN, {}).get("artwork_catalog")
+                # Canonical full-size artwork lives under .storage/music_controller/artwork/<hash>.bin
+                if catalog is not None:
+                    await hass.async_add_executor_job(store_artwork, catalog, tdir, fdir, art_key, None, data, ctype, sha1)
                 else:
-                    meta_path = fdir / "current.json"
-                meta = {"content_type": ctype, "ts": int(time.time())}
-                if sha1:
-                    meta["hash"] = sha1
-                try:
-                    with open(meta_path, "w", encoding="utf-8") as mf:
-                        json.dump(meta, mf)
-                except Exception:
-                    pass
+                    await hass.async_add_executor_job(write_blob, blob_path(tdir, fdir, sha1, None), data)
+                # Keep the in-memory LRU in step with the catalog
+                mem = hass.data.get(DOMAIN, {}).get("artwork_mem")
+                if mem is not None:
+                    mem.put(art_key, None, data, ctype, sha1)
             except Exception:
                 pass
         # Notify UIs so custom panel/card update immediately
@@ -715,6 +960,152 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
     hass.services.async_register(DOMAIN, SERVICE_REFRESH_CURRENT_ARTWORK, _svc_refresh_current_artwork)
 
+    # Bulk warm-up of library artwork (albums/artists/playlists) into the HA-side cache
+    SERVICE_WARM_ARTWORK_CACHE = "warm_artwork_cache"
+    WARM_ARTWORK_CACHE_SCHEMA = vol.Schema({
+        vol.Optional("sizes", default=[ARTWORK_SIZE_LADDER[0]]): vol.All(cv.ensure_list, [vol.All(vol.Coerce(int), vol.In(ARTWORK_SIZE_LADDER))]),
+        vol.Optional("kinds", default=list(ARTWORK_WARM_KINDS)): vol.All(cv.ensure_list, [vol.In(list(ARTWORK_WARM_KINDS))]),
+        vol.Optional("concurrency", default=4): vol.All(vol.Coerce(int), vol.Range(min=1, max=16)),
+    })
+    # Job parameters and cursor are persisted so an interrupted warm-up resumes after restart
+    warm_store = Store(hass, 1, f"{DOMAIN}.artwork_warm")
+    warm_state = hass.data[DOMAIN].setdefault("artwork_warm", {"running": False})
+
+    async def _run_artwork_warm(job: dict) -> None:
+        if warm_state.get("running"):
+            return
+        base = AppleMusicStatusProxyView(hass)._resolve_base_url()  # type: ignore[arg-type]
+        if not base:
+            return
+        warm_state.clear()
+        warm_state.update({
+            "running": True, "sizes": job["sizes"], "kinds": job["kinds"],
+            "total": 0, "done": 0, "fetched": 0, "skipped": 0, "failed": 0,
+        })
+        try:
+            work: list[tuple[str, str, int]] = []
+            for kind in job["kinds"]:
+                try:
+                    items = await _get_json(hass, base, f"/{kind}")
+                except Exception:
+                    items = []
+                for item in items if isinstance(items, list) else []:
+                    name = item if isinstance(item, str) else (item.get("name") if isinstance(item, dict) else None)
+                    if name:
+                        work.extend((kind, str(name), size) for size in job["sizes"])
+            concurrency = int(job["concurrency"])
+            # Anything before the saved cursor was already handled; back off one batch for in-flight items
+            cursor = max(0, int(job.get("cursor", 0)) - concurrency)
+            warm_state["total"] = len(work)
+            warm_state["done"] = cursor
+            store = hass.data.get(DOMAIN, {})
+            neg = store.get("artwork_negative")
+
+            async def _progress(final: bool = False) -> None:
+                job["cursor"] = cursor
+                try:
+                    if final:
+                        await warm_store.async_remove()
+                    else:
+                        await warm_store.async_save(job)
+                except Exception:
+                    pass
+                hass.bus.async_fire(EVENT_ARTWORK_WARM_PROGRESS, {
+                    k: warm_state[k] for k in ("total", "done", "fetched", "skipped", "failed")
+                } | {"finished": final})
+
+            async def _worker() -> None:
+                nonlocal cursor
+                while cursor < len(work):
+                    kind, name, size = work[cursor]
+                    cursor += 1
+                    # Interactive artwork requests go first
+                    while store.get("artwork_interactive", 0) > 0:
+                        await asyncio.sleep(0.25)
+                    key = f"{ARTWORK_WARM_KINDS[kind]}__{_sanitize_filename(name)}"
+                    if (neg is not None and neg.has(key)) or await _async_artwork_cached(hass, [key], size):
+                        warm_state["skipped"] += 1
+                    else:
+                        got = await _async_fetch_artwork(
+                            hass, key, size,
+                            album=name if kind == "albums" else None,
+                            artist=name if kind == "artists" else None,
+                            plist=name if kind == "playlists" else None,
+                        )
+                        warm_state["fetched" if got and got[2] else "failed"] += 1
+                    warm_state["done"] += 1
+                    if warm_state["done"] % ARTWORK_WARM_PROGRESS_EVERY == 0:
+                        await _progress()
+
+            await asyncio.gather(*(_worker() for _ in range(concurrency)))
+            await _progress(final=True)
+            _LOGGER.info(
+                "apple_music: artwork warm-up done (%d fetched, %d already cached, %d without artwork)",
+                warm_state["fetched"], warm_state["skipped"], warm_state["failed"],
+            )
+        except asyncio.CancelledError:
+            # Unload/shutdown: keep the saved cursor so the next start resumes
+            raise
+        except Exception as e:
+            _LOGGER.debug("apple_music: artwork warm-up failed: %s", e)
+        finally:
+            warm_state["running"] = False
+
+    def _start_artwork_warm(job: dict) -> None:
+        task = hass.async_create_task(_run_artwork_warm(job))
+        entry.async_on_unload(task.cancel)
+
+    async def _svc_warm_artwork_cache(call):
+        if warm_state.get("running"):
+            _LOGGER.info("apple_music: artwork warm-up already running")
+            return
+        job = {"sizes": list(call.data["sizes"]), "kinds": list(call.data["kinds"]), "concurrency": call.data["concurrency"], "cursor": 0}
+        try:
+            await warm_store.async_save(job)
+        except Exception:
+            pass
+        _start_artwork_warm(job)
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_WARM_ARTWORK_CACHE,
+        _svc_warm_artwork_cache,
+        schema=WARM_ARTWORK_CACHE_SCHEMA,
+    )
+
+    # Resume a warm-up that was interrupted by a restart, once HA is up
+    try:
+        pending_warm = await warm_store.async_load()
+    except Exception:
+        pending_warm = None
+    if isinstance(pending_warm, dict) and pending_warm.get("sizes") and not warm_state.get("running"):
+        if hass.is_running:
+            _start_artwork_warm(pending_warm)
+        else:
+            @callback
+            def _resume_artwork_warm(_event) -> None:
+                _start_artwork_warm(pending_warm)
+            hass.bus.async_listen_once(EVENT_HOMEASSISTANT_START, _resume_artwork_warm)
+
+    # Once per HA start, after everything else is up: check cached album art against the Mac's etags
+    async def _validate_artwork_later() -> None:
+        await asyncio.sleep(ARTWORK_VALIDATION_DELAY_S)
+        await _async_validate_artwork_cache(hass)
+
+    # Runs on the event loop, also as the STARTED listener (a plain def would go to the executor)
+    @callback
+    def _start_artwork_validation(_event=None) -> None:
+        if "artwork_validation" in hass.data.get(DOMAIN, {}):
+            return
+        hass.data[DOMAIN]["artwork_validation"] = {"running": False}
+        task = hass.async_create_task(_validate_artwork_later())
+        entry.async_on_unload(task.cancel)
+
+    if hass.is_running:
+        _start_artwork_validation()
+    else:
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STARTED, _start_artwork_validation)
+
     # Start SSE listener to push real-time state into HA
     try:
         await _maybe_start_sse_listener(hass, entry)
@@ -730,7 +1121,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         # Wait longer to ensure all entities are subscribed to dispatcher
         await asyncio.sleep(5)
         try:
-            session = async_get_clientsession(hass)
+            session = upstream_session(hass, entry_id=entry.entry_id)
             cfg = hass.data.get(DOMAIN, {}).get("config") or {}
             base = cfg.get("base_url")
             if not base:
@@ -786,32 +1177,171 @@ class _AppleMusicProxyBase(HomeAssistantView):
         return None
 
     async def _proxy(self, request: web.Request, path: str, method: str = "GET") -> web.StreamResponse:
+        """Stream the request body up and the upstream body back, chunk by chunk.
+
+        Nothing is buffered whole: large /albums or /songs lists reach the browser as they
+        arrive. The upstream body is relayed still encoded, so Content-Length and
+        Content-Encoding stay valid.
+        """
         base = self._resolve_base_url()
         if not base:
             return web.Response(status=404, text="apple_music not configured")
         url = f"{base}{path}"
+        session = upstream_session(self.hass)
+        store = self.hass.data.get(DOMAIN, {})
+        cache = store.get("proxy_cache")
+        coalescer = store.get("proxy_coalescer")
+        route = path.split("?", 1)[0]
+        if method == "GET" and cache is not None and route in PROXY_CACHE_TTLS:
+            return await self._proxy_cached(request, session, url, path, route, cache, coalescer)
+        # Identical GETs already in flight: wait for the leader's body (the encoding it relays must suit us too).
+        # Conditional or ranged requests are never coalesced: their 304/206 is not what others asked for.
+        flight_key = None
+        if method == "GET" and not any(h in request.headers for h in PROXY_NO_COALESCE_HEADERS):
+            flight_key = ("GET", path, request.headers.get("Accept-Encoding", ""))
+        if flight_key is not None and coalescer is not None:
+            leader = coalescer.follow(flight_key)
+            if leader is not None:
+                shared = await asyncio.shield(leader)
+                if shared is not None:
+                    return web.Response(status=shared[0], body=shared[2], headers=shared[1])
+                coalescer.fallbacks += 1
+                flight_key = None
+        flight = coalescer.lead(flight_key) if flight_key is not None and coalescer is not None else None
         # pass through body & headers for mutating methods
-        session = async_get_clientsession(self.hass)
-        json_payload = None
-        data = None
-        if method in {"POST", "PUT", "PATCH"}:
-            ctype = request.headers.get("Content-Type", "")
-            if "json" in ctype.lower():
+        data = request.content if method in {"POST", "PUT", "PATCH", "DELETE"} and request.body_exists else None
+        headers = {h: request.headers[h] for h in PROXY_PASS_REQUEST_HEADERS if h in request.headers}
+        # The body is relayed as-is, so never let aiohttp ask for an encoding the client did not
+        if "Accept-Encoding" not in request.headers:
+            headers["Accept-Encoding"] = "identity"
+        # No total timeout: a long body may take a while, but a stalled upstream still fails
+        timeout = aiohttp.ClientTimeout(total=None, sock_connect=10, sock_read=30)
+        shared = None
+        try:
+            try:
+                resp = await session.request(
+                    method, url, headers=headers, data=data, timeout=timeout, auto_decompress=False
+                )
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                _LOGGER.debug("apple_music: proxy %s %s failed: %s", method, path, e)
+                return web.Response(status=502, text="apple_music upstream unavailable")
+            async with resp:
+                # A change made through the proxy (volume, devices, shuffle...) makes cached state stale
+                if method != "GET" and cache is not None and resp.status < 400:
+                    cache.invalidate(PROXY_CACHE_VOLATILE)
+                out_headers = {h: resp.headers[h] for h in PROXY_PASS_RESPONSE_HEADERS if h in resp.headers}
+                out = web.StreamResponse(status=resp.status, headers=out_headers)
+                await out.prepare(request)
+                # The leader still streams; a copy is kept for followers while it stays small
+                kept: list[bytes] | None = [] if flight is not None else None
+                kept_bytes = 0
                 try:
-                    json_payload = await request.json()
-                except Exception:
-                    json_payload = None
-            if json_payload is None:
-                data = await request.read()
-
-        headers = {k: v for k, v in request.headers.items() if k.lower() not in {"host", "authorization", "cookie"}}
-        async with session.request(
-            method, url, headers=headers, json=json_payload, data=data, timeout=aiohttp.ClientTimeout(total=30)
-        ) as resp:
-            body = await resp.read()
-            ctype = resp.headers.get("Content-Type") or resp.headers.get("content-type")
-            out_headers = {"Content-Type": ctype} if ctype else {}
-            return web.Response(status=resp.status, body=body, headers=out_headers)
+                    async for chunk in resp.content.iter_chunked(PROXY_CHUNK_SIZE):
+                        await out.write(chunk)
+                        if kept is not None:
+                            kept_bytes += len(chunk)
+                            if kept_bytes > PROXY_COALESCE_MAX_BYTES:
+                                kept = None
+                            else:
+                                kept.append(chunk)
+                except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                    # Headers are out already: drop the connection so the client sees a cut-off body
+                    _LOGGER.warning("apple_music: proxy %s %s cut off mid-body: %s", method, path, e)
+                    if request.transport is not None:
+                        request.transport.close()
+                    return out
+                await out.write_eof()
+                if kept is not None:
+                    shared = (
+                        resp.status,
+                        {h: v for h, v in out_headers.items() if h != "Content-Length"},
+                        b"".join(kept),
+                    )
+                return out
+        finally:
+            if flight is not None:
+                coalescer.finish(flight_key, flight, shared)
+
+    async def _proxy_cached(
+        self,
+        request: web.Request,
+        session,
+        url: str,
+        key: str,
+        route: str,
+        cache: ProxyResponseCache,
+        coalescer: RequestCoalescer | None = None,
+    ) -> web.StreamResponse:
+        """GET through the response cache: fresh hits skip the Mac, stale ones are revalidated.
+
+        Cached routes are buffered and stored decoded, so every client gets the same
+        body and Content-Type regardless of its Accept-Encoding.
+        """
+        # Cached bodies are shared by everyone: no client encoding or validators go upstream
+        headers = {h: request.headers[h] for h in ("Accept", "Accept-Language") if h in request.headers}
+        try:
+            status, out_headers, body = await self._cached_get(session, url, key, route, cache, coalescer, headers)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            _LOGGER.debug("apple_music: proxy GET %s failed: %s", key, e)
+            return web.Response(status=502, text="apple_music upstream unavailable")
+        tag = out_headers.get("ETag")
+        inm = request.headers.get("If-None-Match")
+        if status == 200 and tag and inm and tag in inm:
+            return web.Response(status=304, headers=out_headers)
+        return web.Response(status=status, body=body, headers=out_headers)
+
+    async def _cached_get(
+        self,
+        session,
+        url: str,
+        key: str,
+        route: str,
+        cache: ProxyResponseCache,
+        coalescer: RequestCoalescer | None,
+        headers: dict,
+    ) -> tuple[int, dict, bytes]:
+        """(status, headers, body) for a cacheable GET: fresh entry, shared in-flight fetch, or one upstream call."""
+        ttl = PROXY_CACHE_TTLS[route]
+        cached = cache.lookup(key)
+        if cached is not None and cached[2]:
+            return 200, cached[1], cached[0]
+        # A miss or revalidation for this key is already in flight: share its answer
+        flight_key = ("GET", key)
+        if coalescer is not None:
+            leader = coalescer.follow(flight_key)
+            if leader is not None:
+                shared = await asyncio.shield(leader)
+                if shared is not None:
+                    return shared
+                coalescer.fallbacks += 1
+                coalescer = None
+        headers = dict(headers)
+        if cached is not None:
+            if cached[1].get("ETag"):
+                headers["If-None-Match"] = cached[1]["ETag"]
+            elif cached[1].get("Last-Modified"):
+                headers["If-Modified-Since"] = cached[1]["Last-Modified"]
+        generation = cache.generation(route)
+        flight = coalescer.lead(flight_key) if coalescer is not None else None
+        shared = None
+        try:
+            async with session.get(url, headers=headers, timeout=aiohttp.ClientTimeout(total=30)) as resp:
+                if resp.status == 304 and cached is not None:
+                    cache.refresh(key, ttl)
+                    shared = (200, cached[1], cached[0])
+                else:
+                    body = await resp.read()
+                    out_headers = {
+                        h: resp.headers[h] for h in PROXY_PASS_RESPONSE_HEADERS
+                        if h in resp.headers and h not in ("Content-Length", "Content-Encoding")
+                    }
+                    if resp.status == 200:
+                        cache.put(key, route, ttl, body, out_headers, generation)
+                    shared = (resp.status, out_headers, body)
+        finally:
+            if flight is not None:
+                coalescer.finish(flight_key, flight, shared)
+        return shared
 
 
 class AppleMusicDevicesProxyView(_AppleMusicProxyBase):
@@ -915,7 +1445,7 @@ class AppleMusicEventsProxyView(_AppleMusicProxyBase):
             return web.Response(status=404, text="apple_music not configured")
 
         url = f"{base}/events"
-        session = async_get_clientsession(self.hass)
+        session = upstream_session(self.hass, stream=True)
         try:
             upstream = await session.get(
                 url,
@@ -951,12 +1481,23 @@ class AppleMusicEventsProxyView(_AppleMusicProxyBase):
         except Exception:
             pass
 
+        # Upstream chunks split events anywhere; relay whole events only, so frames
+        # from _broadcast_local_sse always land between two upstream events
+        pending = bytearray()
         try:
             async for chunk in upstream.content.iter_chunked(1024):
                 if not chunk:
                     await asyncio.sleep(0)
                     continue
-                await resp.write(chunk)
+                pending += chunk
+                cut = _sse_event_boundary(pending)
+                if cut:
+                    await resp.write(bytes(pending[:cut]))
+                    del pending[:cut]
+                elif len(pending) > SSE_MAX_PENDING_BYTES:
+                    # Not an event stream we understand; end it and let the client reconnect
+                    _LOGGER.debug("SSE proxy: no event boundary in %d bytes, closing", len(pending))
+                    break
         except asyncio.CancelledError:
             pass
         except Exception as e:  # pragma: no cover
@@ -981,6 +1522,119 @@ class AppleMusicEventsProxyView(_AppleMusicProxyBase):
 
 
 
+class AppleMusicBatchView(_AppleMusicProxyBase):
+    """Several upstream calls in one round trip.
+
+    POST a JSON list (or {"requests": [...]}) of {method, path, body, timeout}. Items run
+    concurrently, GETs through the proxy cache and coalescer, each under its own timeout;
+    the answer is a JSON array of {status, ok, body} in request order.
+    """
+
+    url = "/api/apple_music/batch"
+    name = "apple_music:batch"
+
+    async def post(self, request: web.Request) -> web.StreamResponse:
+        try:
+            payload = await request.json()
+        except Exception:
+            return web.json_response({"error": "invalid JSON"}, status=400)
+        items = payload.get("requests") if isinstance(payload, dict) else payload
+        if not isinstance(items, list) or not items:
+            return web.json_response({"error": "expected a list of requests"}, status=400)
+        if len(items) > BATCH_MAX_ITEMS:
+            return web.json_response({"error": f"at most {BATCH_MAX_ITEMS} requests per batch"}, status=400)
+        base = self._resolve_base_url()
+        if not base:
+            return web.Response(status=404, text="apple_music not configured")
+        stats = self.hass.data[DOMAIN].setdefault("proxy_batch", {"batches": 0, "items": 0, "timeouts": 0, "errors": 0})
+        stats["batches"] += 1
+        stats["items"] += len(items)
+        results = await asyncio.gather(*(self._run_item(base, item, stats) for item in items))
+        return web.json_response(results)
+
+    async def _run_item(self, base: str, item, stats: dict) -> dict:
+        if not isinstance(item, dict):
+            return {"status": 400, "ok": False, "error": "invalid request"}
+        method = str(item.get("method") or "GET").upper()
+        path = str(item.get("path") or "")
+        # Accept the callApi-style paths the frontend already uses
+        for prefix in ("/api/apple_music", "apple_music"):
+            if path.startswith(prefix + "/"):
+                path = path[len(prefix):]
+                break
+        if not path.startswith("/") or path.startswith("//") or method not in {"GET", "POST", "PUT", "PATCH", "DELETE"}:
+            return {"status": 400, "ok": False, "error": "invalid request"}
+        try:
+            limit = min(BATCH_MAX_ITEM_TIMEOUT_S, max(1.0, float(item.get("timeout") or BATCH_ITEM_TIMEOUT_S)))
+        except (TypeError, ValueError):
+            limit = BATCH_ITEM_TIMEOUT_S
+        try:
+            status, headers, body = await asyncio.wait_for(self._call(base, method, path, item.get("body")), limit)
+        except asyncio.TimeoutError:
+            stats["timeouts"] += 1
+            return {"status": 504, "ok": False, "error": "timeout"}
+        except Exception as e:
+            stats["errors"] += 1
+            return {"status": 502, "ok": False, "error": str(e) or type(e).__name__}
+        out: dict = {"status": status, "ok": 200 <= status < 300}
+        ctype = (headers.get("Content-Type") or "").lower()
+        if "json" in ctype:
+            try:
+                out["body"] = json.loads(body)
+            except Exception:
+                out["body"] = body.decode("utf-8", "replace")
+        elif not ctype or ctype.startswith("text/"):
+            out["body"] = body.decode("utf-8", "replace")
+        else:
+            # Binary bodies (artwork) are not inlined
+            out["content_type"] = headers.get("Content-Type")
+            out["bytes"] = len(body)
+        return out
+
+    async def _call(self, base: str, method: str, path: str, body) -> tuple[int, dict, bytes]:
+        """(status, headers, body) of one sub-request, buffered."""
+        session = upstream_session(self.hass)
+        store = self.hass.data.get(DOMAIN, {})
+        cache = store.get("proxy_cache")
+        coalescer = store.get("proxy_coalescer")
+        route = path.split("?", 1)[0]
+        url = f"{base}{path}"
+        if method == "GET" and cache is not None and route in PROXY_CACHE_TTLS:
+            return await self._cached_get(session, url, path, route, cache, coalescer, {})
+        # Same key as a browser GET without Accept-Encoding, so both share one upstream call
+        flight_key = ("GET", path, "") if method == "GET" and coalescer is not None else None
+        if flight_key is not None:
+            leader = coalescer.follow(flight_key)
+            if leader is not None:
+                shared = await asyncio.shield(leader)
+                if shared is not None:
+                    return shared
+                coalescer.fallbacks += 1
+                flight_key = None
+        flight = coalescer.lead(flight_key) if flight_key is not None else None
+        kwargs: dict = {"headers": {"Accept-Encoding": "identity"}}
+        if method != "GET" and body is not None:
+            if isinstance(body, str):
+                kwargs["data"] = body
+            else:
+                kwargs["json"] = body
+        shared = None
+        try:
+            async with session.request(method, url, **kwargs) as resp:
+                data = await resp.read()
+                if method != "GET" and cache is not None and resp.status < 400:
+                    cache.invalidate(PROXY_CACHE_VOLATILE)
+                headers = {
+                    h: resp.headers[h] for h in PROXY_PASS_RESPONSE_HEADERS
+                    if h in resp.headers and h not in ("Content-Length", "Content-Encoding")
+                }
+                shared = (resp.status, headers, data)
+        finally:
+            if flight is not None:
+                coalescer.finish(flight_key, flight, shared)
+        return shared
+
+
 class AppleMusicGenericProxyView(_AppleMusicProxyBase):
     """Catch-all proxy so new server endpoints work without code changes.
     Registered after specific views so it won't shadow them.
@@ -1042,6 +1696,75 @@ class AppleMusicPanelInfoView(HomeAssistantView):
             "asset_version": asset_ver,
         })
 
+
+class AppleMusicCacheStatsView(HomeAssistantView):
+    """Expose HA-side cache counters for diagnostics."""
+
+    url = "/api/apple_music/cache_stats"
+    name = "apple_music:cache_stats"
+    requires_auth = True
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self.hass = hass
+
+    async def get(self, request: web.Request) -> web.StreamResponse:
+        store = self.hass.data.get(DOMAIN, {})
+        out: dict = {}
+        mem = store.get("artwork_mem")
+        if mem is not None:
+            out["artwork_memory"] = mem.stats()
+        flights = store.get("artwork_flights")
+        if flights is not None:
+            out["artwork_fetch"] = flights.stats()
+        neg = store.get("artwork_negative")
+        if neg is not None:
+            out["artwork_negative"] = neg.stats()
+        prefetch = store.get("artwork_prefetch")
+        if prefetch is not None:
+            judged = prefetch["hits"] + prefetch["misses"]
+            out["artwork_prefetch"] = {**prefetch, "hit_rate": (prefetch["hits"] / judged) if judged else None}
+        tracks = store.get("album_tracks")
+        if tracks is not None:
+            out["album_tracks"] = tracks.stats()
+        proxy_cache = store.get("proxy_cache")
+        if proxy_cache is not None:
+            out["proxy_cache"] = proxy_cache.stats()
+        coalescer = store.get("proxy_coalescer")
+        if coalescer is not None:
+            out["proxy_coalescing"] = coalescer.stats()
+        batch = store.get("proxy_batch")
+        if batch:
+            out["proxy_batch"] = dict(batch)
+        warm = store.get("artwork_warm")
+        if warm:
+            out["artwork_warm"] = dict(warm)
+        validation = store.get("artwork_validation")
+        if validation:
+            out["artwork_validation"] = dict(validation)
+        variants = store.get("artwork_variants")
+        if variants is not None:
+            out["artwork_variants"] = {**variants, "formats": list(variant_formats())}
+        summaries = store.get("artwork_summaries")
+        if summaries is not None:
+            out["artwork_summaries"] = summaries.stats()
+        swr = store.get("artwork_swr")
+        if swr is not None:
+            out["artwork_swr"] = swr.stats()
+        pack = artwork_pack(Path(self.hass.config.path(".storage", "music_controller", "thumbs")))
+        if pack is not None:
+            out["artwork_pack"] = pack.stats()
+        pools = {
+            eid: data["upstream"].stats()
+            for eid, data in store.items()
+            if isinstance(data, dict) and isinstance(data.get("upstream"), UpstreamClient)
+        }
+        if pools:
+            out["upstream_pools"] = pools
+        janitor = store.get("artwork_janitor")
+        if janitor is not None:
+            out["artwork_disk"] = {k: v for k, v in janitor.items() if k != "running"}
+        return web.json_response(out)
+
 # AppleMusicThumbProxyView must be at top-level for use in async_setup_entry
 
 class AppleMusicUIRedirectView(HomeAssistantView):
@@ -1092,379 +1815,1117 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
                 task.cancel()
         except Exception:
             pass
-        hass.data[DOMAIN].pop(entry.entry_id)
+        entry_data = hass.data[DOMAIN].pop(entry.entry_id)
+        # Close this entry's upstream pools (the SSE tasks using them were cancelled above)
+        upstream = entry_data.get("upstream") if isinstance(entry_data, dict) else None
+        if upstream is not None:
+            await upstream.close()
     return unload_ok
 
 
-class AppleMusicArtworkView(HomeAssistantView):
-    """Serve artwork with HA-side caching and optional refresh.
+def _artwork_dirs(hass: HomeAssistant) -> tuple[Path, Path]:
+    """(thumbs, full-size) directories of the HA-side artwork store."""
+    return (
+        Path(hass.config.path(".storage", "music_controller", "thumbs")),
+        Path(hass.config.path(".storage", "music_controller", "artwork")),
+    )
 
-    URL: /api/apple_music/artwork?tok=...&refresh=1
-    When 'tok' is provided, it is used as the cache key; otherwise we fall back to 'cache' or 'current'.
-    """
 
-    url = "/api/apple_music/artwork"
-    name = "apple_music:artwork"
-    requires_auth = False
+def _sheet_dir(hass: HomeAssistant) -> Path:
+    """Composed sprite sheets, named by their content address."""
+    return Path(hass.config.path(".storage", "music_controller", "sheets"))
 
-    def __init__(self, hass: HomeAssistant) -> None:
-        self.hass = hass
 
-    def _thumb_dir(self) -> Path:
-        d = Path(self.hass.config.path(".storage", "music_controller", "thumbs"))
-        try:
-            d.mkdir(parents=True, exist_ok=True)
-        except Exception:
-            pass
-        return d
+async def _async_artwork_cached(hass: HomeAssistant, keys: list[str], size: int | None) -> str | None:
+    """Etag of the first of keys with committed bytes at size (memory, else catalog + blob), or None."""
+    store = hass.data.get(DOMAIN, {})
+    mem = store.get("artwork_mem")
+    catalog = store.get("artwork_catalog")
+    if mem is not None:
+        for k in keys:
+            etag = mem.peek_etag(k, size)
+            if etag:
+                return etag
+    if catalog is None:
+        return None
+    tdir, fdir = _artwork_dirs(hass)
 
-    # Backward compat alias
-    def _cache_dir(self) -> Path:
-        return self._thumb_dir()
+    def _on_disk() -> str | None:
+        for row in catalog.lookup([(*split_cache_key(k), size) for k in keys]):
+            if has_blob(tdir, fdir, row["hash"], size):
+                return row["hash"]
+        return None
+    try:
+        return await hass.async_add_executor_job(_on_disk)
+    except Exception:
+        return None
 
-    def _full_dir(self) -> Path:
-        d = Path(self.hass.config.path(".storage", "music_controller", "artwork"))
-        try:
-            d.mkdir(parents=True, exist_ok=True)
-        except Exception:
-            pass
-        return d
 
-    def _sanitize(self, name: str | None) -> str:
-        return _sanitize_filename(name)
+async def _async_artwork_summary(
+    hass: HomeAssistant, etag: str, data: bytes | None = None, size: int | None = None,
+) -> dict | None:
+    """Colour summary and placeholders for etag: memory, else catalog, else computed once and stored.
 
-    async def _current_album(self) -> str | None:
+    Without data the source blob is read from disk (size first, then the ladder top, then full size).
+    """
+    store = hass.data.get(DOMAIN, {})
+    cache = store.get("artwork_summaries")
+    if cache is not None:
+        hit = cache.get(etag)
+        if hit is not None:
+            return hit
+    catalog = store.get("artwork_catalog")
+    flights = store.get("artwork_flights")
+    tdir, fdir = _artwork_dirs(hass)
+
+    async def _compute() -> dict | None:
+        def _load() -> tuple[dict | None, bytes | None]:
+            if catalog is not None:
+                known = catalog.get_summary(etag)
+                if known:
+                    return known, None
+            if data:
+                return None, data
+            for sz in dict.fromkeys((size, ARTWORK_SIZE_LADDER[-1], None)):
+                src = read_blob(tdir, fdir, etag, sz)
+                if src is not None:
+                    return None, src
+            return None, None
         try:
-            base = AppleMusicStatusProxyView(self.hass)._resolve_base_url()  # type: ignore[arg-type]
-            if not base:
-                return None
-            session = async_get_clientsession(self.hass)
-            async with session.get(f"{base}/now_playing") as resp:
-                if resp.status == 200:
-                    data = await resp.json()
-                    alb = data.get("album")
-                    if isinstance(alb, str) and alb.strip():
-                        return alb
+            known, src = await hass.async_add_executor_job(_load)
         except Exception:
             return None
+        if known or not src or not imaging_available():
+            return known
+        try:
+            summary = await asyncio.get_running_loop().run_in_executor(image_executor(), summarize_artwork, src)
+        except Exception:
+            summary = None
+        if summary and catalog is not None:
+            try:
+                await hass.async_add_executor_job(catalog.put_summary, etag, summary)
+            except Exception:
+                pass
+        return summary
+
+    if flights is not None:
+        summary = await flights.run(("summary", etag), _compute)
+    else:
+        summary = await _compute()
+    if summary and cache is not None:
+        cache.put(etag, summary)
+    return summary
+
+
+async def _async_fetch_artwork(
+    hass: HomeAssistant,
+    key: str,
+    want_size: int | None,
+    *,
+    token: str | None = None,
+    album: str | None = None,
+    artist: str | None = None,
+    plist: str | None = None,
+    refresh: bool = False,
+) -> tuple[bytes, str, str | None] | None:
+    """Fetch key/size from the Mac into the HA-side caches, in-process.
+
+    Concurrent callers for the same key/size (artwork view, SSE warm-up, ...)
+    share one upstream fetch. Returns (bytes, content_type, etag) with etag None
+    when the Mac has no artwork, or None when the fetch failed.
+    """
+    base = AppleMusicStatusProxyView(hass)._resolve_base_url()  # type: ignore[arg-type]
+    if not base:
         return None
+    store = hass.data.get(DOMAIN, {})
+    mem = store.get("artwork_mem")
+    catalog = store.get("artwork_catalog")
+    neg = store.get("artwork_negative")
+    flights = store.get("artwork_flights")
+    swr = store.get("artwork_swr")
+    tdir, fdir = _artwork_dirs(hass)
+    top = ARTWORK_SIZE_LADDER[-1]
+
+    async def _upstream_get(size: int | None) -> tuple[bytes, str] | None:
+        """GET one artwork variant from the Mac."""
+        session = upstream_session(hass)
+        # Choose upstream path based on requested size or explicit target
+        params = {}
+        if refresh:
+            params["refresh"] = "1"
+        if album and size:
+            url = f"{base}/artwork_album_thumb/{size}/{quote(album)}"
+        elif artist and size:
+            url = f"{base}/artwork_artist_thumb/{size}/{quote(artist)}"
+        elif plist and size:
+            url = f"{base}/artwork_playlist_thumb/{size}/{quote(plist)}"
+        else:
+            url = f"{base}/artwork_thumb/{size}" if size else f"{base}/artwork"
+            if token:
+                params["tok"] = token
+        try:
+            async with session.get(url, params=params) as upstream:
+                data = await upstream.read()
+                ctype = upstream.headers.get("Content-Type") or upstream.headers.get("content-type") or "image/jpeg"
+                if upstream.status == 204 or (upstream.status == 200 and not data):
+                    # Nothing to show; handled like the 1x1 placeholder
+                    return _BLANK_PNG, "image/png"
+                if upstream.status != 200:
+                    return None
+                return data, ctype
+        except Exception:
+            return None
 
-    async def get(self, request: web.Request) -> web.StreamResponse:
-        from aiohttp import web
-        token = request.query.get("tok")
-        want_refresh = request.query.get("refresh") is not None
-        # Support conditional requests from browsers/caches
-        inm_header = request.headers.get("If-None-Match")
-        # Optional explicit targets for thumbnails or specific items
-        q_album = request.query.get("album")
-        q_artist = request.query.get("artist")
-        q_plist = request.query.get("playlist") or request.query.get("plist")
-        # Capture album for metadata only; do not use it for default cache key
-        album = q_album or (await self._current_album())
-        size_param = request.query.get("size")
-        want_size: int | None = None
+    async def _store(
+        size: int | None, data: bytes, ctype: str, etag: str,
+        validated: tuple[float, str | None] | None = None,
+    ) -> None:
+        """Write the canonical content-addressed blob, point the catalog row and memory at it.
+
+        validated is (timestamp, upstream etag) the bytes are known current as of; None means now.
+        """
+        if validated is None:
+            validated = (time.time(), swr.latest(key) if swr is not None else None)
+
+        def _write_canonical_and_meta() -> float | None:
+            """Write blob and row; return the row's 'updated' (the key's Last-Modified)."""
+            try:
+                if catalog is not None:
+                    store_artwork(catalog, tdir, fdir, key, size, data, ctype, etag)
+                    catalog.mark_validated(*split_cache_key(key), size, validated[1], int(validated[0]))
+                    for row in catalog.lookup([(*split_cache_key(key), size)]):
+                        if row["hash"] == etag:
+                            return row["updated"]
+                else:
+                    write_blob(blob_path(tdir, fdir, etag, size), data)
+            except Exception:
+                pass
+            return None
         try:
-            if size_param is not None:
-                want_size = int(size_param)
+            updated = await hass.async_add_executor_job(_write_canonical_and_meta)
         except Exception:
-            want_size = None
-        tdir = self._thumb_dir(); fdir = self._full_dir()
-        # Build a cache key; when a token is provided, ONLY use the token as the filename base.
-        # This avoids illegal characters from album/artist names in the artwork directory.
-        def _tok_base(val: str | None) -> str | None:
-            if not val:
+            updated = None
+        if mem is not None:
+            mem.put(key, size, data, ctype, etag, updated)
+        if neg is not None:
+            neg.discard(key)
+        if swr is not None:
+            swr.note_validated(key, size, *validated)
+
+    async def _fetch_direct(size: int | None) -> tuple[bytes, str, str | None] | None:
+        """Fetch one variant from the Mac and populate the caches."""
+        got = await _upstream_get(size)
+        if not got:
+            return None
+        data, ctype = got
+        # Do not persist the 1x1 placeholder into cache; force re-fetch next time
+        if len(data) <= (len(_BLANK_PNG) + 10) and data == _BLANK_PNG:
+            if neg is not None:
+                neg.add(key)
+            return (data, ctype, None)
+        sha1 = hashlib.sha1(data).hexdigest()
+        await _store(size, data, ctype, sha1)
+        # Summarize new hashes off the request path (no-op when already known)
+        hass.async_create_task(_async_artwork_summary(hass, sha1, data))
+        # Do not write token meta to avoid per-track JSON proliferation
+        return (data, ctype, sha1)
+
+    async def _load_source() -> tuple[bytes, str, str | None] | None:
+        """Largest ladder variant for this key: the cached blob if present, else one upstream fetch.
+
+        'current' is always fetched: its cached blob may still be the previous track's.
+        """
+        if not refresh and key != "current" and catalog is not None:
+            def _read_top():
+                for row in catalog.lookup([(*split_cache_key(key), top)]):
+                    data = read_blob(tdir, fdir, row["hash"], top)
+                    if data is not None:
+                        return (data, row["content_type"] or "image/jpeg", row["hash"]), row
                 return None
-            s = str(val)
-            digits = ''.join(ch for ch in s if ch.isdigit())
-            return digits or _sanitize_filename(s)
-
-        token_key = _tok_base(token)
-        key: str
-        # Prefer album-level key when album is known, to avoid per-track JSONs
-        if q_album:
-            key = f"album__{self._sanitize(q_album)}"
-        elif album:
-            key = f"album__{self._sanitize(album)}"
-        elif token_key:
-            key = token_key
-        elif q_artist:
-            key = f"artist__{self._sanitize(q_artist)}"
-        elif q_plist:
-            key = f"plist__{self._sanitize(q_plist)}"
-        else:
-            # For generic/current artwork requests, always use a stable key
-            # to avoid creating album-named files on track changes.
-            key = "current"
-        # Choose target dir based on whether thumbnail is requested
-        if want_size is not None:
-            file_path = tdir / f"{key}.{want_size}.bin"
-            meta_path = tdir / f"{key}.{want_size}.json"
+            try:
+                cached = await hass.async_add_executor_job(_read_top)
+            except Exception:
+                cached = None
+            if cached:
+                got, row = cached
+                # Derived sizes inherit the source's validation
+                if swr is not None and not swr.known(key, top):
+                    swr.note_validated(key, top, row["validated"] or row["updated"], row["upstream"])
+                return got
+        return await _fetch_direct(top)
+
+    async def _fetch_upstream() -> tuple[bytes, str, str | None] | None:
+        if want_size is None or want_size == top or not imaging_available():
+            return await _fetch_direct(want_size)
+        # One upstream fetch of the largest variant serves every smaller size
+        if flights is not None:
+            src = await flights.run((key, top, refresh), _load_source)
         else:
-            file_path = fdir / f"{key}.bin"
-            meta_path = fdir / f"{key}.json"
-        # Optional fallback (token/current) only for "current" requests (no explicit album/artist/plist)
-        file_path_tok = None; meta_path_tok = None; file_path_cur = None; meta_path_cur = None
-        if not (q_album or q_artist or q_plist):
-            if want_size is not None:
-                if token_key:
-                    file_path_tok = tdir / f"{token_key}.{want_size}.bin"; meta_path_tok = tdir / f"{token_key}.{want_size}.json"
-                file_path_cur = tdir / f"current.{want_size}.bin"; meta_path_cur = tdir / f"current.{want_size}.json"
-            else:
-                if token_key:
-                    file_path_tok = fdir / f"{token_key}.bin"; meta_path_tok = fdir / f"{token_key}.json"
-                file_path_cur = fdir / "current.bin"; meta_path_cur = fdir / "current.json"
+            src = await _load_source()
+        if not src or src[2] is None:
+            return src
+        src_data, _src_ctype, src_etag = src
+        try:
+            derived = await asyncio.get_running_loop().run_in_executor(
+                image_executor(), derive_thumbnail, src_data, want_size
+            )
+        except Exception:
+            derived = None
+        if not derived:
+            return await _fetch_direct(want_size)
+        # Derived variants share the source hash: <hash>.<size>.bin in the same store
+        data, ctype = derived
+        await _store(want_size, data, ctype, src_etag, swr.validation(key, top) if swr is not None else None)
+        return (data, ctype, src_etag)
+
+    # Concurrent misses for the same key/size share one upstream fetch
+    try:
+        if flights is not None:
+            return await flights.run((key, want_size, refresh), _fetch_upstream)
+        return await _fetch_upstream()
+    except Exception:
+        return None
+
 
-        async def _read_cached() -> web.StreamResponse | None:
+async def _async_get_artwork(
+    hass: HomeAssistant, size: int | None, *, album: str | None = None, token: str | None = None,
+) -> tuple[bytes, str, str] | None:
+    """Artwork for album (else token, else the current track) via the shared caches.
+
+    Memory, then the catalog on disk, then one single-flighted upstream fetch.
+    Returns (bytes, content_type, etag), or None when there is nothing to show.
+    """
+    store = hass.data.get(DOMAIN, {})
+    mem = store.get("artwork_mem")
+    catalog = store.get("artwork_catalog")
+    neg = store.get("artwork_negative")
+    if album:
+        key = f"album__{_sanitize_filename(str(album))}"
+    elif token:
+        key = "".join(ch for ch in str(token) if ch.isdigit()) or _sanitize_filename(str(token))
+    else:
+        # 'current' follows the track; never answer it from cache
+        key = "current"
+    if key != "current":
+        hit = mem.get(key, size) if mem is not None else None
+        if hit:
+            if catalog is not None:
+                catalog.note_access(hit[2], size)
+            return hit
+        if catalog is not None:
+            tdir, fdir = _artwork_dirs(hass)
+
+            def _read() -> tuple[bytes, str, str, float | None] | None:
+                for row in catalog.lookup([(*split_cache_key(key), size)]):
+                    data = read_blob(tdir, fdir, row["hash"], size)
+                    if data is not None:
+                        return data, row["content_type"] or "image/jpeg", row["hash"], row["updated"]
+                return None
             try:
-                # Helper to read via meta hash mapping (canonical hashed file) safely in executor
-                async def _serve_via_meta(meta_file: Path, is_thumb: bool) -> web.StreamResponse | None:
-                    if not meta_file.is_file():
-                        return None
-                    def _read_meta_and_blob():
-                        try:
-                            with open(meta_file, "r", encoding="utf-8") as mf:
-                                m = json.load(mf)
-                            ctype = m.get("content_type")
-                            etag = m.get("hash") or m.get("etag")
-                            if not etag:
-                                return None
-                            canon = (tdir / f"{etag}.{want_size}.bin") if is_thumb else (fdir / f"{etag}.bin")
-                            if not canon.is_file():
-                                return None
-                            with open(canon, "rb") as f:
-                                data = f.read()
-                            return (data, ctype, etag)
-                        except Exception:
-                            return None
-                    trio = await self.hass.async_add_executor_job(_read_meta_and_blob)
-                    if not trio:
-                        return None
-                    data, ctype, etag = trio
-                    try:
-                        if data and len(data) <= (len(_BLANK_PNG) + 10) and data == _BLANK_PNG:
-                            return None
-                    except Exception:
-                        pass
-                    cache_hdr = "no-cache" if want_refresh else "public, max-age=31536000, immutable"
-                    if etag and inm_header and etag in inm_header:
-                        return web.Response(status=304, headers={"ETag": etag, "Cache-Control": cache_hdr})
-                    headers = {"Content-Type": (ctype or "image/jpeg"), "Cache-Control": cache_hdr}
-                    if etag:
-                        headers["ETag"] = etag
-                    return web.Response(status=200, body=data, headers=headers)
-                # 1) Album meta mapping (preferred when album known)
-                if album:
-                    try:
-                        if want_size is not None:
-                            album_meta = tdir / f"album__{self._sanitize(album)}.{want_size}.json"
-                        else:
-                            album_meta = fdir / f"album__{self._sanitize(album)}.json"
-                        resp = await _serve_via_meta(album_meta, is_thumb=(want_size is not None))
-                        if resp:
-                            return resp
-                    except Exception:
-                        pass
-                # 2) Token-based meta mapping (legacy)
-                if token_key and meta_path_tok:
-                    resp = await _serve_via_meta(meta_path_tok, is_thumb=(want_size is not None))
-                    if resp:
-                        return resp
-                # Prefer token-based cache next (legacy direct file)
-                if token_key and file_path_tok and meta_path_tok and file_path_tok.is_file() and meta_path_tok.is_file():
-                    ctype = None; etag = None
-                    try:
-                        with open(meta_path_tok, "r", encoding="utf-8") as mf:
-                            m = json.load(mf)
-                            ctype = m.get("content_type")
-                            etag = m.get("hash") or m.get("etag")
-                    except Exception:
-                        ctype = None; etag = None
-                    with open(file_path_tok, "rb") as f:
-                        data = f.read()
-                    try:
-                        if data and len(data) <= (len(_BLANK_PNG) + 10) and data == _BLANK_PNG:
-                            return None
-                    except Exception:
-                        pass
-                    # Compute a fallback ETag if metadata didn't include one
-                    try:
-                        if not etag and data:
-                            etag = hashlib.sha1(data).hexdigest()
-                    except Exception:
-                        etag = None
-                    cache_hdr = "no-cache" if want_refresh else "public, max-age=31536000, immutable"
-                    # If client already has this version, return 304
-                    if etag and inm_header and etag in inm_header:
-                        return web.Response(status=304, headers={"ETag": etag, "Cache-Control": cache_hdr})
-                    headers = {"Content-Type": ctype or "image/jpeg", "Cache-Control": cache_hdr}
-                    if etag:
-                        headers["ETag"] = etag
-                    return web.Response(status=200, body=data, headers=headers)
-                # 3) Album/explicit key meta mapping for explicit requests
-                resp = await _serve_via_meta(meta_path, is_thumb=(want_size is not None))
-                if resp:
-                    return resp
-                # Next: album/explicit key cache (legacy direct file)
-                if file_path.is_file() and meta_path.is_file():
-                    ctype = None; etag = None
-                    try:
-                        with open(meta_path, "r", encoding="utf-8") as mf:
-                            m = json.load(mf)
-                            ctype = m.get("content_type")
-                            etag = m.get("hash") or m.get("etag")
-                    except Exception:
-                        ctype = None; etag = None
-                    with open(file_path, "rb") as f:
-                        data = f.read()
-                    # Avoid serving cached 1x1 placeholder; treat as miss
-                    try:
-                        if data and len(data) <= (len(_BLANK_PNG) + 10) and data == _BLANK_PNG:
-                            return None
-                    except Exception:
-                        pass
-                    # Compute a fallback ETag if metadata didn't include one
-                    try:
-                        if not etag and data:
-                            etag = hashlib.sha1(data).hexdigest()
-                    except Exception:
-                        etag = None
-                    cache_hdr = "no-cache" if want_refresh else "public, max-age=31536000, immutable"
-                    if etag and inm_header and etag in inm_header:
-                        return web.Response(status=304, headers={"ETag": etag, "Cache-Control": cache_hdr})
-                    headers = {"Content-Type": ctype or "image/jpeg", "Cache-Control": cache_hdr}
-                    if etag:
-                        headers["ETag"] = etag
-                    return web.Response(status=200, body=data, headers=headers)
-                # 4) Fallback: last "current" via meta
-                if meta_path_cur:
-                    resp = await _serve_via_meta(meta_path_cur, is_thumb=(want_size is not None))
-                    if resp:
-                        return resp
-                # Fallback: last "current" cache (legacy direct file)
-                if file_path_cur.is_file() and meta_path_cur.is_file():
-                    ctype = None; etag = None
-                    try:
-                        with open(meta_path_cur, "r", encoding="utf-8") as mf:
-                            m = json.load(mf)
-                            ctype = m.get("content_type")
-                            etag = m.get("hash") or m.get("etag")
-                    except Exception:
-                        ctype = None; etag = None
-                    with open(file_path_cur, "rb") as f:
-                        data = f.read()
-                    try:
-                        if data and len(data) <= (len(_BLANK_PNG) + 10) and data == _BLANK_PNG:
-                            return None
-                    except Exception:
-                        pass
-                    # Compute a fallback ETag if metadata didn't include one
-                    try:
-                        if not etag and data:
-                            etag = hashlib.sha1(data).hexdigest()
-                    except Exception:
-                        etag = None
-                    cache_hdr = "no-cache" if want_refresh else "public, max-age=31536000, immutable"
-                    if etag and inm_header and etag in inm_header:
-                        return web.Response(status=304, headers={"ETag": etag, "Cache-Control": cache_hdr})
-                    headers = {"Content-Type": ctype or "image/jpeg", "Cache-Control": cache_hdr}
-                    if etag:
-                        headers["ETag"] = etag
-                    return web.Response(status=200, body=data, headers=headers)
+                cached = await hass.async_add_executor_job(_read)
+            except Exception:
+                cached = None
+            if cached:
+                catalog.note_access(cached[2], size)
+                if mem is not None:
+                    mem.put(key, size, *cached)
+                return cached[:3]
+        if neg is not None and neg.has(key):
+            return None
+    got = await _async_fetch_artwork(hass, key, size, token=token, album=album)
+    if not got or got[2] is None:
+        return None
+    return got  # type: ignore[return-value]
+
+
+async def _async_swr_revalidate(
+    hass: HomeAssistant,
+    key: str,
+    size: int | None,
+    *,
+    force: bool = False,
+    token: str | None = None,
+    album: str | None = None,
+    artist: str | None = None,
+    plist: str | None = None,
+) -> str | None:
+    """Background half of stale-while-revalidate for key/size.
+
+    Refetches from the Mac when the cached bytes are stale (or force) and announces
+    new bytes with an `artwork_saved` local SSE frame. Returns the new etag when
+    the image changed, else None.
+    """
+    store = hass.data.get(DOMAIN, {})
+    swr = store.get("artwork_swr")
+    mem = store.get("artwork_mem")
+    catalog = store.get("artwork_catalog")
+    if swr is None:
+        return None
+    prev = mem.peek_etag(key, size) if mem is not None else None
+    if catalog is not None and (prev is None or not swr.known(key, size)):
+        def _row() -> dict | None:
+            rows = catalog.lookup([(*split_cache_key(key), size)])
+            return rows[0] if rows else None
+        try:
+            row = await hass.async_add_executor_job(_row)
+        except Exception:
+            row = None
+        if row:
+            prev = prev or row["hash"]
+            if not swr.known(key, size):
+                swr.note_validated(key, size, row["validated"] or row["updated"], row["upstream"])
+    if not force and swr.stale_reason(key, size) is None:
+        return None
+    if not swr.begin(key, size):
+        return None
+    try:
+        got = await _async_fetch_artwork(
+            hass, key, size, token=token, album=album, artist=artist, plist=plist, refresh=True
+        )
+    finally:
+        swr.end(key, size)
+    if not got or got[2] is None:
+        swr.failed += 1
+        return None
+    swr.revalidated += 1
+    if got[2] == prev:
+        return None
+    # Other sizes of this key were validated against the old image
+    now = time.time()
+    swr.updated += 1
+    swr.note_changed(key, now)
+    swr.note_validated(key, size, now, swr.latest(key))
+    try:
+        await _broadcast_local_sse(hass, "artwork_saved", {
+            "key": key, "size": size, "etag": got[2], "token": token, "album": album,
+        })
+    except Exception:
+        pass
+    return got[2]
+
+
+def _etag_header(value: str | None) -> str | None:
+    """Opaque value of an ETag header (weak prefix and quotes stripped)."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.startswith("W/"):
+        value = value[2:]
+    return value.strip('"') or None
+
+
+async def _async_artwork_manifest(
+    hass: HomeAssistant, base: str, wanted: set[str], state: dict,
+) -> dict[str, tuple[str, str | None]] | None:
+    """Map sanitized album name -> (album, upstream etag) for the whole library.
+
+    One GET of /artwork_manifest when the server has it; otherwise a walk of /albums
+    with HEAD requests, limited to the albums in wanted. None when neither is possible.
+    """
+    session = upstream_session(hass)
+    try:
+        async with session.get(f"{base}/artwork_manifest") as resp:
+            if resp.status == 200:
+                data = await resp.json(content_type=None)
+                if isinstance(data, dict):
+                    data = [{"album": k, "etag": v} for k, v in data.items()]
+                out: dict[str, tuple[str, str | None]] = {}
+                for item in data if isinstance(data, list) else []:
+                    if isinstance(item, dict):
+                        name = item.get("album") or item.get("name")
+                        if name:
+                            out[_sanitize_filename(str(name))] = (str(name), item.get("etag") or None)
+                state["source"] = "manifest"
+                return out
+            if resp.status not in (404, 405, 501):
+                return None
+    except Exception:
+        return None
+    try:
+        albums = await _get_json(hass, base, "/albums")
+    except Exception:
+        return None
+    if not isinstance(albums, list):
+        return None
+    state["source"] = "walk"
+    out = {}
+    todo: list[tuple[str, str]] = []
+    for item in albums:
+        name = item if isinstance(item, str) else (item.get("name") if isinstance(item, dict) else None)
+        if not name:
+            continue
+        sname = _sanitize_filename(str(name))
+        out[sname] = (str(name), None)
+        if sname in wanted:
+            todo.append((sname, str(name)))
+    store = hass.data.get(DOMAIN, {})
+    top = ARTWORK_SIZE_LADDER[-1]
+    unsupported = False
+
+    async def _worker() -> None:
+        nonlocal unsupported
+        while todo and not unsupported:
+            sname, name = todo.pop()
+            # Interactive artwork requests go first
+            while store.get("artwork_interactive", 0) > 0:
+                await asyncio.sleep(0.25)
+            try:
+                async with session.head(f"{base}/artwork_album_thumb/{top}/{quote(name)}") as resp:
+                    if resp.status in (405, 501):
+                        unsupported = True
+                    elif resp.status == 200:
+                        out[sname] = (name, _etag_header(resp.headers.get("ETag")))
             except Exception:
+                pass
+
+    await asyncio.gather(*(_worker() for _ in range(ARTWORK_VALIDATION_CONCURRENCY)))
+    return None if unsupported else out
+
+
+async def _async_validate_artwork_cache(hass: HomeAssistant) -> None:
+    """Diff cached album art against the Mac's artwork etags once after startup.
+
+    Rows whose upstream etag still matches are marked validated, rows known to
+    differ are refetched in the background, albums gone from the library are
+    dropped, and rows never validated are left to stale-while-revalidate.
+    """
+    store = hass.data.get(DOMAIN, {})
+    state = store.setdefault("artwork_validation", {})
+    catalog = store.get("artwork_catalog")
+    swr = store.get("artwork_swr")
+    mem = store.get("artwork_mem")
+    base = AppleMusicStatusProxyView(hass)._resolve_base_url()  # type: ignore[arg-type]
+    if catalog is None or not base or state.get("running"):
+        return
+    state.clear()
+    state.update({
+        "running": True, "started": int(time.time()), "source": None,
+        "validated": 0, "refreshed": 0, "dropped": 0, "deferred": 0, "unchanged": 0,
+    })
+    try:
+        rows = await hass.async_add_executor_job(catalog.rows_for_kind, "album")
+        local: dict[str, list[dict]] = {}
+        for row in rows:
+            local.setdefault(row["name"], []).append(row)
+        manifest = await _async_artwork_manifest(hass, base, set(local), state)
+        # An empty library most likely means Music isn't running; never drop everything on that
+        if not manifest:
+            state["source"] = "unavailable"
+            return
+        now = int(time.time())
+        validated: list[tuple[str, int | None, str]] = []
+        dropped: list[tuple[str, int | None]] = []
+        refresh: list[tuple[str, str, int | None]] = []
+        for name, entries in local.items():
+            key = join_cache_key("album", name)
+            if name not in manifest:
+                dropped.extend((name, r["size"]) for r in entries)
+                continue
+            album, etag = manifest[name]
+            if not etag:
+                continue
+            if swr is not None:
+                swr.announce(key, etag)
+            if all(r["upstream"] == etag for r in entries):
+                validated.extend((name, r["size"], etag) for r in entries)
+                if swr is not None:
+                    for r in entries:
+                        swr.note_validated(key, r["size"], now, etag)
+                state["validated"] += 1
+            elif any(r["upstream"] for r in entries):
+                # Largest cached size first; the others follow on their next request
+                sizes = [r["size"] for r in entries]
+                refresh.append((key, album, None if None in sizes else max(sizes)))
+            else:
+                # Never validated: the announced etag makes the next request revalidate it
+                state["deferred"] += 1
+
+        def _apply() -> None:
+            for name, size, etag in validated:
+                catalog.mark_validated("album", name, size, etag, now)
+            for name, size in dropped:
+                catalog.delete("album", name, size)
+        await hass.async_add_executor_job(_apply)
+        for name, size in dropped:
+            if mem is not None:
+                mem.discard(join_cache_key("album", name), size)
+        state["dropped"] = len({name for name, _size in dropped})
+        for key, album, size in refresh:
+            while store.get("artwork_interactive", 0) > 0:
+                await asyncio.sleep(0.25)
+            fresh = await _async_swr_revalidate(hass, key, size, force=True, album=album)
+            state["refreshed" if fresh else "unchanged"] += 1
+        _LOGGER.info(
+            "apple_music: artwork cache validated via %s: %d current, %d refreshed, %d unchanged, %d dropped, %d deferred",
+            state["source"], state["validated"], state["refreshed"], state["unchanged"], state["dropped"], state["deferred"],
+        )
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        _LOGGER.debug("apple_music: artwork cache validation failed: %s", e)
+    finally:
+        state["running"] = False
+        state["finished"] = int(time.time())
+
+
+async def _async_make_variant(
+    hass: HomeAssistant, etag: str, size: int | None, fmt: str, data: bytes | None = None,
+) -> None:
+    """Transcode the blob etag/size to fmt in the image pool and store it next to the source."""
+    store = hass.data.get(DOMAIN, {})
+    flights = store.get("artwork_flights")
+    stats = store.get("artwork_variants") or {}
+    tdir, fdir = _artwork_dirs(hass)
+    path = variant_path(tdir, fdir, etag, size, fmt)
+
+    async def _make() -> None:
+        src = data
+        if src is None:
+            try:
+                src = await hass.async_add_executor_job(read_blob, tdir, fdir, etag, size)
+            except Exception:
+                return
+            if src is None:
+                return
+        try:
+            encoded = await asyncio.get_running_loop().run_in_executor(image_executor(), encode_variant, src, fmt)
+        except Exception:
+            encoded = None
+        # An empty file records "not worth it" so the source is served as-is from now on
+        try:
+            await hass.async_add_executor_job(write_blob, path, encoded or b"")
+        except Exception:
+            pass
+        if not encoded:
+            stats["no_gain"] = stats.get("no_gain", 0) + 1
+            no_gain = store.get("artwork_variant_no_gain")
+            if no_gain is not None:
+                no_gain.put((etag, size, fmt), True)
+            return
+        stats["encoded"] = stats.get("encoded", 0) + 1
+        stats["bytes_saved_encoded"] = stats.get("bytes_saved_encoded", 0) + len(src) - len(encoded)
+        mem = store.get("artwork_mem")
+        if mem is not None:
+            mem.put(f"variant__{etag}.{fmt}", size, encoded, VARIANT_CONTENT_TYPES[fmt], f"{etag}.{fmt}")
+
+    try:
+        if flights is not None:
+            await flights.run(("variant", etag, size, fmt), _make)
+        else:
+            await _make()
+    except Exception:
+        pass
+
+
+class _ArtworkFileResponse(web.FileResponse):
+    """sendfile()-backed response that keeps the catalog's validators.
+
+    aiohttp's FileResponse derives ETag/Last-Modified from the blob's stat; artwork
+    blobs are content-addressed and shared between keys, so the validators clients
+    hold are the hash and the time the key last changed.
+    """
+
+    def __init__(self, path: Path, etag: str, last_modified: float | None, headers: dict) -> None:
+        super().__init__(path, headers=headers)
+        self._content_etag = etag
+        self._content_mtime = last_modified
+
+    async def prepare(self, request: web.BaseRequest):
+        """Send the blob with the stat-based precondition checks taken out.
+
+        Callers answer conditionals from the catalog (_artwork_precondition) before
+        building this response; If-Range is resolved here so Range stays honoured.
+        """
+        headers = {k: v for k, v in request.headers.items() if k.lower() not in _ARTWORK_CONDITIONAL_HEADERS}
+        if_range = request.headers.get("If-Range")
+        if if_range is not None and not _artwork_if_range_ok(request, self._content_etag, self._content_mtime):
+            headers.pop("Range", None)
+            headers.pop("range", None)
+        return await super().prepare(request.clone(headers=headers))
+
+    @property
+    def etag(self):  # type: ignore[override]
+        return web.StreamResponse.etag.fget(self)
+
+    @etag.setter
+    def etag(self, value) -> None:  # type: ignore[override]
+        web.StreamResponse.etag.fset(self, self._content_etag or value)
+
+    @property
+    def last_modified(self):  # type: ignore[override]
+        return web.StreamResponse.last_modified.fget(self)
+
+    @last_modified.setter
+    def last_modified(self, value) -> None:  # type: ignore[override]
+        web.StreamResponse.last_modified.fset(self, self._content_mtime or value)
+
+
+
+_ARTWORK_CONDITIONAL_HEADERS = frozenset(
+    ("if-none-match", "if-modified-since", "if-match", "if-unmodified-since", "if-range")
+)
+
+
+def _etag_listed(header: str, etag: str) -> bool:
+    """True when an If-Match/If-None-Match list names etag (weak-insensitive) or is *."""
+    if header.strip() == "*":
+        return True
+    for item in header.split(","):
+        item = item.strip()
+        if item.startswith("W/"):
+            item = item[2:]
+        if item.strip('"') == etag:
+            return True
+    return False
+
+
+def _artwork_if_range_ok(request: web.BaseRequest, etag: str | None, last_modified: float | None) -> bool:
+    """Whether a Range guarded by If-Range may be served from the current representation."""
+    value = (request.headers.get("If-Range") or "").strip()
+    if not value:
+        return True
+    if value.startswith('"') or value.startswith("W/"):
+        # If-Range needs a strong match
+        return bool(etag) and value == f'"{etag}"'
+    try:
+        since = request.if_range
+    except Exception:
+        return False
+    return since is not None and bool(last_modified) and int(last_modified) <= since.timestamp()
+
+
+def _artwork_precondition(
+    request: web.BaseRequest, etag: str, last_modified: float | None, headers: dict
+) -> web.Response | None:
+    """304/412 from the catalog validators (content hash, time the key last changed), else None.
+
+    Order follows RFC 9110 13.2.2; date checks only apply without the matching ETag header.
+    """
+    def _answer(status: int) -> web.Response:
+        resp = web.Response(status=status, headers={k: v for k, v in headers.items() if k != "Content-Type"})
+        resp.etag = etag
+        if last_modified:
+            resp.last_modified = last_modified
+        return resp
+
+    try:
+        if_match = request.headers.get("If-Match")
+        if if_match is not None:
+            if not _etag_listed(if_match, etag):
+                return _answer(412)
+        else:
+            ius = request.if_unmodified_since
+            if ius is not None and last_modified and int(last_modified) > ius.timestamp():
+                return _answer(412)
+        inm = request.headers.get("If-None-Match")
+        if inm is not None:
+            if _etag_listed(inm, etag):
+                return _answer(304)
+        else:
+            ims = request.if_modified_since
+            if ims is not None and last_modified and int(last_modified) <= ims.timestamp():
+                return _answer(304)
+    except Exception:
+        return None
+    return None
+
+
+def _artwork_blob_response(
+    request: web.BaseRequest, source: Path | memoryview, etag: str, last_modified: float | None, headers: dict
+) -> web.StreamResponse:
+    """sendfile() a .bin blob, or answer straight from a packed thumbnail's mapping.
+
+    Packed hits skip Range support; thumbnails are small enough that clients never ask.
+    """
+    pre = _artwork_precondition(request, etag, last_modified, headers)
+    if pre is not None:
+        return pre
+    if isinstance(source, memoryview):
+        resp = web.Response(status=200, body=source, headers=headers)
+        # Quoted by aiohttp, like the FileResponse path
+        resp.etag = etag
+        if last_modified:
+            resp.last_modified = last_modified
+        return resp
+    return _ArtworkFileResponse(source, etag, last_modified, headers)
+
+
+async def _async_variant_response(
+    hass: HomeAssistant,
+    request: web.Request,
+    etag: str,
+    size: int | None,
+    ctype: str | None,
+    src_len: int | None,
+    data: bytes | None = None,
+    *,
+    cache_hdr: str,
+) -> web.StreamResponse | None:
+    """Serve the WebP/AVIF variant of etag/size negotiated from Accept, or None for the original.
+
+    A missing variant is transcoded in the background; that response uses the original.
+    """
+    fmt = negotiate_variant(request.headers.get("Accept"))
+    if not fmt or (ctype or "") == VARIANT_CONTENT_TYPES[fmt]:
+        return None
+    store = hass.data.get(DOMAIN, {})
+    no_gain = store.get("artwork_variant_no_gain")
+    if no_gain is not None and (etag, size, fmt) in no_gain:
+        return None
+    vtag = f"{etag}.{fmt}"
+    headers = {"Content-Type": VARIANT_CONTENT_TYPES[fmt], "Cache-Control": cache_hdr, "Vary": "Accept"}
+    inm = request.headers.get("If-None-Match")
+    if inm and _etag_listed(inm, vtag):
+        # Quoted by aiohttp, like the FileResponse path for the same variant
+        resp: web.StreamResponse = web.Response(status=304, headers={"Cache-Control": cache_hdr, "Vary": "Accept"})
+        resp.etag = vtag
+        return resp
+    mem = store.get("artwork_mem")
+    hit = mem.get(f"variant__{vtag}", size) if mem is not None else None
+    if hit:
+        vlen = len(hit[0])
+        resp = _artwork_blob_response(request, memoryview(hit[0]), vtag, None, headers)
+    else:
+        tdir, fdir = _artwork_dirs(hass)
+        path = variant_path(tdir, fdir, etag, size, fmt)
+
+        def _stat() -> int | None:
+            try:
+                return path.stat().st_size
+            except OSError:
                 return None
+        try:
+            vlen = await hass.async_add_executor_job(_stat)
+        except Exception:
+            return None
+        if vlen is None:
+            hass.async_create_task(_async_make_variant(hass, etag, size, fmt, data))
+            return None
+        if vlen == 0:
+            if no_gain is not None:
+                no_gain.put((etag, size, fmt), True)
             return None
+        resp = _artwork_precondition(request, vtag, None, headers) or _ArtworkFileResponse(path, vtag, None, headers)
+    stats = store.get("artwork_variants")
+    if stats is not None:
+        stats["served"] = stats.get("served", 0) + 1
+        if src_len:
+            stats["bytes_saved_served"] = stats.get("bytes_saved_served", 0) + max(0, src_len - vlen)
+    return resp
 
-        if not want_refresh:
-            resp = await _read_cached()
-            if resp:
-                return resp
+
+class AppleMusicArtworkView(HomeAssistantView):
+    """Serve artwork with HA-side caching and optional refresh.
+
+    URL: /api/apple_music/artwork?tok=...&refresh=1
+    When 'tok' is provided, it is used as the cache key; otherwise we fall back to 'cache' or 'current'.
+    Cached bytes are always served first (stale-while-revalidate); stale or refresh=1
+    requests are refetched in the background and announced with an `artwork_saved` frame.
+    """
+
+    url = "/api/apple_music/artwork"
+    name = "apple_music:artwork"
+    requires_auth = False
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self.hass = hass
+
+    def _thumb_dir(self) -> Path:
+        d = Path(self.hass.config.path(".storage", "music_controller", "thumbs"))
+        try:
+            d.mkdir(parents=True, exist_ok=True)
+        except Exception:
+            pass
+        return d
+
+    # Backward compat alias
+    def _cache_dir(self) -> Path:
+        return self._thumb_dir()
+
+    def _full_dir(self) -> Path:
+        d = Path(self.hass.config.path(".storage", "music_controller", "artwork"))
+        try:
+            d.mkdir(parents=True, exist_ok=True)
+        except Exception:
+            pass
+        return d
+
+    def _sanitize(self, name: str | None) -> str:
+        return _sanitize_filename(name)
+
+    async def _current_album(self) -> str | None:
+        """Album of the current track.
+
+        Read from the live media player, which the SSE listener keeps fresh; only
+        ask the Mac's /now_playing when the entity isn't loaded yet.
+        """
+        player = self.hass.data.get(DOMAIN, {}).get("player_ref")
+        if player is not None:
+            alb = getattr(player, "_attr_media_album_name", None)
+            return alb if isinstance(alb, str) and alb.strip() else None
+        try:
+            base = AppleMusicStatusProxyView(self.hass)._resolve_base_url()  # type: ignore[arg-type]
+            if not base:
+                return None
+            session = upstream_session(self.hass)
+            async with session.get(f"{base}/now_playing") as resp:
+                if resp.status == 200:
+                    data = await resp.json()
+                    alb = data.get("album")
+                    if isinstance(alb, str) and alb.strip():
+                        return alb
+        except Exception:
+            return None
+        return None
+
+    async def get(self, request: web.Request) -> web.StreamResponse:
+        from aiohttp import web
+        token = request.query.get("tok")
+        want_refresh = request.query.get("refresh") is not None
+        # Support conditional requests from browsers/caches
+        inm_header = request.headers.get("If-None-Match")
+        # Optional explicit targets for thumbnails or specific items
+        q_album = request.query.get("album")
+        q_artist = request.query.get("artist")
+        q_plist = request.query.get("playlist") or request.query.get("plist")
+        # Capture album for metadata only; do not use it for default cache key.
+        # Explicit artist/playlist targets never resolve to the current album.
+        album = q_album or (None if (q_artist or q_plist) else await self._current_album())
+        size_param = request.query.get("size")
+        want_size: int | None = None
+        try:
+            if size_param is not None:
+                want_size = int(size_param)
+        except Exception:
+            want_size = None
+        # Snap to the size ladder so panels, cards and browse grids share variants
+        want_size = snap_size(want_size)
+        tdir = self._thumb_dir(); fdir = self._full_dir()
+        # Build a cache key; when a token is provided, ONLY use the token as the filename base.
+        # This avoids illegal characters from album/artist names in the artwork directory.
+        def _tok_base(val: str | None) -> str | None:
+            if not val:
+                return None
+            s = str(val)
+            digits = ''.join(ch for ch in s if ch.isdigit())
+            return digits or _sanitize_filename(s)
+
+        token_key = _tok_base(token)
+        key: str
+        # Prefer album-level key when album is known, to avoid per-track JSONs
+        if q_album:
+            key = f"album__{self._sanitize(q_album)}"
+        elif album:
+            key = f"album__{self._sanitize(album)}"
+        elif token_key:
+            key = token_key
+        elif q_artist:
+            key = f"artist__{self._sanitize(q_artist)}"
+        elif q_plist:
+            key = f"plist__{self._sanitize(q_plist)}"
+        else:
+            # For generic/current artwork requests, always use a stable key
+            # to avoid creating album-named files on track changes.
+            key = "current"
+        # Candidate catalog keys in priority order: album, token (legacy), explicit key,
+        # then the last "current" (token/current only for requests without an explicit target)
+        fallbacks = not (q_album or q_artist or q_plist)
+        candidates: list[str] = []
+        if album:
+            candidates.append(f"album__{self._sanitize(album)}")
+        if fallbacks and token_key:
+            candidates.append(token_key)
+        candidates.append(key)
+        if fallbacks:
+            candidates.append("current")
+        candidates = list(dict.fromkeys(candidates))
+
+        store = self.hass.data.get(DOMAIN, {})
+        mem = store.get("artwork_mem")
+        catalog = store.get("artwork_catalog")
+        neg = store.get("artwork_negative")
+        swr = store.get("artwork_swr")
+        if neg is not None and want_refresh:
+            neg.discard(key)
+
+        # Keyed URLs change content over time; with a freshness window browsers revalidate after it
+        if want_refresh:
+            cache_hdr = "no-cache"
+        elif swr is not None and swr.fresh_s:
+            cache_hdr = f"public, max-age={swr.fresh_s}, stale-while-revalidate={ARTWORK_SWR_STALE_S}"
+        else:
+            cache_hdr = "public, max-age=31536000, immutable"
+        # WebP/AVIF by Accept; responses vary on it whenever an encoder is present
+        vary = {"Vary": "Accept"} if variant_formats() else {}
+        try:
+            ims = request.if_modified_since
+            ims_ts = ims.timestamp() if ims is not None else None
+        except Exception:
+            ims_ts = None
+
+        def _not_modified(etag: str | None, updated: float | None) -> bool:
+            """Conditional GET check; If-None-Match takes precedence over If-Modified-Since."""
+            if inm_header:
+                return bool(etag) and _etag_listed(inm_header, etag)
+            return ims_ts is not None and bool(updated) and int(updated) <= ims_ts
+
+        def _validated(resp: web.StreamResponse, etag: str | None, updated: float | None) -> web.StreamResponse:
+            """Same ETag/Last-Modified on every branch as _artwork_blob_response sends."""
+            if etag:
+                resp.etag = etag
+            if updated:
+                resp.last_modified = updated
+            return resp
+
+        def _respond(data: bytes, ctype: str | None, etag: str | None, updated: float | None = None) -> web.StreamResponse:
+            """Build a 200/304 for bytes already in hand (memory LRU or a fresh fetch)."""
+            if etag and _not_modified(etag, updated):
+                return _validated(web.Response(status=304, headers={"Cache-Control": cache_hdr, **vary}), etag, updated)
+            headers = {"Content-Type": ctype or "image/jpeg", "Cache-Control": cache_hdr, **vary}
+            return _validated(web.Response(status=200, body=data, headers=headers), etag, updated)
+
+        async def _updated_for(etag: str) -> float | None:
+            """Catalog 'updated' of key at want_size while it holds etag; remembered in memory."""
+            updated = mem.updated(key, want_size) if mem is not None else None
+            if updated is not None or catalog is None:
+                return updated
+
+            def _lookup() -> float | None:
+                for row in catalog.lookup([(*split_cache_key(key), want_size)]):
+                    if row["hash"] == etag:
+                        return row["updated"]
+                return None
+            try:
+                updated = await self.hass.async_add_executor_job(_lookup)
+            except Exception:
+                return None
+            if mem is not None:
+                mem.note_updated(key, want_size, etag, updated)
+            return updated
+
+        async def _variant(
+            etag: str, ctype: str | None, src_len: int | None, data: bytes | None = None,
+        ) -> web.StreamResponse | None:
+            if want_refresh:
+                return None
+            return await _async_variant_response(
+                self.hass, request, etag, want_size, ctype, src_len, data, cache_hdr=cache_hdr
+            )
+
+        def _revalidate(served: str, row: dict | None = None) -> None:
+            """Schedule the background half of SWR when what was served for key may be stale."""
+            if swr is None or (neg is not None and neg.has(key)):
+                return
+            # Served another candidate's bytes, or asked to refresh: always refetch key
+            force = want_refresh or served != key
+            if not force:
+                if row is not None and not swr.known(key, want_size):
+                    swr.note_validated(key, want_size, row["validated"] or row["updated"], row["upstream"])
+                if swr.known(key, want_size):
+                    if swr.stale_reason(key, want_size) is None:
+                        return
+                    force = True
+            self.hass.async_create_task(_async_swr_revalidate(
+                self.hass, key, want_size, force=force,
+                token=token, album=album, artist=q_artist, plist=q_plist,
+            ))
+
+        # Warm hits are answered from memory: no executor hop, no disk I/O
+        if mem is not None:
+            hit = mem.get(key, want_size)
+            if hit:
+                if catalog is not None:
+                    catalog.note_access(hit[2], want_size)
+                _revalidate(key)
+                variant = await _variant(hit[2], hit[1], len(hit[0]), hit[0])
+                return variant or _respond(*hit, await _updated_for(hit[2]))
+
+        async def _read_cached(revalidate: bool = True) -> web.StreamResponse | None:
+            """One indexed catalog lookup, then sendfile the first candidate whose blob exists.
+
+            Disk hits never pass through Python memory; the memory LRU is filled on writes.
+            """
+            if catalog is None:
+                return None
+            def _lookup_and_stat():
+                rows = catalog.lookup([(*split_cache_key(k), want_size) for k in candidates])
+                for row in rows:
+                    # Placeholders are never written; skip legacy rows that pointed at one
+                    if row["hash"] == BLANK_PNG_SHA1:
+                        continue
+                    # Revalidation is answered from the catalog row alone, without blob I/O
+                    if not want_refresh and _not_modified(row["hash"], row["updated"]):
+                        return row, None
+                    view = pack_view(tdir, row["hash"], want_size)
+                    if view is not None:
+                        return row, view
+                    path = blob_path(tdir, fdir, row["hash"], want_size)
+                    if path.is_file():
+                        return row, path
+                return None
+            try:
+                found = await self.hass.async_add_executor_job(_lookup_and_stat)
+            except Exception:
+                return None
+            if not found:
+                return None
+            row, source = found
+            etag = row["hash"]
+            catalog.note_access(etag, want_size)
+            if revalidate:
+                _revalidate(join_cache_key(row["kind"], row["name"]), row)
+            if mem is not None:
+                mem.note_updated(join_cache_key(row["kind"], row["name"]), want_size, etag, row["updated"])
+            if source is None:
+                return _validated(
+                    web.Response(status=304, headers={"Cache-Control": cache_hdr, **vary}), etag, row["updated"]
+                )
+            variant = await _variant(etag, row["content_type"], row["bytes"])
+            if variant is not None:
+                return variant
+            headers = {"Content-Type": row["content_type"] or "image/jpeg", "Cache-Control": cache_hdr, **vary}
+            return _artwork_blob_response(request, source, etag, row["updated"], headers)
+
+        # Even refresh=1 is answered from cache when possible; the refetch runs in the background
+        resp = await _read_cached()
+        if resp:
+            return resp
+        # Known art-less album/artist/playlist: answer like a blank upstream, without asking again
+        if not want_refresh and neg is not None and neg.has(key):
+            return web.Response(status=204)
 
         # Fetch from backend and populate cache
         base = AppleMusicStatusProxyView(self.hass)._resolve_base_url()  # type: ignore[arg-type]
         if not base:
             # No backend; return cached if available or nothing (204) to avoid white flash
-            resp = await _read_cached()
+            resp = await _read_cached(revalidate=False)
             if resp:
                 return resp
             return web.Response(status=204)
 
-        session = async_get_clientsession(self.hass)
-        # Choose upstream path based on requested size or explicit target
-        params = {}
-        if want_refresh:
-            params["refresh"] = "1"
-        album_param = q_album or (await self._current_album())
-        if album_param and want_size:
-            url = f"{base}/artwork_album_thumb/{want_size}/{quote(album_param)}"
-        elif q_artist and want_size:
-            url = f"{base}/artwork_artist_thumb/{want_size}/{quote(q_artist)}"
-        elif q_plist and want_size:
-            url = f"{base}/artwork_playlist_thumb/{want_size}/{quote(q_plist)}"
-        else:
-            url = f"{base}/artwork_thumb/{want_size}" if want_size else f"{base}/artwork"
-            if token:
-                params["tok"] = token
-        data = None
-        ctype = None
+        # Background warm-ups pause while interactive fetches are in flight
+        store["artwork_interactive"] = store.get("artwork_interactive", 0) + 1
         try:
-            async with session.get(url, params=params) as upstream:
-                data = await upstream.read()
-                ctype = upstream.headers.get("Content-Type") or upstream.headers.get("content-type") or "image/jpeg"
-                if upstream.status != 200 or not data:
-                    data = None
-        except Exception:
-            data = None
+            got = await _async_fetch_artwork(
+                self.hass, key, want_size,
+                token=token, album=album, artist=q_artist, plist=q_plist,
+                refresh=want_refresh,
+            )
+        finally:
+            store["artwork_interactive"] = max(0, store.get("artwork_interactive", 1) - 1)
 
-        if data:
-            # Write cache to a canonical, content-addressed filename (hash.bin),
-            # and store per-key metadata that points to the canonical file via "hash".
-            try:
-                # Do not persist the 1x1 placeholder into cache; force re-fetch next time
-                if data and len(data) <= (len(_BLANK_PNG) + 10) and data == _BLANK_PNG:
-                    raise RuntimeError("skip-cache-blank")
-                # Compute content hash
-                try:
-                    sha1 = hashlib.sha1(data).hexdigest()
-                except Exception:
-                    sha1 = None
-                # Write canonical content-addressed file and metadata in executor
-                def _write_canonical_and_meta():
-                    try:
-                        if sha1:
-                            canon = (tdir / f"{sha1}.{want_size}.bin") if (want_size is not None) else (fdir / f"{sha1}.bin")
-                            if not canon.is_file():
-                                tmpc = canon.with_suffix(".tmp")
-                                with open(tmpc, "wb") as f:
-                                    f.write(data)
-                                os.replace(tmpc, canon)
-                    except Exception:
-                        pass
-                    try:
-                        meta = {"content_type": ctype, "ts": int(time.time()), "album": album, "artist": q_artist, "playlist": q_plist, "size": want_size}
-                        if sha1:
-                            meta["hash"] = sha1
-                        with open(meta_path, "w", encoding="utf-8") as mf:
-                            json.dump(meta, mf)
-                    except Exception:
-                        pass
-                try:
-                    await self.hass.async_add_executor_job(_write_canonical_and_meta)
-                except Exception:
-                    _write_canonical_and_meta()
-                # Do not write token meta to avoid per-track JSON proliferation
-            except Exception:
+        if got:
+            data, ctype, etag = got
+            if etag is None:
                 # For blank/skip-cache cases, return nothing (204) so UI keeps previous image
                 return web.Response(status=204)
-            cache_hdr = "no-cache" if want_refresh else "public, max-age=31536000, immutable"
-            headers = {"Content-Type": ctype, "Cache-Control": cache_hdr}
-            try:
-                headers["ETag"] = hashlib.sha1(data).hexdigest()
-            except Exception:
-                pass
-            return web.Response(status=200, body=data, headers=headers)
+            variant = await _variant(etag, ctype, len(data), data)
+            if variant is not None:
+                return variant
+            return _respond(data, ctype, etag, await _updated_for(etag))
 
         # Backend fetch failed; try cache or return blank placeholder to prevent proxy fallback
-        resp = await _read_cached()
+        resp = await _read_cached(revalidate=False)
         if resp:
             return resp
         # Return blank 1x1 transparent PNG so image loading doesn't error and trigger proxy fallback
@@ -1472,16 +2933,324 @@ class AppleMusicArtworkView(HomeAssistantView):
         return web.Response(status=200, body=_BLANK_PNG, headers=headers)
 
 
+class AppleMusicArtworkSheetView(HomeAssistantView):
+    """Compose a page of album thumbnails into one cached sprite sheet.
+
+    URL: /api/apple_music/artwork_sheet?album=A&album=B&size=128[&cols=10]
+    ('albums' may carry a JSON array instead). Returns a JSON offset map whose
+    'url' points at the sheet image (signed, so it works in an <img>), addressed by
+    its ordered tile hashes. Only SHEET_MAX_FETCHES uncached tiles are fetched per
+    request; the rest come back as missing and fill in on a later call.
+    """
+
+    url = "/api/apple_music/artwork_sheet"
+    name = "apple_music:artwork_sheet"
+    requires_auth = True
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self.hass = hass
+        self._writes = 0
+
+    async def get(self, request: web.Request) -> web.StreamResponse:
+        albums = [a for a in request.query.getall("album", []) if a]
+        if not albums and request.query.get("albums"):
+            try:
+                parsed = json.loads(request.query["albums"])
+                albums = [str(a) for a in parsed if a] if isinstance(parsed, list) else []
+            except Exception:
+                albums = []
+        albums = albums[:SHEET_MAX_TILES]
+        if not albums:
+            return web.json_response({"error": "no albums"}, status=400)
+        if not imaging_available():
+            return web.json_response({"error": "sheets unavailable"}, status=501)
+        try:
+            size = snap_size(int(request.query.get("size") or ARTWORK_SIZE_LADDER[0]))
+        except Exception:
+            size = ARTWORK_SIZE_LADDER[0]
+        try:
+            cols = int(request.query.get("cols") or 10)
+        except Exception:
+            cols = 10
+        cols = max(1, min(cols, len(albums)))
+
+        store = self.hass.data.get(DOMAIN, {})
+        mem = store.get("artwork_mem")
+        catalog = store.get("artwork_catalog")
+        neg = store.get("artwork_negative")
+        keys = [f"album__{_sanitize_filename(a)}" for a in albums]
+        tiles: list[tuple[bytes, str] | None] = [None] * len(keys)
+
+        # 1) memory
+        if mem is not None:
+            for i, k in enumerate(keys):
+                hit = mem.get(k, size)
+                if hit:
+                    tiles[i] = (hit[0], hit[2])
+        # 2) disk, in one executor job
+        missing = [i for i, t in enumerate(tiles) if t is None]
+        if missing and catalog is not None:
+            tdir, fdir = _artwork_dirs(self.hass)
+
+            def _read_tiles() -> dict[int, tuple[bytes, str]]:
+                found: dict[int, tuple[bytes, str]] = {}
+                for i in missing:
+                    for row in catalog.lookup([(*split_cache_key(keys[i]), size)]):
+                        data = read_blob(tdir, fdir, row["hash"], size)
+                        if data is not None:
+                            found[i] = (data, row["hash"])
+                return found
+            try:
+                for i, tile in (await self.hass.async_add_executor_job(_read_tiles)).items():
+                    tiles[i] = tile
+            except Exception:
+                pass
+        # 3) upstream, concurrently (each key single-flighted with the artwork view)
+        missing = [i for i, t in enumerate(tiles) if t is None and not (neg is not None and neg.has(keys[i]))]
+        missing = missing[:SHEET_MAX_FETCHES]
+        if missing:
+            sem = asyncio.Semaphore(6)
+
+            async def _fetch(i: int) -> None:
+                async with sem:
+                    got = await _async_fetch_artwork(self.hass, keys[i], size, album=albums[i])
+                if got and got[2]:
+                    tiles[i] = (got[0], got[2])
+            # Background warm-ups pause while interactive fetches are in flight
+            store["artwork_interactive"] = store.get("artwork_interactive", 0) + 1
+            try:
+                await asyncio.gather(*(_fetch(i) for i in missing))
+            finally:
+                store["artwork_interactive"] = max(0, store.get("artwork_interactive", 1) - 1)
+
+        hashes = [t[1] if t else None for t in tiles]
+        sid = sheet_id(size, hashes)
+        mem_key = f"sheet__{sid}"
+        sheets = _sheet_dir(self.hass)
+        path = sheets / f"{sid}.jpg"
+        have = mem is not None and mem.contains(mem_key, None)
+        if not have:
+            try:
+                have = await self.hass.async_add_executor_job(path.is_file)
+            except Exception:
+                have = False
+        if not have:
+            try:
+                data = await asyncio.get_running_loop().run_in_executor(
+                    image_executor(), compose_sheet, [t[0] if t else None for t in tiles], size, cols
+                )
+            except Exception:
+                data = None
+            if not data:
+                return web.json_response({"error": "sheet composition failed"}, status=500)
+
+            self._writes += 1
+            prune = self._writes % SHEET_PRUNE_EVERY == 0
+
+            def _write_sheet() -> None:
+                write_blob(path, data)
+                if not prune:
+                    return
+                # Keep only the most recent sheets; they are cheap to recompose
+                files = sorted(sheets.glob("*.jpg"), key=lambda p: p.stat().st_mtime, reverse=True)
+                for old in files[SHEET_MAX_FILES:]:
+                    try:
+                        old.unlink()
+                    except OSError:
+                        pass
+            try:
+                await self.hass.async_add_executor_job(_write_sheet)
+            except Exception:
+                pass
+            if mem is not None:
+                mem.put(mem_key, None, data, "image/jpeg", sid)
+
+        rows = -(-len(albums) // cols)
+        out = {
+            "url": async_sign_path(self.hass, f"/api/apple_music/artwork_sheet/{sid}", timedelta(days=1)),
+            "etag": sid,
+            "size": size,
+            "cols": cols,
+            "rows": rows,
+            "width": cols * size,
+            "height": rows * size,
+            "tiles": [
+                {"album": a, "x": (i % cols) * size, "y": (i // cols) * size, "etag": hashes[i], "missing": hashes[i] is None}
+                for i, a in enumerate(albums)
+            ],
+        }
+        resp = web.json_response(out, headers={"Cache-Control": "no-cache"})
+        resp.etag = sid
+        return resp
+
+
+class AppleMusicArtworkSheetImageView(HomeAssistantView):
+    """Serve a composed sprite sheet by its content address (immutable; signed URL from the offset map)."""
+
+    url = "/api/apple_music/artwork_sheet/{sheet_id}"
+    name = "apple_music:artwork_sheet_image"
+    requires_auth = True
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self.hass = hass
+
+    async def get(self, request: web.Request, sheet_id: str) -> web.StreamResponse:
+        sid = sheet_id.lower()
+        if len(sid) != 40 or any(c not in "0123456789abcdef" for c in sid):
+            return web.Response(status=404)
+        headers = {"Content-Type": "image/jpeg", "Cache-Control": "private, max-age=31536000, immutable"}
+        inm = request.headers.get("If-None-Match")
+        if inm and _etag_listed(inm, sid):
+            resp = web.Response(status=304, headers={"Cache-Control": headers["Cache-Control"]})
+            resp.etag = sid
+            return resp
+        mem = self.hass.data.get(DOMAIN, {}).get("artwork_mem")
+        hit = mem.get(f"sheet__{sid}", None) if mem is not None else None
+        if hit:
+            return _artwork_blob_response(request, memoryview(hit[0]), sid, None, headers)
+        path = _sheet_dir(self.hass) / f"{sid}.jpg"
+        try:
+            exists = await self.hass.async_add_executor_job(path.is_file)
+        except Exception:
+            exists = False
+        if not exists:
+            return web.Response(status=404)
+        return _artwork_precondition(request, sid, None, headers) or _ArtworkFileResponse(path, sid, None, headers)
+
+
+class AppleMusicArtworkHashView(HomeAssistantView):
+    """Serve artwork by content hash; the URL changes whenever the image does, so it is immutable.
+
+    Smaller ladder sizes missing on disk are derived from the stored 512px source.
+    """
+
+    url = "/api/apple_music/artwork/h/{etag}/{size}"
+    name = "apple_music:artwork_hash"
+    requires_auth = False
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self.hass = hass
+
+    async def get(self, request: web.Request, etag: str, size: str) -> web.StreamResponse:
+        etag = etag.lower()
+        if size == "full":
+            want_size: int | None = None
+        elif size.isdigit() and int(size) in ARTWORK_SIZE_LADDER:
+            want_size = int(size)
+        else:
+            return web.Response(status=404)
+        if not is_content_hash(etag) or etag == BLANK_PNG_SHA1:
+            return web.Response(status=404)
+        cache_hdr = "public, max-age=31536000, immutable"
+        vary = {"Vary": "Accept"} if variant_formats() else {}
+        inm = request.headers.get("If-None-Match")
+        if inm and _etag_listed(inm, etag):
+            resp = web.Response(status=304, headers={"Cache-Control": cache_hdr, **vary})
+            resp.etag = etag
+            return resp
+        store = self.hass.data.get(DOMAIN, {})
+        mem = store.get("artwork_mem")
+        catalog = store.get("artwork_catalog")
+        hit = mem.get_blob(etag, want_size) if mem is not None else None
+        if hit:
+            resp = await _async_variant_response(
+                self.hass, request, etag, want_size, hit[1], len(hit[0]), hit[0], cache_hdr=cache_hdr
+            )
+            # Every branch answers through _artwork_blob_response: identical validators
+            return resp or _artwork_blob_response(
+                request, memoryview(hit[0]), etag, None, {"Content-Type": hit[1], "Cache-Control": cache_hdr, **vary}
+            )
+        tdir, fdir = _artwork_dirs(self.hass)
+        path = blob_path(tdir, fdir, etag, want_size)
+
+        def _probe() -> tuple[str, int, Path | memoryview] | None:
+            view = pack_view(tdir, etag, want_size)
+            if view is not None:
+                return sniff_content_type(bytes(view[:16])), len(view), view
+            try:
+                with open(path, "rb") as f:
+                    head = f.read(16)
+                return sniff_content_type(head), path.stat().st_size, path
+            except OSError:
+                return None
+        try:
+            found = await self.hass.async_add_executor_job(_probe)
+        except Exception:
+            found = None
+        if found is None and want_size is not None and want_size != ARTWORK_SIZE_LADDER[-1]:
+            flights = store.get("artwork_flights")
+            if flights is not None:
+                derived = await flights.run(("hash", etag, want_size), lambda: self._derive(etag, want_size))
+            else:
+                derived = await self._derive(etag, want_size)
+            if derived:
+                resp = await _async_variant_response(
+                    self.hass, request, etag, want_size, derived[1], len(derived[0]), derived[0], cache_hdr=cache_hdr
+                )
+                return resp or _artwork_blob_response(
+                    request, memoryview(derived[0]), etag, None,
+                    {"Content-Type": derived[1], "Cache-Control": cache_hdr, **vary},
+                )
+        if found is None:
+            return web.Response(status=404)
+        ctype, nbytes, source = found
+        if catalog is not None:
+            catalog.note_access(etag, want_size)
+        resp = await _async_variant_response(self.hass, request, etag, want_size, ctype, nbytes, cache_hdr=cache_hdr)
+        return resp or _artwork_blob_response(request, source, etag, None, {"Content-Type": ctype, "Cache-Control": cache_hdr, **vary})
+
+    async def _derive(self, etag: str, size: int) -> tuple[bytes, str] | None:
+        """Downscale the stored source blob for etag to size and keep the result."""
+        if not imaging_available():
+            return None
+        store = self.hass.data.get(DOMAIN, {})
+        catalog = store.get("artwork_catalog")
+        tdir, fdir = _artwork_dirs(self.hass)
+        try:
+            data = await self.hass.async_add_executor_job(read_blob, tdir, fdir, etag, ARTWORK_SIZE_LADDER[-1])
+        except Exception:
+            return None
+        if data is None:
+            return None
+        try:
+            derived = await asyncio.get_running_loop().run_in_executor(image_executor(), derive_thumbnail, data, size)
+        except Exception:
+            derived = None
+        if not derived:
+            return None
+
+        def _write() -> None:
+            try:
+                write_blob(blob_path(tdir, fdir, etag, size), derived[0])
+                if catalog is not None:
+                    catalog.add_blob(etag, size, len(derived[0]))
+            except Exception:
+                pass
+        try:
+            await self.hass.async_add_executor_job(_write)
+        except Exception:
+            pass
+        mem = store.get("artwork_mem")
+        if mem is not None:
+            mem.put(f"hash__{etag}", size, derived[0], derived[1], etag)
+        return derived
+
+
 async def _maybe_start_sse_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
     """Start a per-entry SSE listener to update HA state instantly."""
     store = hass.data.setdefault(DOMAIN, {})
     all_tasks = store.setdefault("_sse_tasks", {})
     if entry.entry_id in all_tasks:
         return
+    # Next-track prefetch state: pending timer, album fetched for the upcoming track (scored once),
+    # track it was armed for, and whether the server exposes an up-next queue (None = unknown)
+    prefetch: dict = {"cancel": None, "album": None, "track": None, "queue": None}
 
     async def _runner():
         import asyncio
-        session = async_get_clientsession(hass)
+        # REST lookups share the pooled session; the /events stream itself uses the stream pool
+        session = upstream_session(hass, entry_id=entry.entry_id)
+        stream_session = upstream_session(hass, stream=True, entry_id=entry.entry_id)
 
         def _resolve_base_url() -> str | None:
             player = hass.data.get(DOMAIN, {}).get("player_ref")
@@ -1496,11 +3265,105 @@ async def _maybe_start_sse_listener(hass: HomeAssistant, entry: ConfigEntry) ->
                 return f"http://{host}:{port}"
             return None
 
+        async def _next_album(base: str) -> str | None:
+            """Album of the upcoming track from the server's up-next queue; None when it has no queue."""
+            if prefetch["queue"] is not False:
+                try:
+                    async with session.get(f"{base}/up_next", timeout=aiohttp.ClientTimeout(total=5)) as r:
+                        if r.status in (404, 405, 501):
+                            prefetch["queue"] = False
+                        elif r.status == 200:
+                            prefetch["queue"] = True
+                            data = await r.json()
+                            items = data
+                            if isinstance(data, dict):
+                                items = data.get("tracks") or data.get("queue") or [data.get("next")]
+                            for item in items if isinstance(items, list) else []:
+                                if isinstance(item, dict):
+                                    alb = item.get("album")
+                                    return str(alb) if alb else None
+                except Exception:
+                    pass
+            return None
+
+        async def _prefetch_next() -> None:
+            """Pull the upcoming track's album art (ladder sizes) and track list into the caches."""
+            prefetch["cancel"] = None
+            player = hass.data.get(DOMAIN, {}).get("player_ref")
+            base = _resolve_base_url()
+            if not player or not base:
+                return
+            stats = hass.data.get(DOMAIN, {}).get("artwork_prefetch") or {}
+            stats["runs"] = stats.get("runs", 0) + 1
+            album = await _next_album(base)
+            # Without an up-next queue there is nothing to predict; the current album is already cached
+            if not album:
+                stats["no_prediction"] = stats.get("no_prediction", 0) + 1
+                return
+            if album == getattr(player, "_attr_media_album_name", None):
+                stats["same_album"] = stats.get("same_album", 0) + 1
+                return
+            fetched = False
+            key = f"album__{_sanitize_filename(album)}"
+            neg = hass.data.get(DOMAIN, {}).get("artwork_negative")
+            # One size at a time so interactive requests are never crowded out; the
+            # first miss fetches the largest rung and the rest are derived locally
+            for sz in ARTWORK_SIZE_LADDER:
+                if neg is not None and neg.has(key):
+                    break
+                if await _async_artwork_cached(hass, [key], sz):
+                    continue
+                fetched = True
+                got = await _async_fetch_artwork(hass, key, sz, album=album)
+                if not got or got[2] is None:
+                    break
+                stats["warmed"] = stats.get("warmed", 0) + 1
+            tracks = hass.data.get(DOMAIN, {}).get("album_tracks")
+            if tracks is not None and album not in tracks:
+                fetched = True
+                try:
+                    async with session.get(
+                        f"{base}/songs_by_album/{quote(album)}", timeout=aiohttp.ClientTimeout(total=10)
+                    ) as r:
+                        if r.status == 200:
+                            tracks.put(album, await r.json())
+                except Exception:
+                    pass
+            # Only a prefetch that actually pulled something is scored on the next track change
+            if fetched:
+                prefetch["album"] = album
+            else:
+                stats["already_cached"] = stats.get("already_cached", 0) + 1
+
+        def _arm_prefetch(player) -> None:
+            """(Re)arm the prefetch timer to fire ARTWORK_PREFETCH_LEAD_S before the track ends."""
+            if prefetch["cancel"]:
+                prefetch["cancel"]()
+                prefetch["cancel"] = None
+            from homeassistant.components.media_player import MediaPlayerState as _MPState
+            track = (player._attr_media_title, player._attr_media_album_name)
+            if player._state != _MPState.PLAYING or prefetch["track"] == track:
+                return
+            dur = player._attr_media_duration
+            pos = player._attr_media_position
+            if not isinstance(dur, (int, float)) or not isinstance(pos, (int, float)) or dur <= 0:
+                return
+            remaining = dur - pos
+            if remaining <= 0:
+                return
+
+            async def _fire(_now) -> None:
+                prefetch["track"] = track
+                await _prefetch_next()
+
+            prefetch["cancel"] = async_call_later(hass, max(0.0, remaining - ARTWORK_PREFETCH_LEAD_S), _fire)
+
         async def _apply_now(now: dict, token: str | None = None, etag: str | None = None):
             """Apply now-playing dict to the player entity and write state."""
             player = hass.data.get(DOMAIN, {}).get("player_ref")
             if not player:
                 return
+            prev_track = (getattr(player, "_attr_media_title", None), getattr(player, "_attr_media_album_name", None))
             try:
                 from homeassistant.components.media_player import MediaPlayerState as _MPState
                 state = (now.get("state") or "").lower()
@@ -1529,6 +3392,18 @@ async def _maybe_start_sse_listener(hass: HomeAssistant, entry: ConfigEntry) ->
                         player._volume_level = max(0.0, min(1.0, float(vol) / 100.0))
                     except Exception:
                         pass
+                # Next-track prefetch: score the previous guess on a track change, then re-arm
+                if "title" in now:
+                    try:
+                        track = (player._attr_media_title, player._attr_media_album_name)
+                        if track[0] and track != prev_track and prefetch["album"] is not None:
+                            stats = hass.data.get(DOMAIN, {}).get("artwork_prefetch") or {}
+                            outcome = "hits" if prefetch["album"] == track[1] else "misses"
+                            stats[outcome] = stats.get(outcome, 0) + 1
+                            prefetch["album"] = None
+                        _arm_prefetch(player)
+                    except Exception:
+                        pass
                 # Bump image hash (include token if provided); exclude duration to avoid churn
                 import hashlib as _hashlib
                 key = f"{player._attr_media_title or ''}|{player._attr_media_artist or ''}|{player._attr_media_album_name or ''}|{token or ''}"
@@ -1541,75 +3416,19 @@ async def _maybe_start_sse_listener(hass: HomeAssistant, entry: ConfigEntry) ->
                     player._last_artwork_token = token
                 except Exception:
                     pass
-                # Proactively update HA-side album/current meta to point to the latest artwork hash (etag),
-                # so first fetches don't briefly show stale album art. Canonical bin will be fetched on demand.
+                # Announce the latest upstream artwork etag for the album/current keys. Cached bytes
+                # validated against another etag keep being served and are refetched in the background.
                 try:
                     if etag:
-                        def _write_album_meta():
-                            try:
-                                alb = (now or {}).get("album") or player._attr_media_album_name
-                            except Exception:
-                                alb = (now or {}).get("album")
-                            # Paths
-                            tdir = Path(hass.config.path(".storage", "music_controller", "thumbs"))
-                            fdir = Path(hass.config.path(".storage", "music_controller", "artwork"))
-                            try:
-                                tdir.mkdir(parents=True, exist_ok=True)
-                                fdir.mkdir(parents=True, exist_ok=True)
-                            except Exception:
-                                pass
-                            size = 256
-                            # Prepare album meta paths
-                            meta_thumb = None
-                            meta_full = None
-                            if alb:
-                                an = _sanitize_filename(str(alb))
-                                meta_thumb = tdir / f"album__{an}.{size}.json"
-                                meta_full = fdir / f"album__{an}.json"
-                            # Also prepare current meta as a fallback
-                            meta_cur_thumb = tdir / f"current.{size}.json"
-                            meta_cur_full = fdir / "current.json"
-                            # Helper to write a meta JSON and optionally cleanup old hash bins
-                            def _write_one(meta_path: Path, is_thumb: bool):
-                                try:
-                                    old_hash = None
-                                    try:
-                                        if meta_path.is_file():
-                                            with open(meta_path, "r", encoding="utf-8") as mf:
-                                                m = json.load(mf)
-                                            old_hash = m.get("hash") or m.get("etag")
-                                    except Exception:
-                                        old_hash = None
-                                    with open(meta_path, "w", encoding="utf-8") as mf:
-                                        json.dump({
-                                            "content_type": "image/jpeg",
-                                            "ts": int(time.time()),
-                                            "hash": etag,
-                                            "size": (size if is_thumb else None)
-                                        }, mf)
-                                    # Best-effort: if the hash changed, remove the old bin so we don't re-serve it
-                                    if old_hash and old_hash != etag:
-                                        try:
-                                            if is_thumb:
-                                                op = tdir / f"{old_hash}.{size}.bin"
-                                            else:
-                                                op = fdir / f"{old_hash}.bin"
-                                            if op.is_file():
-                                                op.unlink()
-                                        except Exception:
-                                            pass
-                                except Exception:
-                                    pass
-                            # Write album-targeted meta first (preferred), then current fallback
-                            if meta_thumb: _write_one(meta_thumb, True)
-                            if meta_full: _write_one(meta_full, False)
-                            _write_one(meta_cur_thumb, True)
-                            _write_one(meta_cur_full, False)
-                        # Do the small file IO off the event loop
-                        try:
-                            await hass.async_add_executor_job(_write_album_meta)
-                        except Exception:
-                            _write_album_meta()
+                        swr = hass.data.get(DOMAIN, {}).get("artwork_swr")
+                        neg = hass.data.get(DOMAIN, {}).get("artwork_negative")
+                        alb = (now or {}).get("album") or player._attr_media_album_name
+                        for mk in ["current"] + ([f"album__{_sanitize_filename(str(alb))}"] if alb else []):
+                            if swr is not None:
+                                swr.announce(mk, str(etag))
+                            # A fresh artwork etag means this album has art after all
+                            if neg is not None:
+                                neg.discard(mk)
                 except Exception:
                     pass
                 # Provide a direct, same-origin artwork URL for built-in cards, but only
@@ -1625,91 +3444,76 @@ async def _maybe_start_sse_listener(hass: HomeAssistant, entry: ConfigEntry) ->
                         params.append(f"cache={player._attr_media_image_hash}")
                     url = art_url_base + ("?" + "&".join(params) if params else "")
 
-                    async def _thumb_path(tok: str) -> str:
-                        # Prefer album meta mapping (single JSON per album), fallback to token meta, then legacy.
+                    def _set_picture(etag: str | None = None, summary: dict | None = None) -> None:
+                        # Once the bytes are committed, publish their content address: the URL
+                        # only changes with the image, so browsers may cache it indefinitely
+                        pic = f"{art_url_base}/h/{etag}/{size}" if etag else url
+                        player._attr_entity_picture_local = pic
+                        player._attr_entity_picture = pic
+                        player._artwork_summary = summary
+                        try: player.async_write_ha_state()
+                        except Exception: pass
+
+                    async def _publish_summary(etag: str, summary: dict | None) -> None:
+                        """Partial `now` frame so local clients can paint colour/placeholder right away."""
+                        if not summary:
+                            return
+                        frame = {
+                            "title": player._attr_media_title,
+                            "artist": player._attr_media_artist,
+                            "album": player._attr_media_album_name,
+                            "artwork_etag": etag,
+                        }
+                        # Same names as the player's state attributes
+                        frame.update({
+                            "artwork_color": summary.get("color"),
+                            "artwork_average_color": summary.get("average"),
+                            "artwork_palette": summary.get("palette"),
+                            "artwork_blurhash": summary.get("blurhash"),
+                            "artwork_lqip": summary.get("lqip"),
+                        })
                         try:
-                            tdir = Path(hass.config.path(".storage", "music_controller", "thumbs"))
-                            # Try album meta first if we have it in the event payload
-                            alb = (now or {}).get("album") if isinstance(now, dict) else None
-                            if alb:
-                                ak = f"album__{_sanitize_filename(str(alb))}.{size}.json"
-                                am = tdir / ak
-                                if am.is_file():
-                                    def _read_album_meta():
-                                        try:
-                                            with open(am, "r", encoding="utf-8") as mf:
-                                                m = json.load(mf)
-                                            h = m.get("hash") or m.get("etag")
-                                            if h:
-                                                return str(tdir / f"{h}.{size}.bin")
-                                        except Exception:
-                                            return None
-                                    p = await hass.async_add_executor_job(_read_album_meta)
-                                    if p:
-                                        return p
-                            # Token base used for meta filename
-                            s = str(tok)
-                            tok_base = (''.join(ch for ch in s if ch.isdigit()) or s)
-                            meta = tdir / f"{tok_base}.{size}.json"
-                            if meta.is_file():
-                                def _read_tok_meta():
-                                    try:
-                                        with open(meta, "r", encoding="utf-8") as mf:
-                                            m = json.load(mf)
-                                        h = m.get("hash") or m.get("etag")
-                                        if h:
-                                            return str(tdir / f"{h}.{size}.bin")
-                                    except Exception:
-                                        return None
-                                p = await hass.async_add_executor_job(_read_tok_meta)
-                                if p:
-                                    return p
-                            # Fallback to legacy token-based bin
-                            p = tdir / f"{tok_base}.{size}.bin"
-                            return str(p)
+                            await _broadcast_local_sse(hass, "now", frame)
                         except Exception:
-                            return hass.config.path(".storage", "music_controller", "thumbs", f"{str(tok)}.{size}.bin")
+                            pass
 
                     async def _warm_and_apply():
                         # If token missing, apply immediately
                         if not token:
-                            player._attr_entity_picture_local = url
-                            player._attr_entity_picture = url
-                            try: player.async_write_ha_state()
-                            except Exception: pass
+                            _set_picture()
                             return
-                        p = await _thumb_path(token)
-                        # If cache already present, apply immediately
-                        try:
-                            if os.path.isfile(p) and os.path.getsize(p) > 200:
-                                player._attr_entity_picture_local = url
-                                player._attr_entity_picture = url
-                                try: player.async_write_ha_state()
-                                except Exception: pass
+                        # Same key the artwork view resolves for ?tok=...&size=...: album first, then token
+                        alb = (now or {}).get("album") or player._attr_media_album_name
+                        s_tok = str(token)
+                        tok_key = ''.join(ch for ch in s_tok if ch.isdigit()) or _sanitize_filename(s_tok)
+                        art_key = f"album__{_sanitize_filename(str(alb))}" if alb else tok_key
+                        # Already warm in memory or committed on disk (checked off the loop): swap right away
+                        etag = await _async_artwork_cached(hass, list(dict.fromkeys((art_key, tok_key))), size)
+                        if etag:
+                            summary = await _async_artwork_summary(hass, etag, size=size)
+                            if getattr(player, "_last_artwork_token", None) != token:
                                 return
-                        except Exception:
-                            pass
-                        # Otherwise, try to prefetch a few times without forcing UI to swap
-                        sess = async_get_clientsession(hass)
-                        for _ in range(5):
-                            try:
-                                async with sess.get(art_url_base, params={"tok": token, "size": str(size), "refresh": "1"}) as r:
-                                    if r.status == 200:
-                                        # HA view will have cached it; confirm and apply
-                                        try:
-                                            if os.path.isfile(p) and os.path.getsize(p) > 200:
-                                                player._attr_entity_picture_local = url
-                                                player._attr_entity_picture = url
-                                                try: player.async_write_ha_state()
-                                                except Exception: pass
-                                                return
-                                        except Exception:
-                                            pass
-                            except Exception:
-                                pass
-                            await asyncio.sleep(0.3)
-                        # If still not present, do not change entity picture; keep previous
-                        return
+                            _set_picture(etag, summary)
+                            await _publish_summary(etag, summary)
+                            # Shown from cache; swap again if the Mac now has different art
+                            fresh = await _async_swr_revalidate(hass, art_key, size, token=token, album=alb)
+                            if fresh and getattr(player, "_last_artwork_token", None) == token:
+                                summary = await _async_artwork_summary(hass, fresh, size=size)
+                                _set_picture(fresh, summary)
+                                await _publish_summary(fresh, summary)
+                            return
+                        # Fetch in-process, sharing any in-flight request for the same key/size,
+                        # and swap the moment the bytes are committed
+                        got = await _async_fetch_artwork(hass, art_key, size, token=token, album=alb)
+                        if not got or got[2] is None:
+                            # Nothing to show; keep the previous picture
+                            return
+                        # A newer track may have arrived while this one was fetching
+                        summary = await _async_artwork_summary(hass, got[2], got[0])
+                        if getattr(player, "_last_artwork_token", None) != token:
+                            return
+                        _set_picture(got[2], summary)
+                        await _publish_summary(got[2], summary)
 
                     # Fire and forget the warming task
                     try:
@@ -1786,7 +3590,7 @@ async def _maybe_start_sse_listener(hass: HomeAssistant, entry: ConfigEntry) ->
                 except Exception:
                     pass
             try:
-                async with session.get(
+                async with stream_session.get(
                     url,
                     headers={"Accept": "text/event-stream"},
                     timeout=aiohttp.ClientTimeout(sock_read=None, total=None),
@@ -1824,6 +3628,9 @@ async def _maybe_start_sse_listener(hass: HomeAssistant, entry: ConfigEntry) ->
                             try:
                                 ev = (msg.get("event") or evt or "").lower()
                                 payload = msg.get("data")
+                                proxy_cache = hass.data.get(DOMAIN, {}).get("proxy_cache")
+                                if proxy_cache is not None and ev in PROXY_CACHE_EVENT_ROUTES:
+                                    proxy_cache.invalidate(PROXY_CACHE_EVENT_ROUTES[ev])
                                 if ev == "now":
                                     token = msg.get("artwork_token") or (payload or {}).get("artwork_token")
                                     etag = msg.get("artwork_etag") or (payload or {}).get("artwork_etag")
@@ -1915,4 +3722,11 @@ async def _maybe_start_sse_listener(hass: HomeAssistant, entry: ConfigEntry) ->
                 backoff = min(30, backoff * 2)
 
     task = hass.loop.create_task(_runner())
+
+    def _cancel_prefetch(_task) -> None:
+        if prefetch["cancel"]:
+            prefetch["cancel"]()
+            prefetch["cancel"] = None
+
+    task.add_done_callback(_cancel_prefetch)
     store.setdefault("_sse_tasks", {})[entry.entry_id] = task
@@ -0,0 +1,1603 @@
+"""HA-side artwork cache layer for the Apple Music integration."""
+from __future__ import annotations
+
+import asyncio
+import base64
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
+import io
+import json
+import logging
+import math
+import mmap
+import os
+from pathlib import Path
+import sqlite3
+import struct
+import threading
+import time
+from typing import Any
+import warnings
+
+_LOGGER = logging.getLogger(__name__)
+
+# Default in-memory budget for artwork bytes (MiB)
+DEFAULT_ARTWORK_MEMORY_MB = 32
+
+# Thumbnail sizes the view serves; requested sizes snap up to the nearest rung
+ARTWORK_SIZE_LADDER = (128, 256, 512)
+# Decompression-bomb guards for locally derived thumbnails
+_MAX_SOURCE_BYTES = 20 * 1024 * 1024
+_MAX_SOURCE_PIXELS = 40_000_000
+
+# How long an "upstream has no artwork" answer is trusted before asking again
+NEGATIVE_ARTWORK_TTL_S = 600
+_NEGATIVE_MAX_ENTRIES = 4096
+
+# Default on-disk quota for cached artwork blobs (MiB)
+DEFAULT_ARTWORK_DISK_MB = 256
+
+# Catalog file under .storage/music_controller/
+CATALOG_FILENAME = "artwork.db"
+# Blobs younger than this are never treated as orphans (write/upsert race)
+_ORPHAN_GRACE_S = 600
+# Sweep down to this fraction of the quota so the janitor doesn't run on every write
+_QUOTA_LOW_WATER = 0.9
+# PRAGMA user_version once the JSON metas have been imported
+_CATALOG_VERSION = 1
+
+# 1x1 transparent PNG the Mac answers with when no artwork is available.
+# It is never persisted, so cache hits don't need to inspect the bytes.
+BLANK_PNG = base64.b64decode(
+    b"iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAQAAAC1HAwCAAAAC0lEQVR42mP8/x8AAoMBgQ2QY1QAAAAASUVORK5CYII="
+)
+BLANK_PNG_SHA1 = hashlib.sha1(BLANK_PNG).hexdigest()
+
+# Sprite sheets: most tiles per sheet, most upstream fetches one sheet request may start,
+# and how many composed sheets are kept on disk (pruned every SHEET_PRUNE_EVERY writes)
+SHEET_MAX_TILES = 64
+SHEET_MAX_FETCHES = 16
+SHEET_MAX_FILES = 200
+SHEET_PRUNE_EVERY = 20
+
+# Cache key prefixes used by AppleMusicArtworkView ("album__<name>", ...)
+_KEY_KINDS = ("album", "artist", "plist")
+
+
+# Re-encoded variants served by Accept negotiation, in order of preference
+VARIANT_FORMATS = ("avif", "webp")
+VARIANT_CONTENT_TYPES = {"avif": "image/avif", "webp": "image/webp"}
+
+_image_executor: ThreadPoolExecutor | None = None
+_imaging: bool | None = None
+_variant_formats: tuple[str, ...] | None = None
+# Thumbnail directory -> pack store, when the pack backend is enabled
+_packs: dict[Path, "ArtworkPack"] = {}
+
+
+# Optional pack-file backend: thumbnails up to this size, roll-over size per pack file,
+# and the dead-byte ratio (with a minimum store size) at which the janitor compacts
+PACK_MAX_THUMB = 128
+_PACK_ROLL_BYTES = 64 * 1024 * 1024
+PACK_COMPACT_RATIO = 0.3
+_PACK_COMPACT_MIN_BYTES = 4 * 1024 * 1024
+_PACK_DIRNAME = "packs"
+# Record header: magic, raw sha1, size, payload length, unix time, flags (bit 0 = tombstone)
+_PACK_HEADER = struct.Struct(">4s20sHIIB")
+_PACK_MAGIC = b"AMPK"
+_PACK_TOMBSTONE = 1
+
+# Stale-while-revalidate: default freshness window for mutable keys (album__*, current, ...)
+DEFAULT_ARTWORK_FRESH_MIN = 1440
+_SWR_MAX_ENTRIES = 4096
+
+# Per-hash artwork summary: palette size, sampling resolution and placeholder sizes
+PALETTE_COLORS = 4
+_PALETTE_SAMPLE = 48
+_KMEANS_ITERATIONS = 8
+_BLURHASH_COMPONENTS = (4, 3)
+_BLURHASH_SAMPLE = 32
+_LQIP_SIZE = 16
+_B83 = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz#$%*+,-.:;=?@[]^_{|}~"
+
+
+def snap_size(size: int | None) -> int | None:
+    """Snap a requested thumbnail size up to the ladder so variants are shared."""
+    if size is None:
+        return None
+    for rung in ARTWORK_SIZE_LADDER:
+        if size <= rung:
+            return rung
+    return ARTWORK_SIZE_LADDER[-1]
+
+
+def image_executor() -> ThreadPoolExecutor:
+    """Small dedicated pool for image work so Pillow never starves HA's executor."""
+    global _image_executor
+    if _image_executor is None:
+        _image_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="apple_music_image")
+    return _image_executor
+
+
+def imaging_available() -> bool:
+    """Whether Pillow can be imported (it ships with Home Assistant core)."""
+    global _imaging
+    if _imaging is None:
+        try:
+            import PIL.Image  # noqa: F401
+            _imaging = True
+        except ImportError:
+            _imaging = False
+    return _imaging
+
+
+def variant_formats() -> tuple[str, ...]:
+    """Variant formats Pillow can encode here, in order of preference."""
+    global _variant_formats
+    if _variant_formats is None:
+        found: list[str] = []
+        try:
+            from PIL import features
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore")
+                for fmt in VARIANT_FORMATS:
+                    try:
+                        if features.check(fmt):
+                            found.append(fmt)
+                    except Exception:
+                        pass
+        except ImportError:
+            pass
+        _variant_formats = tuple(found)
+    return _variant_formats
+
+
+def negotiate_variant(accept: str | None) -> str | None:
+    """Best variant format the client accepts and we can encode, or None for the original."""
+    if not accept:
+        return None
+    for fmt in variant_formats():
+        if VARIANT_CONTENT_TYPES[fmt] in accept:
+            return fmt
+    return None
+
+
+def encode_variant(data: bytes, fmt: str) -> bytes | None:
+    """Re-encode artwork as fmt (blocking; run in image_executor).
+
+    Returns None when decoding fails or the result would not be smaller.
+    """
+    try:
+        from PIL import Image
+    except ImportError:
+        return None
+    if not data or len(data) > _MAX_SOURCE_BYTES:
+        return None
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter("error", Image.DecompressionBombWarning)
+            with Image.open(io.BytesIO(data)) as im:
+                if im.size[0] * im.size[1] > _MAX_SOURCE_PIXELS:
+                    return None
+                has_alpha = im.mode in ("RGBA", "LA") or (im.mode == "P" and "transparency" in im.info)
+                out = im.convert("RGBA" if has_alpha else "RGB")
+                buf = io.BytesIO()
+                if fmt == "avif":
+                    out.save(buf, format="AVIF", quality=60, speed=8)
+                else:
+                    out.save(buf, format="WEBP", quality=80, method=4)
+    except Exception as e:  # includes DecompressionBombError/Warning
+        _LOGGER.debug("apple_music: %s encode failed: %s", fmt, e)
+        return None
+    encoded = buf.getvalue()
+    return encoded if len(encoded) < len(data) else None
+
+
+def derive_thumbnail(data: bytes, size: int) -> tuple[bytes, str] | None:
+    """Downscale source artwork to fit size x size (blocking; run in image_executor).
+
+    Returns (bytes, content_type), the source itself when it is already small
+    enough, or None if the image can't be decoded safely.
+    """
+    try:
+        from PIL import Image
+    except ImportError:
+        return None
+    if not data or len(data) > _MAX_SOURCE_BYTES:
+        return None
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter("error", Image.DecompressionBombWarning)
+            with Image.open(io.BytesIO(data)) as im:
+                w, h = im.size
+                if w * h > _MAX_SOURCE_PIXELS:
+                    return None
+                if max(w, h) <= size:
+                    return data, Image.MIME.get(im.format or "", "image/jpeg")
+                has_alpha = im.mode in ("RGBA", "LA") or (im.mode == "P" and "transparency" in im.info)
+                # JPEG sources can decode straight at a reduced scale
+                im.draft("RGB", (size, size))
+                out = im.convert("RGBA" if has_alpha else "RGB")
+                out.thumbnail((size, size), Image.LANCZOS)
+                buf = io.BytesIO()
+                if has_alpha:
+                    out.save(buf, format="PNG", optimize=True)
+                    return buf.getvalue(), "image/png"
+                out.save(buf, format="JPEG", quality=85, optimize=True, progressive=True)
+                return buf.getvalue(), "image/jpeg"
+    except Exception as e:  # includes DecompressionBombError/Warning
+        _LOGGER.debug("apple_music: thumbnail derivation failed: %s", e)
+        return None
+
+
+def _hex(rgb) -> str:
+    return "#%02x%02x%02x" % tuple(max(0, min(255, int(round(c)))) for c in rgb)
+
+
+def _palette_numpy(img, k: int) -> list[tuple[tuple[float, float, float], int]]:
+    """Vectorized k-means over the sampled pixels; returns (centre, count) largest first."""
+    import numpy as np
+
+    px = np.asarray(img, dtype=np.float32).reshape(-1, 3)
+    # Deterministic seeds spread across the luminance range
+    order = np.argsort(px @ np.array([0.299, 0.587, 0.114], dtype=np.float32))
+    centers = px[order[np.linspace(0, len(px) - 1, k).astype(int)]]
+    labels = np.zeros(len(px), dtype=np.intp)
+    for _ in range(_KMEANS_ITERATIONS):
+        labels = ((px[:, None, :] - centers[None, :, :]) ** 2).sum(axis=2).argmin(axis=1)
+        counts = np.bincount(labels, minlength=k)
+        sums = np.zeros_like(centers)
+        np.add.at(sums, labels, px)
+        filled = counts > 0
+        moved = centers.copy()
+        moved[filled] = sums[filled] / counts[filled, None]
+        done = np.abs(moved - centers).max() < 0.5
+        centers = moved
+        if done:
+            break
+    counts = np.bincount(labels, minlength=k)
+    ranked = sorted(range(k), key=lambda i: -counts[i])
+    return [(tuple(float(c) for c in centers[i]), int(counts[i])) for i in ranked if counts[i]]
+
+
+def _palette_pillow(img, k: int) -> list[tuple[tuple[float, float, float], int]]:
+    """Median-cut fallback when NumPy is unavailable."""
+    q = img.quantize(colors=k)
+    pal = q.getpalette() or []
+    colors = sorted(q.getcolors() or [], reverse=True)
+    return [(tuple(float(c) for c in pal[i * 3: i * 3 + 3]), n) for n, i in colors]
+
+
+def _srgb_to_linear(v: int) -> float:
+    c = v / 255
+    return c / 12.92 if c <= 0.04045 else ((c + 0.055) / 1.055) ** 2.4
+
+
+def _linear_to_srgb(v: float) -> int:
+    c = max(0.0, min(1.0, v))
+    if c <= 0.0031308:
+        return int(c * 12.92 * 255 + 0.5)
+    return int((1.055 * c ** (1 / 2.4) - 0.055) * 255 + 0.5)
+
+
+def _b83(value: int, length: int) -> str:
+    return "".join(_B83[(value // 83 ** (length - i)) % 83] for i in range(1, length + 1))
+
+
+def blurhash_encode(img, cx: int = _BLURHASH_COMPONENTS[0], cy: int = _BLURHASH_COMPONENTS[1]) -> str:
+    """BlurHash (https://blurha.sh) of a small RGB image."""
+    w, h = img.size
+    lin = [[_srgb_to_linear(c) for c in p] for p in img.getdata()]
+    cos_x = [[math.cos(math.pi * i * x / w) for x in range(w)] for i in range(cx)]
+    cos_y = [[math.cos(math.pi * j * y / h) for y in range(h)] for j in range(cy)]
+    factors = []
+    for j in range(cy):
+        for i in range(cx):
+            norm = (1 if i == 0 and j == 0 else 2) / (w * h)
+            r = g = b = 0.0
+            for y in range(h):
+                cyv = cos_y[j][y] * norm
+                row = y * w
+                for x in range(w):
+                    basis = cos_x[i][x] * cyv
+                    p = lin[row + x]
+                    r += basis * p[0]
+                    g += basis * p[1]
+                    b += basis * p[2]
+            factors.append((r, g, b))
+    dc, ac = factors[0], factors[1:]
+    out = _b83((cx - 1) + (cy - 1) * 9, 1)
+    if ac:
+        q_max = max(0, min(82, int(math.floor(max(abs(v) for f in ac for v in f) * 166 - 0.5))))
+        max_value = (q_max + 1) / 166
+        out += _b83(q_max, 1)
+    else:
+        max_value = 1.0
+        out += _b83(0, 1)
+    out += _b83((_linear_to_srgb(dc[0]) << 16) + (_linear_to_srgb(dc[1]) << 8) + _linear_to_srgb(dc[2]), 4)
+
+    def _q(v: float) -> int:
+        return max(0, min(18, int(math.floor(math.copysign(abs(v / max_value) ** 0.5, v) * 9 + 9.5))))
+    for f in ac:
+        out += _b83(_q(f[0]) * 19 * 19 + _q(f[1]) * 19 + _q(f[2]), 2)
+    return out
+
+
+def summarize_artwork(data: bytes) -> dict | None:
+    """Colour summary and placeholders for artwork bytes (blocking; run in image_executor).
+
+    Returns {"color", "average", "palette", "blurhash", "lqip"}: the dominant
+    (largest k-means cluster) and mean colours as #rrggbb, the palette largest
+    cluster first, a BlurHash and a tiny JPEG data URI. None if undecodable.
+    """
+    try:
+        from PIL import Image
+    except ImportError:
+        return None
+    if not data or len(data) > _MAX_SOURCE_BYTES:
+        return None
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter("error", Image.DecompressionBombWarning)
+            with Image.open(io.BytesIO(data)) as im:
+                w, h = im.size
+                if w * h > _MAX_SOURCE_PIXELS:
+                    return None
+                im.draft("RGB", (_PALETTE_SAMPLE, _PALETTE_SAMPLE))
+                rgb = im.convert("RGB")
+        sample = rgb.resize((_PALETTE_SAMPLE, _PALETTE_SAMPLE), Image.BILINEAR)
+        try:
+            clusters = _palette_numpy(sample, PALETTE_COLORS)
+        except ImportError:
+            clusters = _palette_pillow(sample, PALETTE_COLORS)
+        total = sum(n for _c, n in clusters) or 1
+        average = [sum(c[i] * n for c, n in clusters) / total for i in range(3)]
+        blurhash = blurhash_encode(rgb.resize((_BLURHASH_SAMPLE, _BLURHASH_SAMPLE), Image.BILINEAR))
+        tiny = rgb.copy()
+        tiny.thumbnail((_LQIP_SIZE, _LQIP_SIZE), Image.BILINEAR)
+        buf = io.BytesIO()
+        tiny.save(buf, format="JPEG", quality=60)
+    except Exception as e:  # includes DecompressionBombError/Warning
+        _LOGGER.debug("apple_music: artwork summary failed: %s", e)
+        return None
+    return {
+        "color": _hex(clusters[0][0]) if clusters else _hex(average),
+        "average": _hex(average),
+        "palette": [_hex(c) for c, _n in clusters],
+        "blurhash": blurhash,
+        "lqip": "data:image/jpeg;base64," + base64.b64encode(buf.getvalue()).decode("ascii"),
+    }
+
+
+def sheet_id(size: int, hashes: list[str | None]) -> str:
+    """Content address of a sprite sheet: the size plus the ordered tile hashes."""
+    basis = f"{size}|" + ",".join(h or "-" for h in hashes)
+    return hashlib.sha1(basis.encode("utf-8")).hexdigest()
+
+
+def compose_sheet(tiles: list[bytes | None], size: int, cols: int) -> bytes | None:
+    """Paste tiles into a cols-wide grid of size x size cells (blocking; run in image_executor).
+
+    Missing tiles (None) or tiles that fail to decode leave an empty cell.
+    Returns JPEG bytes, or None when Pillow is unavailable.
+    """
+    try:
+        from PIL import Image, ImageOps
+    except ImportError:
+        return None
+    cols = max(1, cols)
+    rows = max(1, -(-len(tiles) // cols))
+    sheet = Image.new("RGB", (cols * size, rows * size), (0, 0, 0))
+    for idx, data in enumerate(tiles):
+        if not data or len(data) > _MAX_SOURCE_BYTES:
+            continue
+        try:
+            with warnings.catch_warnings():
+                warnings.simplefilter("error", Image.DecompressionBombWarning)
+                with Image.open(io.BytesIO(data)) as im:
+                    if im.size[0] * im.size[1] > _MAX_SOURCE_PIXELS:
+                        continue
+                    im.draft("RGB", (size, size))
+                    tile = ImageOps.fit(im.convert("RGB"), (size, size), Image.LANCZOS)
+            sheet.paste(tile, ((idx % cols) * size, (idx // cols) * size))
+        except Exception as e:  # includes DecompressionBombError/Warning
+            _LOGGER.debug("apple_music: sheet tile %d skipped: %s", idx, e)
+    buf = io.BytesIO()
+    sheet.save(buf, format="JPEG", quality=85, optimize=True, progressive=True)
+    return buf.getvalue()
+
+
+def is_content_hash(value: str) -> bool:
+    """True for a lowercase hex sha1, the name every blob is stored under."""
+    return len(value) == 40 and all(c in "0123456789abcdef" for c in value)
+
+
+def sniff_content_type(head: bytes) -> str:
+    """Image type from a blob's leading bytes (blobs on disk carry no metadata)."""
+    if head.startswith(b"\x89PNG"):
+        return "image/png"
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "image/webp"
+    if head.startswith(b"GIF8"):
+        return "image/gif"
+    if head[4:12] in (b"ftypavif", b"ftypavis"):
+        return "image/avif"
+    return "image/jpeg"
+
+
+def split_cache_key(key: str) -> tuple[str, str]:
+    """Map a view cache key ('album__X', 'current', token digits) to (kind, name)."""
+    for kind in _KEY_KINDS:
+        prefix = f"{kind}__"
+        if key.startswith(prefix):
+            return kind, key[len(prefix):]
+    if key == "current":
+        return "current", ""
+    return "token", key
+
+
+def join_cache_key(kind: str, name: str) -> str:
+    """Inverse of split_cache_key."""
+    if kind == "current":
+        return "current"
+    if kind == "token":
+        return name
+    return f"{kind}__{name}"
+
+
+def blob_path(thumb_dir: Path, full_dir: Path, etag: str, size: int | None) -> Path:
+    """Location of a canonical, content-addressed blob."""
+    if size is not None:
+        return thumb_dir / f"{etag}.{size}.bin"
+    return full_dir / f"{etag}.bin"
+
+
+def variant_path(thumb_dir: Path, full_dir: Path, etag: str, size: int | None, fmt: str) -> Path:
+    """Re-encoded variant stored next to its source blob; empty when re-encoding didn't pay off."""
+    if size is not None:
+        return thumb_dir / f"{etag}.{size}.{fmt}"
+    return full_dir / f"{etag}.{fmt}"
+
+
+def write_blob(path: Path, data: bytes) -> None:
+    """Atomically write a content-addressed blob unless it already exists.
+
+    Small thumbnails go to the directory's pack store instead, when one is registered.
+    """
+    pack = _packs.get(path.parent)
+    if pack is not None:
+        parsed = _parse_blob_name(path.name)
+        if parsed and pack.accepts(parsed[1]):
+            pack.put(parsed[0], parsed[1], data)
+            return
+    if path.is_file():
+        return
+    _write_file(path, data)
+
+
+def _write_file(path: Path, data: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def register_pack(thumb_dir: Path, pack: "ArtworkPack | None") -> None:
+    """Route small thumbnails under thumb_dir through pack (None goes back to .bin files)."""
+    if pack is None:
+        _packs.pop(thumb_dir, None)
+    else:
+        _packs[thumb_dir] = pack
+
+
+def artwork_pack(thumb_dir: Path) -> "ArtworkPack | None":
+    return _packs.get(thumb_dir)
+
+
+def pack_dir(thumb_dir: Path) -> Path:
+    return thumb_dir / _PACK_DIRNAME
+
+
+def unpack_thumbnails(thumb_dir: Path, full_dir: Path) -> int:
+    """Move every packed thumbnail back to a .bin file and delete the pack store (blocking).
+
+    Used when the pack backend is turned off, so packed blobs stay readable and stay
+    under the janitor's quota. Handles a registered pack or one left on disk.
+    """
+    directory = pack_dir(thumb_dir)
+    pack = _packs.get(thumb_dir)
+    if pack is None:
+        if not directory.is_dir():
+            return 0
+        pack = ArtworkPack(directory)
+        pack.open()
+    moved = 0
+    for etag, size in pack.entries():
+        view = pack.get(etag, size)
+        if view is None:
+            continue
+        path = blob_path(thumb_dir, full_dir, etag, size)
+        if not path.is_file():
+            _write_file(path, bytes(view))
+        moved += 1
+    _packs.pop(thumb_dir, None)
+    pack.clear()
+    pack.close()
+    try:
+        directory.rmdir()
+    except OSError:
+        pass
+    return moved
+
+
+def pack_view(thumb_dir: Path, etag: str, size: int | None) -> memoryview | None:
+    """Zero-copy view of a packed thumbnail, or None when it lives in a .bin file (or nowhere)."""
+    pack = _packs.get(thumb_dir)
+    return pack.get(etag, size) if pack is not None and size is not None else None
+
+
+def has_blob(thumb_dir: Path, full_dir: Path, etag: str, size: int | None) -> bool:
+    """Whether the blob exists in the pack or as a .bin file (blocking)."""
+    pack = _packs.get(thumb_dir)
+    if pack is not None and size is not None and pack.contains(etag, size):
+        return True
+    return blob_path(thumb_dir, full_dir, etag, size).is_file()
+
+
+def read_blob(thumb_dir: Path, full_dir: Path, etag: str, size: int | None) -> bytes | None:
+    """Blob bytes from the pack or the .bin file, or None (blocking)."""
+    view = pack_view(thumb_dir, etag, size)
+    if view is not None:
+        return bytes(view)
+    try:
+        return blob_path(thumb_dir, full_dir, etag, size).read_bytes()
+    except OSError:
+        return None
+
+
+def remove_blob(thumb_dir: Path, full_dir: Path, etag: str, size: int | None) -> int:
+    """Delete a blob wherever it is stored; returns the bytes freed (blocking)."""
+    pack = _packs.get(thumb_dir)
+    freed = pack.delete(etag, size) if pack is not None and size is not None else 0
+    path = blob_path(thumb_dir, full_dir, etag, size)
+    try:
+        nbytes = path.stat().st_size
+        path.unlink()
+        freed += nbytes
+    except OSError:
+        pass
+    return freed
+
+
+def point_key(
+    catalog: "ArtworkCatalog", thumb_dir: Path, full_dir: Path,
+    key: str, size: int | None, etag: str, ctype: str | None, nbytes: int | None = None,
+) -> None:
+    """Point a cache key at etag and drop the previous blob once nothing references it."""
+    kind, name = split_cache_key(key)
+    old = catalog.upsert(kind, name, size, etag, ctype, nbytes)
+    if old and old != etag and not catalog.is_referenced(old, size):
+        remove_blob(thumb_dir, full_dir, old, size)
+        catalog.drop_blob(old, size)
+
+
+def store_artwork(
+    catalog: "ArtworkCatalog", thumb_dir: Path, full_dir: Path,
+    key: str, size: int | None, data: bytes, ctype: str | None, etag: str,
+) -> None:
+    """Write the canonical blob for etag and point key/size at it (blocking)."""
+    if data == BLANK_PNG:
+        return
+    write_blob(blob_path(thumb_dir, full_dir, etag, size), data)
+    catalog.add_blob(etag, size, len(data))
+    point_key(catalog, thumb_dir, full_dir, key, size, etag, ctype, len(data))
+
+
+def _parse_blob_name(name: str) -> tuple[str, int | None] | None:
+    """'<sha1>.<size>.bin' -> (sha1, size); '<sha1>.bin' -> (sha1, None)."""
+    if not name.endswith(".bin"):
+        return None
+    parts = name[: -len(".bin")].split(".")
+    if len(parts) == 2 and parts[1].isdigit():
+        etag, size = parts[0], int(parts[1])
+    elif len(parts) == 1:
+        etag, size = parts[0], None
+    else:
+        return None
+    if not is_content_hash(etag):
+        return None
+    return etag, size
+
+
+def _parse_variant_name(name: str) -> tuple[str, int | None] | None:
+    """'<sha1>.<size>.webp' -> (sha1, size); '<sha1>.avif' -> (sha1, None)."""
+    stem, _, fmt = name.rpartition(".")
+    if fmt not in VARIANT_FORMATS:
+        return None
+    return _parse_blob_name(f"{stem}.bin")
+
+
+def sweep_disk_cache(catalog: "ArtworkCatalog", thumb_dir: Path, full_dir: Path, max_bytes: int) -> dict:
+    """Janitor pass over the content-addressed store (blocking; run in the executor).
+
+    Registers untracked blobs, drops orphans that no catalog key references,
+    then evicts least-recently-served blobs until the store fits the quota.
+    Returns a small report including bytes reclaimed.
+    """
+    report = {"orphans": 0, "evicted": 0, "bytes_reclaimed": 0, "total_bytes": 0}
+    now = int(time.time())
+    catalog.flush_access()
+    # Packed thumbnails have no path of their own
+    on_disk: dict[tuple[str, int | None], tuple[Path | None, int, int]] = {}
+    # Re-encoded variants live and die with their source blob
+    variants: dict[tuple[str, int | None], list[tuple[Path, int]]] = {}
+    for directory in (thumb_dir, full_dir):
+        try:
+            entries = list(os.scandir(directory))
+        except OSError:
+            continue
+        for de in entries:
+            try:
+                st = de.stat()
+            except OSError:
+                continue
+            # Leftovers from interrupted atomic writes
+            if de.name.endswith(".tmp"):
+                if now - st.st_mtime > _ORPHAN_GRACE_S:
+                    try:
+                        os.unlink(de.path)
+                        report["bytes_reclaimed"] += st.st_size
+                    except OSError:
+                        pass
+                continue
+            parsed = _parse_blob_name(de.name)
+            if parsed:
+                on_disk[parsed] = (Path(de.path), st.st_size, int(st.st_mtime))
+                continue
+            parsed = _parse_variant_name(de.name)
+            if parsed:
+                variants.setdefault(parsed, []).append((Path(de.path), st.st_size))
+    pack = _packs.get(thumb_dir)
+    if pack is not None:
+        for key, (nbytes, ts) in pack.entries().items():
+            on_disk.setdefault(key, (None, nbytes, ts))
+    catalog.sync_blobs({k: (v[1], v[2]) for k, v in on_disk.items()})
+
+    def _remove_variants(etag: str, size: int | None) -> int:
+        freed = 0
+        for vpath, vbytes in variants.pop((etag, size), []):
+            try:
+                vpath.unlink()
+                freed += vbytes
+            except OSError:
+                pass
+        report["bytes_reclaimed"] += freed
+        return freed
+
+    def _remove(etag: str, size: int | None) -> int:
+        path, nbytes, _mtime = on_disk.pop((etag, size))
+        if path is None:
+            pack.delete(etag, size)
+        else:
+            try:
+                path.unlink()
+            except OSError:
+                return 0
+        catalog.drop_blob(etag, size)
+        report["bytes_reclaimed"] += nbytes
+        return nbytes + _remove_variants(etag, size)
+
+    for etag, size in catalog.orphan_blobs(now - _ORPHAN_GRACE_S):
+        if (etag, size) in on_disk:
+            _remove(etag, size)
+            report["orphans"] += 1
+    # Variants whose source is gone (purged, evicted elsewhere)
+    for key in [k for k in variants if k not in on_disk]:
+        _remove_variants(*key)
+    total = sum(v[1] for v in on_disk.values()) + sum(b for vs in variants.values() for _p, b in vs)
+    if max_bytes > 0 and total > max_bytes:
+        target = int(max_bytes * _QUOTA_LOW_WATER)
+        for etag, size in catalog.blobs_by_last_access():
+            if total <= target:
+                break
+            if (etag, size) not in on_disk:
+                continue
+            total -= _remove(etag, size)
+            report["evicted"] += 1
+    report["total_bytes"] = total
+    if pack is not None and pack.needs_compaction():
+        report["pack_compacted"] = pack.compact()
+    catalog.prune_summaries()
+    return report
+
+
+class ArtworkMemoryCache:
+    """Bounded in-process LRU of artwork bytes, sized by a total byte budget.
+
+    Lookups are keyed by (cache key, size) and return (bytes, content_type, etag).
+    Blobs are stored once per (etag, size) so several keys (album, current, token)
+    can point at the same image without double-counting the budget. Each key also
+    remembers its catalog 'updated' time, once known, to answer Last-Modified.
+    All access happens on the event loop; no locking is needed.
+    """
+
+    def __init__(self, max_bytes: int) -> None:
+        self._max_bytes = max(0, int(max_bytes))
+        self._blobs: OrderedDict[tuple[str, int | None], tuple[bytes, str]] = OrderedDict()
+        self._keys: dict[tuple[str, int | None], str] = {}
+        self._refs: dict[tuple[str, int | None], set[str]] = {}
+        self._updated: dict[tuple[str, int | None], float] = {}
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def max_bytes(self) -> int:
+        return self._max_bytes
+
+    def resize(self, max_bytes: int) -> None:
+        """Change the byte budget, evicting immediately if it shrank."""
+        self._max_bytes = max(0, int(max_bytes))
+        self._evict()
+
+    def get(self, key: str, size: int | None) -> tuple[bytes, str, str] | None:
+        """Return (bytes, content_type, etag) for key/size, or None on a miss."""
+        etag = self._keys.get((key, size))
+        blob = self._blobs.get((etag, size)) if etag else None
+        if blob is None:
+            if etag:
+                self._unlink(key, size)
+            self.misses += 1
+            return None
+        self._blobs.move_to_end((etag, size))
+        self.hits += 1
+        return blob[0], blob[1], etag
+
+    def get_blob(self, etag: str, size: int | None) -> tuple[bytes, str] | None:
+        """Return (bytes, content_type) held for etag/size, regardless of which key points at it."""
+        blob = self._blobs.get((etag, size))
+        if blob is None:
+            self.misses += 1
+            return None
+        self._blobs.move_to_end((etag, size))
+        self.hits += 1
+        return blob
+
+    def contains(self, key: str, size: int | None) -> bool:
+        """True when key/size resolves to bytes in memory (no LRU bump, no counters)."""
+        return self.peek_etag(key, size) is not None
+
+    def peek_etag(self, key: str, size: int | None) -> str | None:
+        """Etag key/size resolves to in memory, without touching LRU order or counters."""
+        etag = self._keys.get((key, size))
+        return etag if etag and (etag, size) in self._blobs else None
+
+    def updated(self, key: str, size: int | None) -> float | None:
+        """Catalog 'updated' time of key/size's current content, if known."""
+        return self._updated.get((key, size))
+
+    def note_updated(self, key: str, size: int | None, etag: str, updated: float | None) -> None:
+        """Remember key/size's catalog 'updated' time, if key still points at etag."""
+        if updated and self._keys.get((key, size)) == etag:
+            self._updated[(key, size)] = updated
+
+    def put(
+        self, key: str, size: int | None, data: bytes, ctype: str | None, etag: str,
+        updated: float | None = None,
+    ) -> None:
+        """Store bytes for key/size under their content hash."""
+        if not data or not etag or len(data) > self._max_bytes:
+            return
+        bkey = (etag, size)
+        old = self._blobs.pop(bkey, None)
+        if old is not None:
+            self._bytes -= len(old[0])
+        self._blobs[bkey] = (bytes(data), ctype or "image/jpeg")
+        self._bytes += len(data)
+        self._link(key, size, etag)
+        self.note_updated(key, size, etag, updated)
+        self._evict()
+
+    def point(self, key: str, size: int | None, etag: str) -> bool:
+        """Re-point key/size at an already cached etag; drop the key otherwise.
+
+        Returns True when the key now resolves to bytes held in memory.
+        """
+        if (etag, size) in self._blobs:
+            self._link(key, size, etag)
+            return True
+        self.discard(key, size)
+        return False
+
+    def discard(self, key: str, size: int | None) -> None:
+        """Forget the mapping for key/size (blobs stay until evicted)."""
+        self._unlink(key, size)
+
+    def clear(self) -> None:
+        self._blobs.clear()
+        self._keys.clear()
+        self._refs.clear()
+        self._updated.clear()
+        self._bytes = 0
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._keys),
+            "blobs": len(self._blobs),
+            "bytes": self._bytes,
+            "max_bytes": self._max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+    def _link(self, key: str, size: int | None, etag: str) -> None:
+        prev = self._keys.get((key, size))
+        if prev == etag:
+            return
+        if prev:
+            self._unlink(key, size)
+        # New content: its 'updated' time comes from the catalog, not the old entry
+        self._updated.pop((key, size), None)
+        self._keys[(key, size)] = etag
+        self._refs.setdefault((etag, size), set()).add(key)
+
+    def _unlink(self, key: str, size: int | None) -> None:
+        self._updated.pop((key, size), None)
+        etag = self._keys.pop((key, size), None)
+        if not etag:
+            return
+        refs = self._refs.get((etag, size))
+        if refs is not None:
+            refs.discard(key)
+            if not refs:
+                self._refs.pop((etag, size), None)
+
+    def _evict(self) -> None:
+        while self._blobs and self._bytes > self._max_bytes:
+            (etag, size), (data, _ctype) = self._blobs.popitem(last=False)
+            self._bytes -= len(data)
+            self.evictions += 1
+            for key in self._refs.pop((etag, size), set()):
+                self._keys.pop((key, size), None)
+                self._updated.pop((key, size), None)
+
+
+class ArtworkNegativeCache:
+    """Remember album/artist/playlist keys the Mac has no artwork for.
+
+    Entries expire after ttl seconds and are bounded (oldest dropped first).
+    Keys of any other kind ("current", tokens) are never recorded, since they
+    change meaning with every track. Event-loop only.
+    """
+
+    def __init__(self, ttl: float = NEGATIVE_ARTWORK_TTL_S, max_entries: int = _NEGATIVE_MAX_ENTRIES) -> None:
+        self._ttl = ttl
+        self._max_entries = max_entries
+        self._expires: OrderedDict[str, float] = OrderedDict()
+        self.hits = 0
+
+    def add(self, key: str) -> None:
+        if split_cache_key(key)[0] not in _KEY_KINDS:
+            return
+        self._expires.pop(key, None)
+        self._expires[key] = time.monotonic() + self._ttl
+        while len(self._expires) > self._max_entries:
+            self._expires.popitem(last=False)
+
+    def has(self, key: str) -> bool:
+        """True while key is known to have no artwork."""
+        exp = self._expires.get(key)
+        if exp is None:
+            return False
+        if exp <= time.monotonic():
+            self._expires.pop(key, None)
+            return False
+        self.hits += 1
+        return True
+
+    def discard(self, key: str) -> None:
+        self._expires.pop(key, None)
+
+    def clear(self) -> None:
+        self._expires.clear()
+
+    def stats(self) -> dict:
+        return {"entries": len(self._expires), "hits": self.hits, "ttl_s": self._ttl}
+
+
+class ArtworkFreshness:
+    """Stale-while-revalidate bookkeeping for mutable cache keys (album__*, current, tokens).
+
+    Remembers the latest upstream artwork etag announced over SSE per key and,
+    per (key, size), when the cached bytes were last validated and against which
+    upstream etag. Pure bookkeeping on the event loop; callers do the fetching.
+    """
+
+    def __init__(self, fresh_s: int, max_entries: int = _SWR_MAX_ENTRIES) -> None:
+        self.fresh_s = max(0, int(fresh_s))
+        self._max_entries = max(1, int(max_entries))
+        self._latest: OrderedDict[str, str] = OrderedDict()
+        self._validated: OrderedDict[tuple[str, int | None], tuple[float, str | None]] = OrderedDict()
+        # Keys whose bytes changed at some size: other sizes validated earlier are stale
+        self._changed: OrderedDict[str, float] = OrderedDict()
+        self._pending: set[tuple[str, int | None]] = set()
+        self.fresh = 0
+        self.stale = {"age": 0, "etag": 0, "changed": 0}
+        self.revalidated = 0
+        self.updated = 0
+        self.failed = 0
+
+    def _trim(self, od: OrderedDict) -> None:
+        while len(od) > self._max_entries:
+            od.popitem(last=False)
+
+    def announce(self, key: str, etag: str) -> None:
+        """Latest upstream etag for key, as pushed by the Mac."""
+        self._latest[key] = etag
+        self._latest.move_to_end(key)
+        self._trim(self._latest)
+
+    def latest(self, key: str) -> str | None:
+        return self._latest.get(key)
+
+    def known(self, key: str, size: int | None) -> bool:
+        return (key, size) in self._validated
+
+    def validation(self, key: str, size: int | None) -> tuple[float, str | None] | None:
+        return self._validated.get((key, size))
+
+    def note_validated(self, key: str, size: int | None, ts: float | None, upstream: str | None) -> None:
+        self._validated[(key, size)] = (float(ts or 0), upstream)
+        self._validated.move_to_end((key, size))
+        self._trim(self._validated)
+
+    def note_changed(self, key: str, ts: float | None = None) -> None:
+        self._changed[key] = float(ts or time.time())
+        self._changed.move_to_end(key)
+        self._trim(self._changed)
+
+    def stale_reason(self, key: str, size: int | None, now: float | None = None) -> str | None:
+        """'etag', 'changed' or 'age' when key/size should be revalidated; None when fresh or unknown."""
+        v = self._validated.get((key, size))
+        if v is None:
+            return None
+        ts, upstream = v
+        latest = self._latest.get(key)
+        if latest and upstream != latest:
+            reason = "etag"
+        elif ts < self._changed.get(key, 0.0):
+            reason = "changed"
+        elif self.fresh_s and (now or time.time()) - ts > self.fresh_s:
+            reason = "age"
+        else:
+            self.fresh += 1
+            return None
+        self.stale[reason] += 1
+        return reason
+
+    def begin(self, key: str, size: int | None) -> bool:
+        """Claim the background revalidation of key/size; False when one is already running."""
+        if (key, size) in self._pending:
+            return False
+        self._pending.add((key, size))
+        return True
+
+    def end(self, key: str, size: int | None) -> None:
+        self._pending.discard((key, size))
+
+    def clear(self) -> None:
+        """Forget validations (announced upstream etags stay current)."""
+        self._validated.clear()
+        self._changed.clear()
+
+    def stats(self) -> dict:
+        return {
+            "fresh_s": self.fresh_s,
+            "tracked": len(self._validated),
+            "announced": len(self._latest),
+            "fresh": self.fresh,
+            "stale": dict(self.stale),
+            "pending": len(self._pending),
+            "revalidated": self.revalidated,
+            "updated": self.updated,
+            "failed": self.failed,
+        }
+
+
+class ArtworkPack:
+    """Append-only pack files for small thumbnails, read through mmap.
+
+    Thousands of tiny .bin files each cost an inode plus an open/read/close per
+    serve; packing them into a few large files turns a read into a slice of a
+    mapped region. Records are header + payload; deletes append a tombstone and
+    compact() rewrites the live records once enough dead bytes pile up.
+    Writes are serialized by a lock; reads of already-mapped records take none.
+    """
+
+    def __init__(self, directory: Path, max_size: int = PACK_MAX_THUMB) -> None:
+        self._dir = directory
+        self._max_size = max_size
+        self._lock = threading.Lock()
+        # (etag, size) -> (pack number, payload offset, payload length, unix time)
+        self._index: dict[tuple[str, int], tuple[int, int, int, int]] = {}
+        self._maps: dict[int, mmap.mmap] = {}
+        self._sizes: dict[int, int] = {}
+        self._writer = None
+        self._current = 0
+        self._live_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.compactions = 0
+        self.truncated = 0
+
+    def _path(self, number: int) -> Path:
+        return self._dir / f"pack-{number:06d}.amp"
+
+    def open(self) -> None:
+        """Create the directory and rebuild the index from the pack files (blocking).
+
+        A torn record at the end of a file (crash mid-append) is truncated away.
+        """
+        self._dir.mkdir(parents=True, exist_ok=True)
+        numbers = []
+        for entry in os.scandir(self._dir):
+            name = entry.name
+            if name.startswith("pack-") and name.endswith(".amp") and name[5:-4].isdigit():
+                numbers.append(int(name[5:-4]))
+        hsize = _PACK_HEADER.size
+        with self._lock:
+            for number in sorted(numbers):
+                path = self._path(number)
+                offset = 0
+                with open(path, "rb") as fh:
+                    end = os.fstat(fh.fileno()).st_size
+                    while offset + hsize <= end:
+                        magic, raw, size, length, ts, flags = _PACK_HEADER.unpack(fh.read(hsize))
+                        if magic != _PACK_MAGIC or offset + hsize + length > end:
+                            break
+                        key = (raw.hex(), size)
+                        old = self._index.pop(key, None)
+                        if old is not None:
+                            self._live_bytes -= hsize + old[2]
+                        if not flags & _PACK_TOMBSTONE:
+                            self._index[key] = (number, offset + hsize, length, ts)
+                            self._live_bytes += hsize + length
+                        offset += hsize + length
+                        fh.seek(offset)
+                if offset != end:
+                    os.truncate(path, offset)
+                    self.truncated += 1
+                self._sizes[number] = offset
+            self._current = max(numbers) if numbers else 0
+
+    def accepts(self, size: int | None) -> bool:
+        return size is not None and 0 < size <= self._max_size
+
+    def contains(self, etag: str, size: int | None) -> bool:
+        return (etag, size) in self._index
+
+    def _append(self, record: bytes) -> tuple[int, int]:
+        """Append one record to the current pack, rolling over when full (lock held)."""
+        if self._writer is None or self._sizes.get(self._current, 0) >= _PACK_ROLL_BYTES:
+            if self._writer is not None:
+                self._writer.close()
+            if self._current == 0 or self._sizes.get(self._current, 0) >= _PACK_ROLL_BYTES:
+                self._current += 1
+            self._writer = open(self._path(self._current), "ab", buffering=0)
+            self._sizes.setdefault(self._current, 0)
+        offset = self._sizes[self._current]
+        self._writer.write(record)
+        self._sizes[self._current] = offset + len(record)
+        return self._current, offset
+
+    def put(self, etag: str, size: int, data: bytes) -> None:
+        """Append a thumbnail unless it is already packed (blocking)."""
+        with self._lock:
+            if (etag, size) in self._index:
+                return
+            ts = int(time.time())
+            header = _PACK_HEADER.pack(_PACK_MAGIC, bytes.fromhex(etag), size, len(data), ts, 0)
+            number, offset = self._append(header + bytes(data))
+            self._index[(etag, size)] = (number, offset + len(header), len(data), ts)
+            self._live_bytes += len(header) + len(data)
+
+    def _map(self, number: int, end: int) -> mmap.mmap:
+        """Mapping of a pack covering at least end bytes; remaps after appends.
+
+        Superseded mappings are dropped rather than closed: memoryviews handed out
+        earlier keep them alive until the response that holds them is sent.
+        """
+        mapped = self._maps.get(number)
+        if mapped is not None and len(mapped) >= end:
+            return mapped
+        with self._lock:
+            mapped = self._maps.get(number)
+            if mapped is None or len(mapped) < end:
+                with open(self._path(number), "rb") as fh:
+                    mapped = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+                self._maps[number] = mapped
+            return mapped
+
+    def get(self, etag: str, size: int | None) -> memoryview | None:
+        """Zero-copy view of a packed thumbnail, or None."""
+        entry = self._index.get((etag, size))
+        if entry is None:
+            self.misses += 1
+            return None
+        number, offset, length, _ts = entry
+        try:
+            view = memoryview(self._map(number, offset + length))[offset : offset + length]
+        except (OSError, ValueError):
+            # Pack swapped out by a concurrent compaction
+            self.misses += 1
+            return None
+        self.hits += 1
+        return view
+
+    def delete(self, etag: str, size: int | None) -> int:
+        """Tombstone a packed thumbnail; returns the payload bytes freed (blocking)."""
+        with self._lock:
+            entry = self._index.pop((etag, size), None)
+            if entry is None:
+                return 0
+            header = _PACK_HEADER.pack(_PACK_MAGIC, bytes.fromhex(etag), size, 0, int(time.time()), _PACK_TOMBSTONE)
+            self._append(header)
+            self._live_bytes -= len(header) + entry[2]
+            return entry[2]
+
+    def entries(self) -> dict[tuple[str, int], tuple[int, int]]:
+        """Snapshot of live records: (etag, size) -> (bytes, unix time)."""
+        return {key: (e[2], e[3]) for key, e in list(self._index.items())}
+
+    def dead_ratio(self) -> float:
+        total = sum(self._sizes.values())
+        return (total - self._live_bytes) / total if total else 0.0
+
+    def needs_compaction(self) -> bool:
+        return sum(self._sizes.values()) >= _PACK_COMPACT_MIN_BYTES and self.dead_ratio() >= PACK_COMPACT_RATIO
+
+    def compact(self) -> int:
+        """Rewrite live records into fresh packs and drop the old ones (blocking).
+
+        Returns the bytes reclaimed.
+        """
+        with self._lock:
+            before = sum(self._sizes.values())
+            old_numbers = list(self._sizes)
+            old_maps = dict(self._maps)
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+            live = sorted(self._index.items(), key=lambda kv: (kv[1][0], kv[1][1]))
+            self._current = max(old_numbers, default=0) + 1
+            self._sizes = {self._current: 0}
+            self._maps = {}
+            self._writer = open(self._path(self._current), "ab", buffering=0)
+            index: dict[tuple[str, int], tuple[int, int, int, int]] = {}
+            hsize = _PACK_HEADER.size
+            for (etag, size), (number, offset, length, ts) in live:
+                mapped = old_maps.get(number)
+                if mapped is None or len(mapped) < offset + length:
+                    with open(self._path(number), "rb") as fh:
+                        mapped = old_maps[number] = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+                header = _PACK_HEADER.pack(_PACK_MAGIC, bytes.fromhex(etag), size, length, ts, 0)
+                new_number, new_offset = self._append(header + mapped[offset : offset + length])
+                index[(etag, size)] = (new_number, new_offset + hsize, length, ts)
+            self._index = index
+            self._live_bytes = sum(hsize + e[2] for e in index.values())
+            for number in old_numbers:
+                try:
+                    self._path(number).unlink()
+                except OSError:
+                    pass
+            self.compactions += 1
+            return max(0, before - sum(self._sizes.values()))
+
+    def clear(self) -> None:
+        """Drop every packed thumbnail and remove the pack files (blocking)."""
+        with self._lock:
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+            for number in list(self._sizes):
+                try:
+                    self._path(number).unlink()
+                except OSError:
+                    pass
+            self._index = {}
+            self._maps = {}
+            self._sizes = {}
+            self._current = 0
+            self._live_bytes = 0
+            self._dir.mkdir(parents=True, exist_ok=True)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+            self._maps = {}
+
+    def stats(self) -> dict:
+        return {
+            "files": len(self._sizes),
+            "entries": len(self._index),
+            "live_bytes": self._live_bytes,
+            "total_bytes": sum(self._sizes.values()),
+            "dead_ratio": round(self.dead_ratio(), 3),
+            "max_size": self._max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "compactions": self.compactions,
+            "truncated": self.truncated,
+        }
+
+
+class SingleFlight:
+    """Coalesce concurrent calls that share a key onto one in-flight task.
+
+    The first caller starts the work as a task; later callers await the same
+    task and receive the same result. The task is shielded, so a client that
+    disconnects does not cancel the fetch for everyone else.
+    """
+
+    def __init__(self) -> None:
+        self._inflight: dict[Hashable, asyncio.Future] = {}
+        self.started = 0
+        self.coalesced = 0
+
+    def in_flight(self, key: Hashable) -> bool:
+        return key in self._inflight
+
+    async def run(self, key: Hashable, factory: Callable[[], Awaitable[Any]]) -> Any:
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(factory())
+            self._inflight[key] = task
+            self.started += 1
+
+            def _done(t: asyncio.Future, k: Hashable = key) -> None:
+                if self._inflight.get(k) is t:
+                    self._inflight.pop(k, None)
+                # Retrieve the exception so an unawaited failure is not logged as lost
+                if not t.cancelled():
+                    t.exception()
+
+            task.add_done_callback(_done)
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+
+    def stats(self) -> dict:
+        return {
+            "in_flight": len(self._inflight),
+            "started": self.started,
+            "coalesced": self.coalesced,
+        }
+
+
+class ArtworkCatalog:
+    """SQLite (WAL) index of cached artwork keyed by (kind, name, size).
+
+    Each row maps a cache key to the content hash of a blob in the
+    content-addressed store, with its content type, byte length and timestamps.
+    Full-size artwork is stored with size 0. Methods block; run them in the executor.
+    """
+
+    def __init__(self, path: str) -> None:
+        self._path = path
+        self._conn: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+        # Last-served times, buffered in memory and flushed by the janitor
+        self._access: dict[tuple[str, int], int] = {}
+
+    def open(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                return
+            Path(self._path).parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self._path, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS artwork ("
+                " kind TEXT NOT NULL, name TEXT NOT NULL, size INTEGER NOT NULL,"
+                " hash TEXT NOT NULL, content_type TEXT, bytes INTEGER,"
+                " created INTEGER NOT NULL, updated INTEGER NOT NULL,"
+                " PRIMARY KEY (kind, name, size))"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS artwork_hash ON artwork (hash, size)")
+            # When the row's bytes were last confirmed current, and the upstream (SSE) etag they match
+            cols = {r[1] for r in conn.execute("PRAGMA table_info(artwork)")}
+            if "validated" not in cols:
+                conn.execute("ALTER TABLE artwork ADD COLUMN validated INTEGER")
+            if "upstream" not in cols:
+                conn.execute("ALTER TABLE artwork ADD COLUMN upstream TEXT")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS blobs ("
+                " hash TEXT NOT NULL, size INTEGER NOT NULL, bytes INTEGER NOT NULL,"
+                " created INTEGER NOT NULL, last_access INTEGER NOT NULL,"
+                " PRIMARY KEY (hash, size))"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS blobs_lru ON blobs (last_access)")
+            # Per-hash colour summary / placeholders (see summarize_artwork)
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS summaries ("
+                " hash TEXT PRIMARY KEY, summary TEXT NOT NULL, created INTEGER NOT NULL)"
+            )
+            self._conn = conn
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def lookup(self, keys: list[tuple[str, str, int | None]]) -> list[dict]:
+        """Return the rows matching any of keys, in the order keys were given."""
+        if not keys or self._conn is None:
+            return []
+        where = " OR ".join(["(kind=? AND name=? AND size=?)"] * len(keys))
+        args: list[Any] = []
+        for kind, name, size in keys:
+            args.extend((kind, name, size or 0))
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT kind, name, size, hash, content_type, bytes, created, updated, validated, upstream"
+                f" FROM artwork WHERE {where}",
+                args,
+            ).fetchall()
+        found = {(r[0], r[1], r[2]): r for r in rows}
+        out = []
+        for kind, name, size in keys:
+            r = found.get((kind, name, size or 0))
+            if r is not None:
+                out.append({
+                    "kind": r[0], "name": r[1], "size": (r[2] or None),
+                    "hash": r[3], "content_type": r[4], "bytes": r[5],
+                    "created": r[6], "updated": r[7], "validated": r[8], "upstream": r[9],
+                })
+        return out
+
+    def upsert(
+        self, kind: str, name: str, size: int | None, etag: str,
+        ctype: str | None, nbytes: int | None, ts: int | None = None,
+    ) -> str | None:
+        """Point (kind, name, size) at etag; return the hash it pointed at before."""
+        if self._conn is None:
+            return None
+        now = int(ts or time.time())
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT hash FROM artwork WHERE kind=? AND name=? AND size=?",
+                (kind, name, size or 0),
+            ).fetchone()
+            self._conn.execute(
+                "INSERT INTO artwork (kind, name, size, hash, content_type, bytes, created, updated)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+                " ON CONFLICT (kind, name, size) DO UPDATE SET"
+                # 'updated' is the key's Last-Modified: only move it when the content changes
+                " updated=CASE WHEN hash=excluded.hash THEN updated ELSE excluded.updated END,"
+                " hash=excluded.hash, content_type=excluded.content_type,"
+                " bytes=COALESCE(excluded.bytes, bytes)",
+                (kind, name, size or 0, etag, ctype, nbytes, now, now),
+            )
+        return row[0] if row else None
+
+    def rows_for_kind(self, kind: str) -> list[dict]:
+        """Every row of one key kind (name, size, hash, upstream), for bulk validation."""
+        if self._conn is None:
+            return []
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT name, size, hash, upstream FROM artwork WHERE kind=?", (kind,)
+            ).fetchall()
+        return [{"name": r[0], "size": r[1] or None, "hash": r[2], "upstream": r[3]} for r in rows]
+
+    def mark_validated(
+        self, kind: str, name: str, size: int | None, upstream: str | None, ts: int | None = None,
+    ) -> None:
+        """Record that (kind, name, size) was confirmed current at ts against the upstream etag."""
+        if self._conn is None:
+            return
+        with self._lock:
+            self._conn.execute(
+                "UPDATE artwork SET validated=?, upstream=? WHERE kind=? AND name=? AND size=?",
+                (int(ts or time.time()), upstream, kind, name, size or 0),
+            )
+
+    def is_referenced(self, etag: str, size: int | None) -> bool:
+        if self._conn is None:
+            return False
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM artwork WHERE hash=? AND size=? LIMIT 1", (etag, size or 0)
+            ).fetchone()
+        return row is not None
+
+    def delete(self, kind: str, name: str, size: int | None) -> None:
+        if self._conn is None:
+            return
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM artwork WHERE kind=? AND name=? AND size=?", (kind, name, size or 0)
+            )
+
+    def clear(self, thumbs_only: bool = False) -> None:
+        if self._conn is None:
+            return
+        with self._lock:
+            if thumbs_only:
+                self._conn.execute("DELETE FROM artwork WHERE size > 0")
+                self._conn.execute("DELETE FROM blobs WHERE size > 0")
+            else:
+                self._conn.execute("DELETE FROM artwork")
+                self._conn.execute("DELETE FROM blobs")
+                self._conn.execute("DELETE FROM summaries")
+
+    def note_access(self, etag: str, size: int | None) -> None:
+        """Record that a blob was served (cheap, no I/O; safe on the event loop)."""
+        self._access[(etag, size or 0)] = int(time.time())
+
+    def flush_access(self) -> None:
+        """Persist buffered last-access times."""
+        pending, self._access = self._access, {}
+        if not pending or self._conn is None:
+            return
+        with self._lock:
+            self._conn.executemany(
+                "UPDATE blobs SET last_access=MAX(last_access, ?) WHERE hash=? AND size=?",
+                [(ts, etag, size) for (etag, size), ts in pending.items()],
+            )
+
+    def add_blob(self, etag: str, size: int | None, nbytes: int) -> None:
+        if self._conn is None:
+            return
+        now = int(time.time())
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO blobs (hash, size, bytes, created, last_access) VALUES (?, ?, ?, ?, ?)"
+                " ON CONFLICT (hash, size) DO UPDATE SET bytes=excluded.bytes, last_access=excluded.last_access",
+                (etag, size or 0, nbytes, now, now),
+            )
+
+    def drop_blob(self, etag: str, size: int | None) -> None:
+        if self._conn is None:
+            return
+        with self._lock:
+            self._conn.execute("DELETE FROM blobs WHERE hash=? AND size=?", (etag, size or 0))
+
+    def sync_blobs(self, on_disk: dict[tuple[str, int | None], tuple[int, int]]) -> None:
+        """Reconcile the blobs table with files found on disk ({(hash, size): (bytes, mtime)})."""
+        if self._conn is None:
+            return
+        with self._lock:
+            known = {(r[0], r[1]) for r in self._conn.execute("SELECT hash, size FROM blobs")}
+            present = {(etag, size or 0): v for (etag, size), v in on_disk.items()}
+            missing = [k for k in known if k not in present]
+            new = [(k[0], k[1], v[0], v[1], v[1]) for k, v in present.items() if k not in known]
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany("DELETE FROM blobs WHERE hash=? AND size=?", missing)
+                self._conn.executemany(
+                    "INSERT INTO blobs (hash, size, bytes, created, last_access) VALUES (?, ?, ?, ?, ?)", new
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def get_summary(self, etag: str) -> dict | None:
+        if self._conn is None:
+            return None
+        with self._lock:
+            row = self._conn.execute("SELECT summary FROM summaries WHERE hash=?", (etag,)).fetchone()
+        try:
+            return json.loads(row[0]) if row else None
+        except ValueError:
+            return None
+
+    def put_summary(self, etag: str, summary: dict) -> None:
+        if self._conn is None:
+            return
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO summaries (hash, summary, created) VALUES (?, ?, ?)",
+                (etag, json.dumps(summary, separators=(",", ":")), int(time.time())),
+            )
+
+    def prune_summaries(self) -> int:
+        """Drop summaries for hashes with no blob left at any size."""
+        if self._conn is None:
+            return 0
+        with self._lock:
+            cur = self._conn.execute(
+                "DELETE FROM summaries WHERE NOT EXISTS (SELECT 1 FROM blobs b WHERE b.hash=summaries.hash)"
+            )
+        return cur.rowcount or 0
+
+    def orphan_blobs(self, older_than: int) -> list[tuple[str, int | None]]:
+        """Blobs that no catalog key references and that were not served recently."""
+        if self._conn is None:
+            return []
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT b.hash, b.size FROM blobs b WHERE b.last_access < ? AND NOT EXISTS"
+                " (SELECT 1 FROM artwork a WHERE a.hash=b.hash AND a.size=b.size)",
+                (older_than,),
+            ).fetchall()
+        return [(r[0], r[1] or None) for r in rows]
+
+    def blobs_by_last_access(self) -> list[tuple[str, int | None]]:
+        """All blobs, least recently served first."""
+        if self._conn is None:
+            return []
+        with self._lock:
+            rows = self._conn.execute("SELECT hash, size FROM blobs ORDER BY last_access ASC").fetchall()
+        return [(r[0], r[1] or None) for r in rows]
+
+    def migrate_from_json(self, thumb_dir: Path, full_dir: Path) -> int:
+        """Import the legacy per-key JSON metas once, then remove them.
+
+        Legacy direct files (<key>[.<size>].bin) are renamed to their canonical
+        content-addressed name on the way. Returns the number of imported rows.
+        """
+        if self._conn is None:
+            return 0
+        with self._lock:
+            version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+        if version >= _CATALOG_VERSION:
+            return 0
+        imported = 0
+        for directory, is_thumb in ((thumb_dir, True), (full_dir, False)):
+            try:
+                metas = [p for p in directory.iterdir() if p.suffix == ".json"]
+            except OSError:
+                continue
+            for meta_file in metas:
+                stem = meta_file.name[: -len(".json")]
+                size: int | None = None
+                if is_thumb:
+                    head, _, tail = stem.rpartition(".")
+                    if not head or not tail.isdigit():
+                        continue
+                    stem, size = head, int(tail)
+                try:
+                    with open(meta_file, "r", encoding="utf-8") as mf:
+                        m = json.load(mf)
+                except Exception:
+                    m = {}
+                etag = m.get("hash") or m.get("etag")
+                nbytes = None
+                legacy = directory / (f"{stem}.{size}.bin" if is_thumb else f"{stem}.bin")
+                try:
+                    if legacy.is_file():
+                        with open(legacy, "rb") as f:
+                            data = f.read()
+                        etag = etag or hashlib.sha1(data).hexdigest()
+                        canon = blob_path(thumb_dir, full_dir, etag, size)
+                        if canon.is_file():
+                            legacy.unlink()
+                        else:
+                            os.replace(legacy, canon)
+                    if etag:
+                        canon = blob_path(thumb_dir, full_dir, etag, size)
+                        nbytes = canon.stat().st_size if canon.is_file() else None
+                except Exception:
+                    pass
+                if etag:
+                    kind, name = split_cache_key(stem)
+                    self.upsert(kind, name, size, etag, m.get("content_type"), nbytes, m.get("ts"))
+                    imported += 1
+                try:
+                    meta_file.unlink()
+                except OSError:
+                    pass
+        with self._lock:
+            self._conn.execute(f"PRAGMA user_version={_CATALOG_VERSION}")
+        return imported
@@ -9,7 +9,8 @@ from homeassistant import config_entries
 from homeassistant.const import CONF_HOST, CONF_PORT
 from homeassistant.data_entry_flow import FlowResult
 
-from .const import DOMAIN, CONF_SHOW_PANEL
+from .const import DOMAIN, CONF_SHOW_PANEL, CONF_ARTWORK_MEMORY_MB, CONF_ARTWORK_DISK_MB, CONF_ARTWORK_FRESH_MIN, CONF_ARTWORK_PACK
+from .artwork import DEFAULT_ARTWORK_MEMORY_MB, DEFAULT_ARTWORK_DISK_MB, DEFAULT_ARTWORK_FRESH_MIN
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -59,12 +60,20 @@ class AppleMusicOptionsFlow(config_entries.OptionsFlow):
             CONF_PORT, self._entry.data.get(CONF_PORT, 7766)
         )
         current_show = self._entry.options.get(CONF_SHOW_PANEL, True)
+        current_mem = self._entry.options.get(CONF_ARTWORK_MEMORY_MB, DEFAULT_ARTWORK_MEMORY_MB)
+        current_disk = self._entry.options.get(CONF_ARTWORK_DISK_MB, DEFAULT_ARTWORK_DISK_MB)
+        current_fresh = self._entry.options.get(CONF_ARTWORK_FRESH_MIN, DEFAULT_ARTWORK_FRESH_MIN)
+        current_pack = self._entry.options.get(CONF_ARTWORK_PACK, False)
 
         schema = vol.Schema(
             {
                 vol.Required(CONF_HOST, default=current_host): str,
                 vol.Required(CONF_PORT, default=current_port): int,
                 vol.Required(CONF_SHOW_PANEL, default=current_show): bool,
+                vol.Required(CONF_ARTWORK_MEMORY_MB, default=current_mem): vol.All(int, vol.Range(min=0, max=1024)),
+                vol.Required(CONF_ARTWORK_DISK_MB, default=current_disk): vol.All(int, vol.Range(min=0, max=65536)),
+                vol.Required(CONF_ARTWORK_FRESH_MIN, default=current_fresh): vol.All(int, vol.Range(min=0, max=525600)),
+                vol.Required(CONF_ARTWORK_PACK, default=current_pack): bool,
             }
         )
 
@@ -3,6 +3,10 @@ DOMAIN = "apple_music_controller"
 CONF_HOST = "host"
 CONF_PORT = "port"
 CONF_SHOW_PANEL = "show_panel"
+CONF_ARTWORK_MEMORY_MB = "artwork_memory_mb"
+CONF_ARTWORK_DISK_MB = "artwork_disk_mb"
+CONF_ARTWORK_FRESH_MIN = "artwork_fresh_minutes"
+CONF_ARTWORK_PACK = "artwork_pack_thumbs"
 
 SERVICE_PLAY = "play"
 SERVICE_PAUSE = "pause"
@@ -1320,9 +1320,7 @@ export class MusicControllerPanel extends HTMLElement {
     _poll(force = false) {
         if (!this._hass)
             return;
-        const calls = [];
-        // Always try to keep shuffle/state fresh
-        calls.push(this._hass.callApi('GET', 'apple_music/status').then((st) => {
+        const applyStatus = (st) => {
             var _a, _b, _c;
             if (!st)
                 return;
@@ -1344,17 +1342,37 @@ export class MusicControllerPanel extends HTMLElement {
                     this._updateVolumeFromSSE(st.master);
             }
             catch (_) { }
-        }).catch(() => { }));
+        };
+        const applyAirplay = (list) => {
+            if (Array.isArray(list))
+                this._updateDevicesFromSSE(list);
+        };
+        // Always try to keep shuffle/state fresh
+        const items = [{ path: '/status', apply: applyStatus }];
         // Redundant individual GET calls removed - full status includes these with protection
         // If forcing or SSE isn't healthy, fetch AirPlay snapshot
         if (force || !this._sseHealthy || !this._preferWS) {
-            calls.push(this._hass.callApi('GET', 'apple_music/airplay_full').then((list) => {
-                if (Array.isArray(list))
-                    this._updateDevicesFromSSE(list);
-            }).catch(() => { }));
-        }
-        // No need to wait; fire-and-forget
-        Promise.all(calls).catch(() => { });
+            items.push({ path: '/airplay_full', apply: applyAirplay });
+        }
+        // One round trip through the batch endpoint; fire-and-forget
+        this._hass.callApi('POST', 'apple_music/batch', { requests: items.map((i) => ({ method: 'GET', path: i.path })) })
+            .then((results) => {
+            items.forEach((item, idx) => {
+                const r = Array.isArray(results) ? results[idx] : null;
+                if (r && r.ok) {
+                    try {
+                        item.apply(r.body);
+                    }
+                    catch (_) { }
+                }
+            });
+        })
+            .catch(() => {
+            // Fall back to one call per item
+            items.forEach((item) => {
+                this._hass.callApi('GET', `apple_music${item.path}`).then(item.apply).catch(() => { });
+            });
+        });
     }
     _toggleShuffle() {
         var _a, _b;
@@ -291,18 +291,12 @@ class MusicNowPlayingCard extends HTMLElement {
         }
     }
     async _fetchAndCacheArt(tok) {
-        const path = `/api/apple_music/artwork?tok=${encodeURIComponent(tok)}&size=256&t=${Date.now()}`;
-        const url = await this._signedPath(path).catch(() => path);
+        // Stable per-track URL served as immutable: let the browser's HTTP cache answer repeats.
+        // The artwork endpoint needs no auth, so no signature (it would change the URL every call).
+        const url = `/api/apple_music/artwork?tok=${encodeURIComponent(tok)}&size=256`;
         let resp = null;
         try {
-            resp = await fetch(url, {
-                cache: 'no-store',
-                credentials: 'same-origin',
-                headers: {
-                    'Cache-Control': 'no-cache, no-store, must-revalidate',
-                    'Pragma': 'no-cache'
-                }
-            });
+            resp = await fetch(url, { credentials: 'same-origin' });
         }
         catch (_) {
             resp = null;
@@ -1152,9 +1152,7 @@ export class MusicControllerPanel extends HTMLElement {
 
   _poll(force = false): void {
     if (!this._hass) return;
-    const calls: Promise<any>[] = [];
-    // Always try to keep shuffle/state fresh
-    calls.push(this._hass.callApi('GET', 'apple_music/status').then((st: any) => {
+    const applyStatus = (st: any) => {
       if (!st) return;
       // Protect shuffle/repeat from overwriting if user recently changed them
       const now = Date.now();
@@ -1170,16 +1168,31 @@ export class MusicControllerPanel extends HTMLElement {
       this._updateRepeatButtonVisual?.();
       this._updateFromHass?.();
       try { if (typeof st?.master === 'number') this._updateVolumeFromSSE(st.master); } catch (_) { }
-    }).catch(() => { }));
+    };
+    const applyAirplay = (list: any) => {
+      if (Array.isArray(list)) this._updateDevicesFromSSE(list);
+    };
+    // Always try to keep shuffle/state fresh
+    const items: Array<{ path: string; apply: (body: any) => void }> = [{ path: '/status', apply: applyStatus }];
     // Redundant individual GET calls removed - full status includes these with protection
     // If forcing or SSE isn't healthy, fetch AirPlay snapshot
     if (force || !this._sseHealthy || !this._preferWS) {
-      calls.push(this._hass.callApi('GET', 'apple_music/airplay_full').then((list: any) => {
-        if (Array.isArray(list)) this._updateDevicesFromSSE(list);
-      }).catch(() => { }));
+      items.push({ path: '/airplay_full', apply: applyAirplay });
     }
-    // No need to wait; fire-and-forget
-    Promise.all(calls).catch(() => { });
+    // One round trip through the batch endpoint; fire-and-forget
+    this._hass.callApi('POST', 'apple_music/batch', { requests: items.map((i) => ({ method: 'GET', path: i.path })) })
+      .then((results: any) => {
+        items.forEach((item, idx) => {
+          const r = Array.isArray(results) ? results[idx] : null;
+          if (r && r.ok) { try { item.apply(r.body); } catch (_) { } }
+        });
+      })
+      .catch(() => {
+        // Fall back to one call per item
+        items.forEach((item) => {
+          this._hass.callApi('GET', `apple_music${item.path}`).then(item.apply).catch(() => { });
+        });
+      });
   }
 
   _toggleShuffle(): void {
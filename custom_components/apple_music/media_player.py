@@ -1,13 +1,13 @@
 """Support for Apple Music media player."""
 from __future__ import annotations
 import asyncio
+import aiohttp
 
 import logging
 from async_timeout import timeout
 from urllib.parse import quote
 from pathlib import Path
 import json
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from typing import Any
 import time
 import hashlib
@@ -37,6 +37,7 @@ import voluptuous as vol
 from homeassistant.helpers import config_validation as cv
 
 from .const import DOMAIN
+from .utils import upstream_session
 from homeassistant.util import slugify
 
 _LOGGER = logging.getLogger(__name__)
@@ -209,6 +210,9 @@ async def async_setup_entry(
 class AppleMusicPlayer(MediaPlayerEntity):
     """Representation of Apple Music media player."""
 
+    # Per-track artwork placeholders are for live clients only; keep them out of the recorder
+    _unrecorded_attributes = frozenset({"artwork_palette", "artwork_blurhash", "artwork_lqip"})
+
     def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
         """Initialize the Apple Music player."""
         self._entry = entry
@@ -234,7 +238,6 @@ class AppleMusicPlayer(MediaPlayerEntity):
             manufacturer="Apple",
             model="Music + AirPlay",
         )
-        self._session = async_get_clientsession(hass)
         # Switch to push-driven updates via SSE; HA will not poll this entity.
         self._attr_should_poll = False
         # Now Playing attributes
@@ -264,11 +267,14 @@ class AppleMusicPlayer(MediaPlayerEntity):
             | MediaPlayerEntityFeature.REPEAT_SET
             | MediaPlayerEntityFeature.SHUFFLE_SET
         )
-        # Resiliency cache for artwork
-        self._last_art_bytes: bytes | None = None
+        # Last good artwork, as a reference (etag at 512px) into the shared artwork cache
+        self._last_art_etag: str | None = None
+        self._last_art_nbytes: int | None = None
         self._last_art_ctype: str | None = None
         # Latest artwork token provided by SSE (set by integration)
         self._last_artwork_token: str | None = None
+        # Colour summary / placeholders of the published artwork (set by integration)
+        self._artwork_summary: dict | None = None
         # Track the token used for the cache, and whether fallback was served
         self._artwork_token_seen: str | None = None
         self._artwork_last_fallback_used: bool = False
@@ -380,6 +386,11 @@ class AppleMusicPlayer(MediaPlayerEntity):
             except Exception:
                 pass
 
+    @property
+    def _session(self) -> aiohttp.ClientSession:
+        """This entry's upstream pool, looked up per call so a reload never leaves it closed."""
+        return upstream_session(self.hass, entry_id=self._entry.entry_id)
+
     @property
     def suggested_object_id(self) -> str:
         # Enforce media_player.music_control_player for new setups
@@ -419,10 +430,10 @@ class AppleMusicPlayer(MediaPlayerEntity):
                 else:
                     continue
 
-                # Build a thumbnail URL directly from the controller (fast and stable)
+                # Thumbnails go through the HA-side artwork cache (warmable via warm_artwork_cache)
                 thumb = None
                 if mclass is MediaClass.ALBUM:
-                    thumb = f"{self._base_url}/artwork_album_thumb/128/{quote(title)}"
+                    thumb = f"/api/apple_music/artwork?album={quote(title)}&size=128"
 
                 # By default, search results should be expandable for containers and playable for tracks
                 can_expand = mclass in (MediaClass.ALBUM, MediaClass.ARTIST, MediaClass.PLAYLIST)
@@ -551,9 +562,14 @@ class AppleMusicPlayer(MediaPlayerEntity):
             "group_members": self.group_members,
             # Artwork debug attributes
             "artwork_token": getattr(self, "_last_artwork_token", None),
-            "artwork_last_good_size": (len(self._last_art_bytes) if isinstance(self._last_art_bytes, (bytes, bytearray)) else None),
+            "artwork_last_good_size": self._last_art_nbytes,
             "artwork_last_good_ctype": self._last_art_ctype,
             "artwork_used_fallback": self._artwork_last_fallback_used,
+            "artwork_color": (self._artwork_summary or {}).get("color"),
+            "artwork_average_color": (self._artwork_summary or {}).get("average"),
+            "artwork_palette": (self._artwork_summary or {}).get("palette"),
+            "artwork_blurhash": (self._artwork_summary or {}).get("blurhash"),
+            "artwork_lqip": (self._artwork_summary or {}).get("lqip"),
         }
 
     @property
@@ -668,7 +684,7 @@ class AppleMusicPlayer(MediaPlayerEntity):
                         media_content_type="library",
                         can_play=False,
                         can_expand=True,
-                        thumbnail=f"{self._base_url}/artwork_album_thumb/128/{quote(a)}",
+                        thumbnail=f"/api/apple_music/artwork?album={quote(a)}&size=128",
                     )
                     for a in self._albums
                 ]
@@ -726,10 +742,16 @@ class AppleMusicPlayer(MediaPlayerEntity):
                 ]
             elif media_content_id.startswith("album:"):
                 album = media_content_id.replace("album:", "")
-                async with timeout(10):
-                    async with self._session.get(f"{self._base_url}/songs_by_album/{quote(album)}") as resp:
-                        resp.raise_for_status()
-                        songs = await resp.json()
+                # Track lists may already have been pulled in by the next-track prefetcher
+                tracks_cache = self.hass.data.get(DOMAIN, {}).get("album_tracks")
+                songs = tracks_cache.get(album) if tracks_cache is not None else None
+                if songs is None:
+                    async with timeout(10):
+                        async with self._session.get(f"{self._base_url}/songs_by_album/{quote(album)}") as resp:
+                            resp.raise_for_status()
+                            songs = await resp.json()
+                    if tracks_cache is not None:
+                        tracks_cache.put(album, songs)
                 children = [
                     BrowseMedia(
                         title="Play album",
@@ -799,7 +821,7 @@ class AppleMusicPlayer(MediaPlayerEntity):
                         media_content_type="library",
                         can_play=False,
                         can_expand=True,
-                        thumbnail=f"{self._base_url}/artwork_album_thumb/128/{quote(a)}",
+                        thumbnail=f"/api/apple_music/artwork?album={quote(a)}&size=128",
                     )
                     for a in albums
                 ]
@@ -1132,42 +1154,33 @@ class AppleMusicPlayer(MediaPlayerEntity):
     async def async_get_media_image(self) -> tuple[bytes | None, str | None]:
         """Return current album art as (bytes, content_type).
 
-        Fetch artwork directly to avoid HA's media player proxy.
+        Served from the integration's shared artwork cache (memory, disk, single-flighted
+        fetch) so HA's media player proxy, cloud and voice surfaces rarely reach the Mac.
         """
+        from . import _async_get_artwork
+
         try:
-            # Build URL similar to async_get_media_image_url
-            base = "/api/apple_music/artwork"
             tok = getattr(self, "_last_artwork_token", "") or ""
             album = getattr(self, "_attr_media_album_name", "") or ""
-
-            # Prefer album-based if available, since our fix makes this work
-            if album:
-                url = f"http://{self._host}:{self._port}/artwork_album_thumb/512/{quote(album)}"
-            else:
-                url = f"http://{self._host}:{self._port}/artwork"
-                if tok:
-                    url += f"?tok={quote(tok)}&size=512"
-                else:
-                    url += "?size=512"
-
-            async with timeout(10):
-                async with self._session.get(url) as response:
-                    if response.status == 200:
-                        data = await response.read()
-                        ctype = response.headers.get("Content-Type") or response.headers.get("content-type") or "image/jpeg"
-                        # Cache in memory for resiliency
-                        if isinstance(data, bytes) and len(data) > 100:  # Valid image
-                            self._last_art_bytes = data
-                            self._last_art_ctype = ctype
-                        return data, ctype
-                    else:
-                        _LOGGER.debug("Artwork fetch failed: HTTP %s", response.status)
+            got = await _async_get_artwork(self.hass, 512, album=album or None, token=tok or None)
+            if got:
+                data, ctype, etag = got
+                # Keep a reference into the bounded cache rather than a private copy
+                self._last_art_etag = etag
+                self._last_art_nbytes = len(data)
+                self._last_art_ctype = ctype
+                self._artwork_last_fallback_used = False
+                return data, ctype
         except Exception as e:
             _LOGGER.debug("async_get_media_image failed: %s", e)
 
-        # Fallback to cache if available
-        if self._last_art_bytes:
-            return self._last_art_bytes, self._last_art_ctype or "image/jpeg"
+        # Fall back to the last good image while the cache still holds it
+        mem = self.hass.data.get(DOMAIN, {}).get("artwork_mem")
+        if self._last_art_etag and mem is not None:
+            blob = mem.get_blob(self._last_art_etag, 512)
+            if blob:
+                self._artwork_last_fallback_used = True
+                return blob[0], blob[1]
 
         return None, None
 
@@ -1377,8 +1390,6 @@ class AppleMusicPlayer(MediaPlayerEntity):
                     params.append(f"tok={quote(tok)}")
                 # Use 256px thumbnail to leverage HA cache and reduce payload (align with SSE warm size)
                 params.append("size=256")
-                # Add timestamp to ensure fresh artwork fetch
-                params.append(f"t={int(time.time())}")
                 if self._attr_media_image_hash:
                     params.append(f"cache={self._attr_media_image_hash}")
                 url = base + ("?" + "&".join(params) if params else "")
@@ -1421,10 +1432,14 @@ class AppleMusicAirPlayPlayer(MediaPlayerEntity):
         self._attr_shuffle = False
         # States to sync from server
         self._server_state = None
-        self._session = async_get_clientsession(hass)
         # Disable polling; rely on SSE events
         self._attr_should_poll = False
 
+    @property
+    def _session(self) -> aiohttp.ClientSession:
+        """This entry's upstream pool, looked up per call so a reload never leaves it closed."""
+        return upstream_session(self._hass, entry_id=self._entry.entry_id)
+
     async def async_added_to_hass(self) -> None:
         """Update status when added."""
         await self.async_update()
@@ -1550,15 +1565,13 @@ class AppleMusicAirPlayPlayer(MediaPlayerEntity):
     async def _call_api(self, method: str, path: str, data: dict | None = None) -> bool:
         """Call server API and return success."""
         try:
-            import aiohttp
             url = f"{self._base_url}{path}"
-            async with aiohttp.ClientSession() as session:
-                func = getattr(session, method.lower())
-                kwargs = {"url": url}
-                if data:
-                    kwargs["json"] = data
-                async with func(**kwargs) as resp:
-                    return resp.status == 200
+            func = getattr(self._session, method.lower())
+            kwargs = {"url": url}
+            if data:
+                kwargs["json"] = data
+            async with func(**kwargs) as resp:
+                return resp.status == 200
         except Exception as e:  # pragma: no cover
             _LOGGER.debug("API call failed %s %s: %s", method, path, e)
             return False
@@ -1,11 +1,23 @@
 """Utility functions for Apple Music integration."""
 import re
 from typing import Any
+import aiohttp
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from homeassistant.core import HomeAssistant
 import asyncio
+from collections import OrderedDict
+import time
 from async_timeout import timeout
 
+from .const import DOMAIN
+
+# Upstream pools to the Mac: short REST calls share a small keep-alive pool, while
+# long-lived /events streams (one per browser tab plus the runner) get their own
+UPSTREAM_REST_LIMIT = 8
+UPSTREAM_STREAM_LIMIT = 16
+UPSTREAM_KEEPALIVE_S = 30
+UPSTREAM_DNS_TTL_S = 300
+
 
 def _sanitize(name: str | None) -> str:
     """Sanitize a name for use in filenames."""
@@ -19,10 +31,287 @@ def _sanitize(name: str | None) -> str:
     return s[:120] if len(s) > 120 else (s or "current")
 
 
+class UpstreamClient:
+    """Dedicated aiohttp sessions for one controller: pooled REST, plus a separate pool for streams.
+
+    Kept off HA's shared session so other integrations, and SSE connections that stay
+    open for hours, never hold the connections short REST calls need. aiohttp already
+    sets TCP_NODELAY on every connection; the connectors add keep-alive, a bounded
+    pool and a DNS cache. Sessions are created lazily on the event loop.
+    """
+
+    def __init__(self) -> None:
+        self._sessions: dict[str, aiohttp.ClientSession] = {}
+        self._counters = {
+            pool: {"requests": 0, "created": 0, "reused": 0, "queued": 0} for pool in ("rest", "stream")
+        }
+
+    def _trace(self, pool: str) -> aiohttp.TraceConfig:
+        counters = self._counters[pool]
+        trace = aiohttp.TraceConfig()
+
+        async def _on_request(_session, _ctx, _params) -> None:
+            counters["requests"] += 1
+
+        async def _on_create(_session, _ctx, _params) -> None:
+            counters["created"] += 1
+
+        async def _on_reuse(_session, _ctx, _params) -> None:
+            counters["reused"] += 1
+
+        async def _on_queued(_session, _ctx, _params) -> None:
+            # The pool was at its limit: this request waited for a connection
+            counters["queued"] += 1
+        trace.on_request_start.append(_on_request)
+        trace.on_connection_create_end.append(_on_create)
+        trace.on_connection_reuseconn.append(_on_reuse)
+        trace.on_connection_queued_start.append(_on_queued)
+        return trace
+
+    def _session(self, pool: str) -> aiohttp.ClientSession:
+        session = self._sessions.get(pool)
+        if session is None or session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=UPSTREAM_STREAM_LIMIT if pool == "stream" else UPSTREAM_REST_LIMIT,
+                keepalive_timeout=UPSTREAM_KEEPALIVE_S,
+                use_dns_cache=True,
+                ttl_dns_cache=UPSTREAM_DNS_TTL_S,
+            )
+            session = aiohttp.ClientSession(connector=connector, trace_configs=[self._trace(pool)])
+            self._sessions[pool] = session
+        return session
+
+    @property
+    def rest(self) -> aiohttp.ClientSession:
+        return self._session("rest")
+
+    @property
+    def stream(self) -> aiohttp.ClientSession:
+        return self._session("stream")
+
+    async def close(self) -> None:
+        for session in list(self._sessions.values()):
+            try:
+                await session.close()
+            except Exception:
+                pass
+        self._sessions.clear()
+
+    def stats(self) -> dict:
+        out: dict[str, dict] = {}
+        for pool, counters in self._counters.items():
+            entry: dict[str, Any] = dict(counters)
+            acquired = counters["created"] + counters["reused"]
+            entry["acquired"] = acquired
+            entry["reuse_ratio"] = (counters["reused"] / acquired) if acquired else None
+            entry["limit"] = UPSTREAM_STREAM_LIMIT if pool == "stream" else UPSTREAM_REST_LIMIT
+            out[pool] = entry
+        return out
+
+
+def upstream_client(hass: HomeAssistant, entry_id: str | None = None) -> UpstreamClient | None:
+    """The UpstreamClient of entry_id; without one, the live player's entry, else the first entry."""
+    domain_data = hass.data.get(DOMAIN, {})
+    if entry_id is None:
+        player = domain_data.get("player_ref")
+        entry = getattr(player, "_entry", None)
+        entry_id = getattr(entry, "entry_id", None)
+    data = domain_data.get(entry_id) if entry_id else None
+    if isinstance(data, dict) and data.get("upstream") is not None:
+        return data["upstream"]
+    for data in domain_data.values():
+        if isinstance(data, dict) and isinstance(data.get("upstream"), UpstreamClient):
+            return data["upstream"]
+    return None
+
+
+def upstream_session(
+    hass: HomeAssistant, stream: bool = False, entry_id: str | None = None
+) -> aiohttp.ClientSession:
+    """Session for calls to the Mac: the entry's dedicated pool, else HA's shared session.
+
+    Look it up per call rather than holding on to it; a reload closes the old pools.
+    """
+    client = upstream_client(hass, entry_id)
+    if client is None:
+        return async_get_clientsession(hass)
+    return client.stream if stream else client.rest
+
+
 async def _get_json(hass: HomeAssistant, base_url: str, path: str) -> Any:
     """GET JSON from the backend with a 10s timeout."""
-    session = async_get_clientsession(hass)
+    session = upstream_session(hass)
     async with timeout(10):
         async with session.get(f"{base_url}{path}") as resp:
             resp.raise_for_status()
             return await resp.json()
+
+
+class ExpiringCache:
+    """Small bounded map whose entries expire after ttl seconds (event-loop only)."""
+
+    def __init__(self, ttl: float, max_entries: int = 256) -> None:
+        self._ttl = ttl
+        self._max_entries = max_entries
+        self._items: OrderedDict[Any, tuple[float, Any]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Any) -> Any:
+        item = self._items.get(key)
+        if item is None or item[0] <= time.monotonic():
+            if item is not None:
+                self._items.pop(key, None)
+            self.misses += 1
+            return None
+        self._items.move_to_end(key)
+        self.hits += 1
+        return item[1]
+
+    def __contains__(self, key: Any) -> bool:
+        item = self._items.get(key)
+        return item is not None and item[0] > time.monotonic()
+
+    def put(self, key: Any, value: Any) -> None:
+        self._items.pop(key, None)
+        self._items[key] = (time.monotonic() + self._ttl, value)
+        while len(self._items) > self._max_entries:
+            self._items.popitem(last=False)
+
+    def discard(self, key: Any) -> None:
+        self._items.pop(key, None)
+
+    def clear(self) -> None:
+        self._items.clear()
+
+    def stats(self) -> dict:
+        return {"entries": len(self._items), "hits": self.hits, "misses": self.misses}
+
+
+class ProxyResponseCache:
+    """Buffered upstream GET responses keyed by path + query, with per-route TTLs (event-loop only).
+
+    Expired entries are kept (within the size bounds) so they can be revalidated with
+    If-None-Match / If-Modified-Since instead of refetched. Each route carries a
+    generation counter: a fetch that started before an invalidation must not store
+    the pre-change body it got back.
+    """
+
+    def __init__(self, max_entries: int = 128, max_bytes: int = 16 * 1024 * 1024) -> None:
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        # key -> (expires, route, body, headers)
+        self._items: OrderedDict[str, tuple[float, str, bytes, dict]] = OrderedDict()
+        self._generations: dict[str, int] = {}
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.revalidated = 0
+        self.invalidations = 0
+
+    def lookup(self, key: str) -> tuple[bytes, dict, bool] | None:
+        """(body, headers, fresh) for key, counting fresh entries as hits."""
+        item = self._items.get(key)
+        if item is None:
+            self.misses += 1
+            return None
+        self._items.move_to_end(key)
+        fresh = item[0] > time.monotonic()
+        if fresh:
+            self.hits += 1
+        else:
+            self.misses += 1
+        return item[2], item[3], fresh
+
+    def generation(self, route: str) -> int:
+        return self._generations.get(route, 0)
+
+    def put(self, key: str, route: str, ttl: float, body: bytes, headers: dict, generation: int) -> None:
+        if generation != self.generation(route) or len(body) > self._max_bytes // 4:
+            return
+        self._drop(key)
+        self._items[key] = (time.monotonic() + ttl, route, body, headers)
+        self._bytes += len(body)
+        while self._items and (len(self._items) > self._max_entries or self._bytes > self._max_bytes):
+            self._drop(next(iter(self._items)))
+
+    def refresh(self, key: str, ttl: float) -> None:
+        """Upstream answered 304: the cached body is good for another ttl."""
+        item = self._items.get(key)
+        if item is not None:
+            self._items[key] = (time.monotonic() + ttl, *item[1:])
+            self.revalidated += 1
+
+    def invalidate(self, routes) -> None:
+        routes = set(routes)
+        for route in routes:
+            self._generations[route] = self.generation(route) + 1
+        for key in [k for k, item in self._items.items() if item[1] in routes]:
+            self._drop(key)
+            self.invalidations += 1
+
+    def _drop(self, key: str) -> None:
+        item = self._items.pop(key, None)
+        if item is not None:
+            self._bytes -= len(item[2])
+
+    def clear(self) -> None:
+        self.invalidate({item[1] for item in self._items.values()})
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._items),
+            "bytes": self._bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "revalidated": self.revalidated,
+            "invalidations": self.invalidations,
+        }
+
+
+class RequestCoalescer:
+    """Fan one in-flight upstream GET out to identical concurrent requests (event-loop only).
+
+    Unlike artwork's SingleFlight, the leader is not a detached task: it keeps streaming
+    to its own client and publishes the buffered response when done. Followers wait for
+    that; when the leader fails or the body outgrows the buffer they get None and make
+    their own call.
+    """
+
+    def __init__(self) -> None:
+        self._inflight: dict[Any, asyncio.Future] = {}
+        self.started = 0
+        self.coalesced = 0
+        self.fallbacks = 0
+
+    def follow(self, key: Any) -> asyncio.Future | None:
+        """The in-flight leader's future for key, if there is one."""
+        leader = self._inflight.get(key)
+        if leader is not None:
+            self.coalesced += 1
+        return leader
+
+    def lead(self, key: Any) -> asyncio.Future:
+        leader = asyncio.get_running_loop().create_future()
+        self._inflight[key] = leader
+        self.started += 1
+        return leader
+
+    def finish(self, key: Any, leader: asyncio.Future, result: tuple[int, dict, bytes] | None) -> None:
+        """Publish the leader's (status, headers, body); only a 200 is shared, anything else sends followers upstream."""
+        if result is not None and result[0] != 200:
+            result = None
+        if self._inflight.get(key) is leader:
+            self._inflight.pop(key, None)
+        if not leader.done():
+            leader.set_result(result)
+
+    def stats(self) -> dict:
+        total = self.started + self.coalesced
+        return {
+            "in_flight": len(self._inflight),
+            "started": self.started,
+            "coalesced": self.coalesced,
+            "fallbacks": self.fallbacks,
+            "coalescing_ratio": (self.coalesced / total) if total else None,
+        }